@@ -0,0 +1,63 @@
+"""Benchmark the API's opt-in fast JSON path against Pydantic models and FastAPI's default encoder.
+
+Usage:
+    uv run python -m benchmarks.api_serialization --size 100 --repeat 5
+"""
+
+import argparse
+import json
+import timeit
+from collections.abc import Callable
+
+from pydantic import TypeAdapter
+
+from gale_shapley_algorithm._api.models import MatchingResponse, StepsResponse
+from gale_shapley_algorithm._api.responses import dumps, orjson
+from gale_shapley_algorithm._api.step_through import _matching_content, steps_content
+from gale_shapley_algorithm.matching import _build_algorithm
+from gale_shapley_algorithm.stability import check_stability
+from tests.conftest import random_market
+
+
+def _fastapi_default(adapter: TypeAdapter, value: object) -> bytes:
+    """What FastAPI does with a returned model: validate, dump to JSON-able data, then json.dumps."""
+    validated = adapter.validate_python(value)
+    return json.dumps(adapter.dump_python(validated, mode="json"), ensure_ascii=False).encode()
+
+
+def _best_of(func: Callable[[], object], repeat: int) -> float:
+    return min(timeit.repeat(func, number=1, repeat=repeat))
+
+
+def main() -> None:
+    """Run the benchmark and print a small table of timings."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=100, help="Number of persons on each side")
+    parser.add_argument("--repeat", type=int, default=5, help="Repetitions, the best one is reported")
+    args = parser.parse_args()
+
+    proposer_prefs, responder_prefs = random_market(args.size, 0, min_length=args.size)
+    algorithm = _build_algorithm(proposer_prefs, responder_prefs)
+    result = algorithm.execute()
+    stability = check_stability(algorithm)
+    steps_data = steps_content(_build_algorithm(proposer_prefs, responder_prefs))
+
+    matching_adapter = TypeAdapter(MatchingResponse)
+    steps_adapter = TypeAdapter(StepsResponse)
+    cases = {
+        "solve only": lambda: _build_algorithm(proposer_prefs, responder_prefs).execute(),
+        "matching, models": lambda: _fastapi_default(matching_adapter, _matching_content(result, stability)),
+        "matching, fast": lambda: dumps(_matching_content(result, stability)),
+        "steps, models": lambda: _fastapi_default(steps_adapter, steps_data),
+        "steps, fast": lambda: dumps(steps_data),
+    }
+
+    print(
+        f"{args.size}x{args.size} market, {len(steps_data['steps'])} rounds, encoder: {'orjson' if orjson else 'json'}"
+    )
+    for name, func in cases.items():
+        print(f"{name:<20}{_best_of(func, args.repeat) * 1000:>10.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
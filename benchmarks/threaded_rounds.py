@@ -0,0 +1,56 @@
+"""Benchmark the threaded round engine across thread counts.
+
+Only free-threaded builds with the GIL disabled (e.g. python3.13t) run the
+rounds on threads, other builds fall back to the serial engine.
+
+Usage:
+    uv run python -m benchmarks.threaded_rounds --size 100 --threads 1 2 4 8
+"""
+
+import argparse
+import timeit
+
+from gale_shapley_algorithm.algorithm import Algorithm
+from gale_shapley_algorithm.matching import _build_algorithm
+from gale_shapley_algorithm.threaded import ThreadedAlgorithm, _gil_enabled
+from tests.conftest import random_market
+
+
+def _build(proposer_prefs: dict[str, list[str]], responder_prefs: dict[str, list[str]], threads: int) -> Algorithm:
+    algorithm = _build_algorithm(proposer_prefs, responder_prefs)
+    if threads == 0:
+        return algorithm
+    return ThreadedAlgorithm(algorithm.proposers, algorithm.responders, max_workers=threads)
+
+
+def main() -> None:
+    """Run the benchmark and print the time and speedup per thread count."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=100, help="Number of persons on each side")
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8], help="Thread counts to compare")
+    parser.add_argument("--repeat", type=int, default=3, help="Repetitions, the best one is reported")
+    args = parser.parse_args()
+
+    proposer_prefs, responder_prefs = random_market(args.size, 0, min_length=args.size)
+    expected = _build(proposer_prefs, responder_prefs, 0).execute()
+    print(f"{args.size}x{args.size} market, {expected.rounds} rounds, GIL enabled: {_gil_enabled()}")
+
+    baseline = min(
+        timeit.repeat(lambda: _build(proposer_prefs, responder_prefs, 0).execute(), number=1, repeat=args.repeat)
+    )
+    print(f"{'serial':<12}{baseline * 1000:>10.1f} ms")
+    for threads in args.threads:
+        if _build(proposer_prefs, responder_prefs, threads).execute() != expected:
+            raise SystemExit(f"{threads} threads produced a different matching")
+        best = min(
+            timeit.repeat(
+                lambda threads=threads: _build(proposer_prefs, responder_prefs, threads).execute(),
+                number=1,
+                repeat=args.repeat,
+            )
+        )
+        print(f"{f'{threads} threads':<12}{best * 1000:>10.1f} ms{baseline / best:>8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,21 +1,136 @@
 """gale-shapley-algorithm: A Python implementation of the Gale-Shapley algorithm."""
 
-from gale_shapley_algorithm.algorithm import Algorithm
-from gale_shapley_algorithm.matching import create_matching
-from gale_shapley_algorithm.person import Person, Proposer, Responder
-from gale_shapley_algorithm.result import MatchingResult, StabilityResult
-from gale_shapley_algorithm.stability import check_stability, find_blocking_pairs, is_individually_rational
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from gale_shapley_algorithm.algorithm import Algorithm
+    from gale_shapley_algorithm.cancellation import CancellationToken, SolveCancelledError, SolveTimeoutError
+    from gale_shapley_algorithm.checkpoint import execute_with_checkpoints, load_checkpoint, save_checkpoint
+    from gale_shapley_algorithm.decomposition import create_decomposed_matching, decompose_market
+    from gale_shapley_algorithm.event_log import EventLogReader, EventLogWriter, execute_with_event_log
+    from gale_shapley_algorithm.matching import MatchingEngine, create_matching
+    from gale_shapley_algorithm.parallel_stability import check_stability_parallel
+    from gale_shapley_algorithm.person import Person, Proposer, Responder
+    from gale_shapley_algorithm.profiling import MemoryProfile, memory_profile, profile_matching
+    from gale_shapley_algorithm.progress import ProgressInfo, ProgressReporter
+    from gale_shapley_algorithm.pruning import prune_preferences
+    from gale_shapley_algorithm.result import (
+        ArrayMatchingResult,
+        MatchingResult,
+        MatchingStatistics,
+        PruningResult,
+        StabilityResult,
+        TruncationOutcome,
+        ValidationIssue,
+        ValidationResult,
+    )
+    from gale_shapley_algorithm.stability import check_stability, find_blocking_pairs, is_individually_rational
+    from gale_shapley_algorithm.threaded import ThreadedAlgorithm
+    from gale_shapley_algorithm.top_trading_cycles import create_ttc_matching, top_trading_cycles
+    from gale_shapley_algorithm.truncation import analyze_truncations
+    from gale_shapley_algorithm.validation import MarketValidationError, validate_market
 
 __version__ = "1.4.1"
 __all__ = [
     "Algorithm",
+    "ArrayMatchingResult",
+    "CancellationToken",
+    "EventLogReader",
+    "EventLogWriter",
+    "MarketValidationError",
+    "MatchingEngine",
     "MatchingResult",
+    "MatchingStatistics",
+    "MemoryProfile",
     "Person",
+    "ProgressInfo",
+    "ProgressReporter",
     "Proposer",
+    "PruningResult",
     "Responder",
+    "SolveCancelledError",
+    "SolveTimeoutError",
     "StabilityResult",
+    "ThreadedAlgorithm",
+    "TruncationOutcome",
+    "ValidationIssue",
+    "ValidationResult",
+    "analyze_truncations",
     "check_stability",
+    "check_stability_parallel",
+    "create_decomposed_matching",
     "create_matching",
+    "create_ttc_matching",
+    "decompose_market",
+    "execute_with_checkpoints",
+    "execute_with_event_log",
     "find_blocking_pairs",
     "is_individually_rational",
+    "load_checkpoint",
+    "memory_profile",
+    "profile_matching",
+    "prune_preferences",
+    "save_checkpoint",
+    "top_trading_cycles",
+    "validate_market",
 ]
+
+# Public names are imported on first access to keep `import gale_shapley_algorithm` cheap
+_LAZY_IMPORTS: dict[str, str] = {
+    "Algorithm": "gale_shapley_algorithm.algorithm",
+    "ArrayMatchingResult": "gale_shapley_algorithm.result",
+    "CancellationToken": "gale_shapley_algorithm.cancellation",
+    "EventLogReader": "gale_shapley_algorithm.event_log",
+    "EventLogWriter": "gale_shapley_algorithm.event_log",
+    "MarketValidationError": "gale_shapley_algorithm.validation",
+    "MatchingEngine": "gale_shapley_algorithm.matching",
+    "MatchingResult": "gale_shapley_algorithm.result",
+    "MatchingStatistics": "gale_shapley_algorithm.result",
+    "MemoryProfile": "gale_shapley_algorithm.profiling",
+    "Person": "gale_shapley_algorithm.person",
+    "ProgressInfo": "gale_shapley_algorithm.progress",
+    "ProgressReporter": "gale_shapley_algorithm.progress",
+    "Proposer": "gale_shapley_algorithm.person",
+    "PruningResult": "gale_shapley_algorithm.result",
+    "Responder": "gale_shapley_algorithm.person",
+    "SolveCancelledError": "gale_shapley_algorithm.cancellation",
+    "SolveTimeoutError": "gale_shapley_algorithm.cancellation",
+    "StabilityResult": "gale_shapley_algorithm.result",
+    "ThreadedAlgorithm": "gale_shapley_algorithm.threaded",
+    "TruncationOutcome": "gale_shapley_algorithm.result",
+    "ValidationIssue": "gale_shapley_algorithm.result",
+    "ValidationResult": "gale_shapley_algorithm.result",
+    "analyze_truncations": "gale_shapley_algorithm.truncation",
+    "check_stability": "gale_shapley_algorithm.stability",
+    "check_stability_parallel": "gale_shapley_algorithm.parallel_stability",
+    "create_decomposed_matching": "gale_shapley_algorithm.decomposition",
+    "create_matching": "gale_shapley_algorithm.matching",
+    "create_ttc_matching": "gale_shapley_algorithm.top_trading_cycles",
+    "decompose_market": "gale_shapley_algorithm.decomposition",
+    "execute_with_checkpoints": "gale_shapley_algorithm.checkpoint",
+    "execute_with_event_log": "gale_shapley_algorithm.event_log",
+    "find_blocking_pairs": "gale_shapley_algorithm.stability",
+    "is_individually_rational": "gale_shapley_algorithm.stability",
+    "load_checkpoint": "gale_shapley_algorithm.checkpoint",
+    "memory_profile": "gale_shapley_algorithm.profiling",
+    "profile_matching": "gale_shapley_algorithm.profiling",
+    "prune_preferences": "gale_shapley_algorithm.pruning",
+    "save_checkpoint": "gale_shapley_algorithm.checkpoint",
+    "top_trading_cycles": "gale_shapley_algorithm.top_trading_cycles",
+    "validate_market": "gale_shapley_algorithm.validation",
+}
+
+
+def __getattr__(name: str) -> object:
+    try:
+        module = _LAZY_IMPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *__all__})
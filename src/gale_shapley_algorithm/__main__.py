@@ -1,9 +1,9 @@
 """Entry-point module, in case of using `python -m gale_shapley_algorithm`."""
 
-try:
-    import typer  # noqa: F401
-except ImportError:
-    raise SystemExit("CLI deps not installed. Install with: pip install gale-shapley-algorithm[cli]") from None
+from importlib.util import find_spec
+
+if find_spec("typer") is None:
+    raise SystemExit("CLI deps not installed. Install with: pip install gale-shapley-algorithm[cli]")
 
 from gale_shapley_algorithm._cli.app import app
 
@@ -1,5 +1,7 @@
 """FastAPI application entry point."""
 
+from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 from fastapi import FastAPI
@@ -7,9 +9,23 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import FileResponse
 from fastapi.staticfiles import StaticFiles
 
+from gale_shapley_algorithm._api import jobs
+from gale_shapley_algorithm._api.jobs import router as jobs_router
+from gale_shapley_algorithm._api.limits import BodySizeLimitMiddleware
+from gale_shapley_algorithm._api.metrics import MetricsMiddleware
+from gale_shapley_algorithm._api.metrics import router as metrics_router
 from gale_shapley_algorithm._api.routes import router
+from gale_shapley_algorithm._api.sessions import router as sessions_router
 
-app = FastAPI(title="Gale-Shapley API", version="0.2.0")
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI) -> AsyncGenerator[None, None]:
+    """Stop the job workers when the server stops, rather than running every queued job first."""
+    yield
+    jobs.jobs.shutdown()
+
+
+app = FastAPI(title="Gale-Shapley API", version="0.2.0", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,  # type: ignore[arg-type]
@@ -19,7 +35,13 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.add_middleware(BodySizeLimitMiddleware)  # type: ignore[arg-type]
+app.add_middleware(MetricsMiddleware)  # type: ignore[arg-type]
+
 app.include_router(router)
+app.include_router(sessions_router)
+app.include_router(jobs_router)
+app.include_router(metrics_router)
 
 # Serve frontend static files
 _FRONTEND_DIR = Path(__file__).resolve().parent.parent.parent.parent / "frontend" / "dist"
@@ -0,0 +1,56 @@
+"""Compact, index-based wire format for the matching endpoint."""
+
+from gale_shapley_algorithm._api.models import CompactMatchingRequest
+from gale_shapley_algorithm.algorithm import Algorithm
+from gale_shapley_algorithm.person import Proposer, Responder
+from gale_shapley_algorithm.result import MatchingResult, StabilityResult
+
+
+def _build_compact_participants(req: CompactMatchingRequest) -> Algorithm:
+    """Build an Algorithm from name tables and index-based preferences.
+
+    Preference lists are padded like `_build_algorithm`: self is appended,
+    followed by the members of the other side not already listed.
+    """
+    proposers = [Proposer(name, "proposer") for name in req.proposers]
+    responders = [Responder(name, "responder") for name in req.responders]
+
+    for p, indices in zip(proposers, req.proposer_preferences, strict=True):
+        listed = set(indices)
+        p.preferences = (
+            *(responders[i] for i in indices),
+            p,
+            *(r for i, r in enumerate(responders) if i not in listed),
+        )
+
+    for r, indices in zip(responders, req.responder_preferences, strict=True):
+        listed = set(indices)
+        r.preferences = (
+            *(proposers[i] for i in indices),
+            r,
+            *(p for i, p in enumerate(proposers) if i not in listed),
+        )
+
+    return Algorithm(proposers, responders)
+
+
+def compact_content(algorithm: Algorithm, result: MatchingResult, stability: StabilityResult) -> dict[str, object]:
+    """Build a CompactMatchingResponse as plain data from an executed algorithm."""
+    proposer_index = {p.name: i for i, p in enumerate(algorithm.proposers)}
+    responder_index = {r.name: i for i, r in enumerate(algorithm.responders)}
+    proposer_matches = [
+        responder_index[p.match.name] if isinstance(p.match, Responder) else -1 for p in algorithm.proposers
+    ]
+    responder_matches = [
+        proposer_index[r.match.name] if isinstance(r.match, Proposer) else -1 for r in algorithm.responders
+    ]
+
+    return {
+        "rounds": result.rounds,
+        "proposer_matches": proposer_matches,
+        "responder_matches": responder_matches,
+        "all_matched": result.all_matched,
+        "is_stable": stability.is_stable,
+        "is_individually_rational": stability.is_individually_rational,
+        "blocking_pairs": [(proposer_index[p], responder_index[r]) for p, r in stability.blocking_pairs],
+    }
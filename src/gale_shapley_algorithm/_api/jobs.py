@@ -0,0 +1,367 @@
+"""Asynchronous matching jobs, for markets too slow to solve within one request.
+
+`POST /api/jobs` validates a market and queues it for a small worker pool,
+returning at once. Clients poll `GET /api/jobs/{id}` for the status and the
+progress of the last reported round, then fetch `GET /api/jobs/{id}/result`,
+or page through its matches and blocking pairs under the same path; the
+pairs of the jobs paged through last are kept decoded between pages.
+Jobs are kept in a SQLite database, in memory unless GALE_SHAPLEY_JOBS_DB
+names a file, and finished jobs are purged after `Limits.job_ttl` seconds.
+
+Jobs have their own `Limits.job_max_participants` and `Limits.job_max_cost`
+size limits, larger than those of a synchronous request.
+At most `Limits.job_workers` jobs run at once and `Limits.max_pending_jobs`
+are queued or running; further submissions are rejected with 503. A job
+running longer than `Limits.job_timeout` seconds from submission is stopped
+and fails. When the server stops, queued jobs are dropped and running ones
+are stopped at their next round; both are marked failed, as are jobs a server
+left unfinished when the database is opened again.
+"""
+
+import os
+import secrets
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import cast
+
+from fastapi import APIRouter, HTTPException, Response
+
+from gale_shapley_algorithm._api.limits import check_size, limits
+from gale_shapley_algorithm._api.metrics import metrics
+from gale_shapley_algorithm._api.models import JobResponse, MatchingRequest, PairPage
+from gale_shapley_algorithm._api.pagination import (
+    Cursor,
+    Limit,
+    Participant,
+    Prefix,
+    ResultPairs,
+    pair_page,
+    result_pairs,
+)
+from gale_shapley_algorithm._api.responses import FastJSONResponse, dumps, loads
+from gale_shapley_algorithm._api.routes import _check_market, _dimensions
+from gale_shapley_algorithm._api.step_through import MatchingContent, _matching_content
+from gale_shapley_algorithm.cancellation import CancellationToken, SolveCancelledError, SolveTimeoutError
+from gale_shapley_algorithm.matching import _build_algorithm
+from gale_shapley_algorithm.progress import ProgressInfo, ProgressReporter
+from gale_shapley_algorithm.stability import check_stability
+
+# Job statuses
+QUEUED, RUNNING, SUCCEEDED, FAILED, CANCELLED = "queued", "running", "succeeded", "failed", "cancelled"
+
+# Error of the jobs a stopping server did not finish
+_STOPPED = "Server stopped before the job finished."
+
+# Least number of seconds between two progress updates of a job
+PROGRESS_INTERVAL = 0.5
+
+# Decoded results a JobStore keeps for paging
+RESULT_CACHE_SIZE = 8
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    round INTEGER,
+    free_proposers INTEGER,
+    proposals INTEGER,
+    error TEXT,
+    result BLOB
+)
+"""
+_STATUS_COLUMNS = "id, status, created_at, updated_at, round, free_proposers, proposals, error"
+
+
+def _job_content(row: tuple) -> dict[str, object]:
+    """JobResponse-shaped plain data of a row of _STATUS_COLUMNS."""
+    job_id, status, created_at, updated_at, round_, free_proposers, proposals, error = row
+    progress = None
+    if round_ is not None:
+        progress = {"round": round_, "free_proposers": free_proposers, "proposals": proposals}
+    return {
+        "job_id": job_id,
+        "status": status,
+        "created_at": created_at,
+        "updated_at": updated_at,
+        "progress": progress,
+        "error": error,
+    }
+
+
+class JobStore:
+    """Jobs and their results in a SQLite database, shared by request handlers and workers."""
+
+    def __init__(self, path: str = ":memory:", clock: Callable[[], float] = time.time) -> None:
+        """Open or create the database, failing the jobs a previous server left unfinished.
+
+        Args:
+            path: Database file, or ":memory:". Defaults to ":memory:".
+            clock: Wall clock in seconds. Defaults to time.time.
+        """
+        self.clock = clock
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._pairs: OrderedDict[str, ResultPairs] = OrderedDict()
+        self._lock = threading.Lock()
+        with self._lock:
+            self._db.execute(_SCHEMA)
+            self._db.execute(
+                "UPDATE jobs SET status = ?, error = ?, updated_at = ? WHERE status IN (?, ?)",
+                (FAILED, _STOPPED, clock(), QUEUED, RUNNING),
+            )
+
+    def create(self) -> str:
+        """Add a queued job, returns its ID."""
+        job_id = secrets.token_urlsafe(16)
+        now = self.clock()
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO jobs (id, status, created_at, updated_at) VALUES (?, ?, ?, ?)",
+                (job_id, QUEUED, now, now),
+            )
+        return job_id
+
+    def get(self, job_id: str) -> dict[str, object] | None:
+        """Returns the status of a job as JobResponse-shaped data, None if it does not exist."""
+        with self._lock:
+            row = self._db.execute(f"SELECT {_STATUS_COLUMNS} FROM jobs WHERE id = ?", (job_id,)).fetchone()  # noqa: S608
+        return None if row is None else _job_content(row)
+
+    def result(self, job_id: str) -> bytes | None:
+        """Returns the JSON encoded result of a job, None if it has none."""
+        with self._lock:
+            row = self._db.execute("SELECT result FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return None if row is None else row[0]
+
+    def result_pairs(self, job_id: str) -> ResultPairs | None:
+        """Returns the pairs of the result of a job, None if it has none.
+
+        The pairs of the last RESULT_CACHE_SIZE results read are kept, so paging
+        through a result does not parse all of it for every page.
+        """
+        with self._lock:
+            pairs = self._pairs.get(job_id)
+            if pairs is not None:
+                self._pairs.move_to_end(job_id)
+                return pairs
+        result = self.result(job_id)
+        if result is None:
+            return None
+        pairs = result_pairs(cast("MatchingContent", loads(result)))
+        with self._lock:
+            self._pairs[job_id] = pairs
+            if len(self._pairs) > RESULT_CACHE_SIZE:
+                self._pairs.popitem(last=False)
+        return pairs
+
+    def set_status(self, job_id: str, status: str, error: str | None = None, result: bytes | None = None) -> None:
+        with self._lock:
+            self._pairs.pop(job_id, None)
+            self._db.execute(
+                "UPDATE jobs SET status = ?, error = ?, result = ?, updated_at = ? WHERE id = ?",
+                (status, error, result, self.clock(), job_id),
+            )
+
+    def set_progress(self, job_id: str, info: ProgressInfo) -> None:
+        with self._lock:
+            self._db.execute(
+                "UPDATE jobs SET round = ?, free_proposers = ?, proposals = ?, updated_at = ? WHERE id = ?",
+                (info.round, info.free_proposers, info.proposals, self.clock(), job_id),
+            )
+
+    def delete(self, job_id: str) -> bool:
+        """Remove a job, returns False if it did not exist."""
+        with self._lock:
+            self._pairs.pop(job_id, None)
+            return self._db.execute("DELETE FROM jobs WHERE id = ?", (job_id,)).rowcount > 0
+
+    def purge(self, before: float) -> int:
+        """Remove the jobs that finished before a time, returns how many were removed."""
+        with self._lock:
+            purged = self._db.execute(
+                "DELETE FROM jobs WHERE status IN (?, ?, ?) AND updated_at < ?",
+                (SUCCEEDED, FAILED, CANCELLED, before),
+            ).rowcount
+            if purged:
+                self._pairs.clear()
+            return purged
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+class JobQueue:
+    """Runs jobs of a JobStore on a bounded thread pool."""
+
+    def __init__(self, store: JobStore, workers: int, max_pending: int) -> None:
+        self.store = store
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor: ThreadPoolExecutor | None = None
+        self._cancels: dict[str, CancellationToken] = {}
+        self._stopping = False
+        self._lock = threading.Lock()
+
+    def submit(self, req: MatchingRequest) -> str:
+        """Queue a market, starting the worker pool on first use.
+
+        Raises:
+            HTTPException: 503 with Retry-After if max_pending jobs are queued or running.
+
+        Returns:
+            The new job ID.
+        """
+        with self._lock:
+            if len(self._cancels) >= self.max_pending:
+                metrics.rejections.inc("jobs")
+                raise HTTPException(
+                    status_code=503,
+                    detail="Too many jobs queued or running, retry later.",
+                    headers={"Retry-After": str(limits.retry_after)},
+                )
+            self.store.purge(self.store.clock() - limits.job_ttl)
+            job_id = self.store.create()
+            cancel = CancellationToken(timeout=limits.job_timeout)
+            self._cancels[job_id] = cancel
+            if self._executor is None:
+                self._stopping = False
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="gale-shapley-job")
+            metrics.jobs.inc(QUEUED)
+            self._executor.submit(self._run, job_id, req, cancel)
+        return job_id
+
+    def cancel(self, job_id: str) -> bool:
+        """Stop a queued or running job at its next round, returns False if it is not active."""
+        with self._lock:
+            cancel = self._cancels.get(job_id)
+        if cancel is None:
+            return False
+        cancel.cancel()
+        return True
+
+    def _run(self, job_id: str, req: MatchingRequest, cancel: CancellationToken) -> None:
+        metrics.jobs.dec(QUEUED)
+        metrics.jobs.inc(RUNNING)
+        self.store.set_status(job_id, RUNNING)
+        result = None
+        try:
+            cancel.check()
+            algorithm = _build_algorithm(req.proposer_preferences, req.responder_preferences)
+            reporter = ProgressReporter(lambda info: self.store.set_progress(job_id, info), PROGRESS_INTERVAL)
+            matching = algorithm.execute(on_round=reporter, cancel=cancel)
+            reporter.report(algorithm)
+            result = dumps(_matching_content(matching, check_stability(algorithm)))
+        except SolveTimeoutError:
+            status, error = FAILED, f"Job did not finish within {limits.job_timeout} seconds."
+        except SolveCancelledError:
+            status, error = (FAILED, _STOPPED) if self._stopping else (CANCELLED, "Job was cancelled.")
+        except Exception as exc:  # noqa: BLE001 - reported through the job, the worker keeps running
+            status, error = FAILED, f"{type(exc).__name__}: {exc}"
+        else:
+            status, error = SUCCEEDED, None
+        self.store.set_status(job_id, status, error, result)
+        with self._lock:
+            del self._cancels[job_id]
+        metrics.jobs.dec(RUNNING)
+        metrics.finished_jobs.inc(status)
+
+    def shutdown(self) -> None:
+        """Drop the queued jobs, stop the running ones at their next round and wait for the workers."""
+        with self._lock:
+            cancels, executor, self._executor = list(self._cancels.values()), self._executor, None
+            self._stopping = True
+        for cancel in cancels:
+            cancel.cancel()
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+        # Running jobs have finished, the jobs left never started
+        with self._lock:
+            dropped, self._cancels = list(self._cancels), {}
+        for job_id in dropped:
+            self.store.set_status(job_id, FAILED, _STOPPED)
+            metrics.jobs.dec(QUEUED)
+            metrics.finished_jobs.inc(FAILED)
+
+
+jobs = JobQueue(
+    JobStore(os.environ.get("GALE_SHAPLEY_JOBS_DB", ":memory:")), limits.job_workers, limits.max_pending_jobs
+)
+
+router = APIRouter(prefix="/api/jobs")
+
+
+def _get_job(job_id: str) -> dict[str, object]:
+    job = jobs.store.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found.")
+    return job
+
+
+@router.post("", response_model=JobResponse, status_code=202)
+def create_job(req: MatchingRequest) -> FastJSONResponse:
+    """Validate a market and queue it, returning the queued job."""
+    check_size(*_dimensions(req), max_participants=limits.job_max_participants, max_cost=limits.job_max_cost)
+    _check_market(req)
+    job_id = jobs.submit(req)
+    return FastJSONResponse(_get_job(job_id), status_code=202, headers={"Location": f"/api/jobs/{job_id}"})
+
+
+@router.get("/{job_id}", response_model=JobResponse)
+def get_job(job_id: str) -> FastJSONResponse:
+    """Return the status and progress of a job."""
+    return FastJSONResponse(_get_job(job_id))
+
+
+def _get_result(job_id: str) -> bytes:
+    job = _get_job(job_id)
+    result = jobs.store.result(job_id)
+    if result is None:
+        raise HTTPException(status_code=409, detail=f"Job is {job['status']}, it has no result.")
+    return result
+
+
+def _get_result_pairs(job_id: str) -> ResultPairs:
+    job = _get_job(job_id)
+    pairs = jobs.store.result_pairs(job_id)
+    if pairs is None:
+        raise HTTPException(status_code=409, detail=f"Job is {job['status']}, it has no result.")
+    return pairs
+
+
+@router.get("/{job_id}/result")
+def get_job_result(job_id: str) -> Response:
+    """Return the MatchingResponse of a succeeded job, 409 while it has none."""
+    return Response(content=_get_result(job_id), media_type="application/json")
+
+
+@router.get("/{job_id}/result/matches", response_model=PairPage)
+def get_job_matches(
+    job_id: str, cursor: Cursor = 0, limit: Limit = 100, prefix: Prefix = None, participant: Participant = None
+) -> FastJSONResponse:
+    """Return a page of the matched pairs of a succeeded job."""
+    matches = _get_result_pairs(job_id)["matches"]
+    return FastJSONResponse(pair_page(matches, cursor, limit, prefix, participant))
+
+
+@router.get("/{job_id}/result/blocking-pairs", response_model=PairPage)
+def get_job_blocking_pairs(
+    job_id: str, cursor: Cursor = 0, limit: Limit = 100, prefix: Prefix = None, participant: Participant = None
+) -> FastJSONResponse:
+    """Return a page of the blocking pairs of a succeeded job."""
+    blocking_pairs = _get_result_pairs(job_id)["blocking_pairs"]
+    return FastJSONResponse(pair_page(blocking_pairs, cursor, limit, prefix, participant))
+
+
+@router.delete("/{job_id}", status_code=204)
+def delete_job(job_id: str) -> Response:
+    """Cancel a queued or running job, or discard a finished one and its result."""
+    _get_job(job_id)
+    if not jobs.cancel(job_id):
+        jobs.store.delete(job_id)
+    return Response(status_code=204)
@@ -0,0 +1,287 @@
+"""Request size limits and admission control for the API.
+
+Every limit can be configured through an environment variable read at startup:
+
+    GALE_SHAPLEY_MAX_BODY_BYTES        request body size
+    GALE_SHAPLEY_MAX_PARTICIPANTS      proposers plus responders
+    GALE_SHAPLEY_MAX_LIST_ENTRIES      total length of all preference lists
+    GALE_SHAPLEY_MAX_COST              estimated cost, proposers x responders
+    GALE_SHAPLEY_SMALL_COST            largest cost admitted to the small lane
+    GALE_SHAPLEY_SMALL_LANE_SIZE       concurrent requests in the small lane
+    GALE_SHAPLEY_LARGE_LANE_SIZE       concurrent requests in the large lane
+    GALE_SHAPLEY_RETRY_AFTER           seconds clients should wait when a lane is full
+    GALE_SHAPLEY_MAX_SESSIONS          market sessions held in memory
+    GALE_SHAPLEY_MAX_SESSION_BYTES     total size of the event logs of all sessions
+    GALE_SHAPLEY_SESSION_TTL           seconds a session is kept after its last use
+    GALE_SHAPLEY_SOLVE_TIMEOUT         seconds a solve may run before it is stopped
+    GALE_SHAPLEY_JOB_WORKERS           jobs solved concurrently by the job worker pool
+    GALE_SHAPLEY_MAX_PENDING_JOBS      jobs queued or running at once
+    GALE_SHAPLEY_JOB_TIMEOUT           seconds a job may run before it is stopped
+    GALE_SHAPLEY_JOB_TTL               seconds a finished job and its result are kept
+    GALE_SHAPLEY_JOB_MAX_PARTICIPANTS  proposers plus responders of a job
+    GALE_SHAPLEY_JOB_MAX_COST          estimated cost of a job, proposers x responders
+
+Requests over a size limit are rejected with 413. Admitted requests run in a
+small or large lane depending on their cost. A full lane rejects with 503 and
+Retry-After instead of queuing, and the large lane is kept well below the size
+of the worker threadpool, so huge markets can never hold up small ones. Solves
+are stopped between rounds when they time out (504) or the client disconnects,
+so orphaned requests do not keep their lane and worker thread.
+
+Jobs are not bound by a request's time budget, so they have their own, larger
+participant and cost limits; the defaults admit a market of 50,000 people,
+25,000 on each side. The body size and list entry limits apply to both.
+"""
+
+import asyncio
+import os
+import threading
+from collections.abc import AsyncIterable, Callable, Generator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import TypeVar
+
+from fastapi import HTTPException, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from gale_shapley_algorithm._api.metrics import metrics
+from gale_shapley_algorithm.cancellation import CancellationToken, SolveCancelledError, SolveTimeoutError
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class Limits:
+    """Configured request limits."""
+
+    max_body_bytes: int = 32 * 1024 * 1024
+    max_participants: int = 20_000
+    max_list_entries: int = 5_000_000
+    max_cost: int = 25_000_000
+    small_cost: int = 10_000
+    small_lane_size: int = 32
+    large_lane_size: int = 2
+    retry_after: int = 1
+    max_sessions: int = 256
+    max_session_bytes: int = 256 * 1024 * 1024
+    session_ttl: int = 600
+    solve_timeout: int = 60
+    job_workers: int = 2
+    max_pending_jobs: int = 64
+    job_timeout: int = 3600
+    job_ttl: int = 3600
+    job_max_participants: int = 100_000
+    job_max_cost: int = 1_000_000_000
+
+    @classmethod
+    def from_env(cls) -> "Limits":
+        """Returns the limits, overridden by GALE_SHAPLEY_<FIELD> environment variables.
+
+        Raises:
+            ValueError: If a variable is not a positive integer.
+        """
+        values: dict[str, int] = {}
+        for name in cls.__dataclass_fields__:
+            raw = os.environ.get(f"GALE_SHAPLEY_{name.upper()}")
+            if raw is None:
+                continue
+            if not raw.isdigit() or int(raw) < 1:
+                raise ValueError(f"GALE_SHAPLEY_{name.upper()} must be a positive integer, got {raw!r}.")
+            values[name] = int(raw)
+        return cls(**values)
+
+
+class Lane:
+    """Bounded number of requests running concurrently."""
+
+    def __init__(self, name: str, size: int) -> None:
+        self.name = name
+        self.size = size
+        self.active = 0
+        self._lock = threading.Lock()
+
+    def acquire(self, retry_after: int) -> None:
+        """Take a slot in the lane.
+
+        Raises:
+            HTTPException: 503 with Retry-After if the lane is full.
+        """
+        with self._lock:
+            if self.active >= self.size:
+                metrics.rejections.inc("busy")
+                raise HTTPException(
+                    status_code=503,
+                    detail=f"Too many {self.name} requests in progress, retry later.",
+                    headers={"Retry-After": str(retry_after)},
+                )
+            self.active += 1
+
+    def release(self) -> None:
+        with self._lock:
+            self.active -= 1
+
+
+limits = Limits.from_env()
+lanes = {"small": Lane("small", limits.small_lane_size), "large": Lane("large", limits.large_lane_size)}
+
+
+def _reject(reason: str, detail: str) -> HTTPException:
+    metrics.rejections.inc(reason)
+    return HTTPException(status_code=413, detail=detail)
+
+
+def check_size(
+    num_proposers: int,
+    num_responders: int,
+    list_entries: int,
+    *,
+    max_participants: int | None = None,
+    max_cost: int | None = None,
+) -> int:
+    """Check a market against the size limits.
+
+    Args:
+        num_proposers: Number of proposers.
+        num_responders: Number of responders.
+        list_entries: Total length of all preference lists.
+        max_participants: Most proposers plus responders. Defaults to `Limits.max_participants`.
+        max_cost: Most proposers x responders. Defaults to `Limits.max_cost`.
+
+    Raises:
+        HTTPException: 413 if the market is over a limit.
+
+    Returns:
+        The estimated cost of the market, proposers x responders.
+    """
+    max_participants = limits.max_participants if max_participants is None else max_participants
+    max_cost = limits.max_cost if max_cost is None else max_cost
+    if num_proposers + num_responders > max_participants:
+        raise _reject("participants", f"At most {max_participants} participants are allowed.")
+    if list_entries > limits.max_list_entries:
+        raise _reject("list_entries", f"At most {limits.max_list_entries} preference list entries are allowed.")
+    cost = num_proposers * num_responders
+    if cost > max_cost:
+        raise _reject("cost", f"Market too large, proposers x responders must be at most {max_cost}.")
+    return cost
+
+
+def admit(num_proposers: int, num_responders: int, list_entries: int) -> Lane:
+    """Check a market against the limits and take a slot in the lane matching its cost.
+
+    The caller must release the returned lane once the request is done.
+
+    Args:
+        num_proposers: Number of proposers.
+        num_responders: Number of responders.
+        list_entries: Total length of all preference lists.
+
+    Raises:
+        HTTPException: 413 if the market is over a limit, 503 if its lane is full.
+
+    Returns:
+        The lane the request was admitted to.
+    """
+    cost = check_size(num_proposers, num_responders, list_entries)
+    lane = lanes["small" if cost <= limits.small_cost else "large"]
+    lane.acquire(limits.retry_after)
+    return lane
+
+
+@contextmanager
+def admitted(num_proposers: int, num_responders: int, list_entries: int) -> Generator[None, None, None]:
+    """Context manager version of `admit` that releases the lane on exit."""
+    lane = admit(num_proposers, num_responders, list_entries)
+    try:
+        yield
+    finally:
+        lane.release()
+
+
+async def run_cancellable(request: Request, solve: Callable[..., T], *args: object) -> T:
+    """Run a solve in the threadpool, passing a CancellationToken as its last argument.
+
+    The token expires after `Limits.solve_timeout` seconds and is cancelled as
+    soon as the client disconnects.
+
+    Raises:
+        HTTPException: 504 if the solve timed out, 499 if the client disconnected.
+
+    Returns:
+        What solve returned.
+    """
+    cancel = CancellationToken(timeout=limits.solve_timeout)
+
+    async def cancel_on_disconnect() -> None:
+        # The body has been read already, so the next message is the disconnect
+        while (await request.receive())["type"] != "http.disconnect":
+            pass
+        cancel.cancel()
+
+    watcher = asyncio.create_task(cancel_on_disconnect())
+    try:
+        return await run_in_threadpool(solve, *args, cancel)
+    except SolveTimeoutError:
+        metrics.cancellations.inc("timeout")
+        raise HTTPException(
+            status_code=504, detail=f"Solve did not finish within {limits.solve_timeout} seconds."
+        ) from None
+    except SolveCancelledError:
+        metrics.cancellations.inc("disconnect")
+        raise HTTPException(status_code=499, detail="Client disconnected.") from None
+    finally:
+        watcher.cancel()
+
+
+class LaneStreamingResponse(StreamingResponse):
+    """StreamingResponse releasing the lane of its request once sent, however it ends.
+
+    The body iterator may never start when the client disconnects before the
+    first chunk, so the lane cannot be released from within it.
+    """
+
+    def __init__(self, content: AsyncIterable[bytes], lane: Lane, media_type: str | None = None) -> None:
+        super().__init__(content, media_type=media_type)
+        self.lane = lane
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            self.lane.release()
+
+
+class BodySizeLimitMiddleware:
+    """ASGI middleware rejecting request bodies over `Limits.max_body_bytes` with 413."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        max_bytes = limits.max_body_bytes
+        detail = f"Request body must be at most {max_bytes} bytes."
+        declared = dict(scope["headers"]).get(b"content-length", b"")
+        if declared.isdigit() and int(declared) > max_bytes:
+            metrics.rejections.inc("body")
+            await JSONResponse({"detail": detail}, status_code=413)(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive() -> Message:
+            # Bodies without a (truthful) Content-Length are counted as they arrive
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > max_bytes:
+                    metrics.rejections.inc("body")
+                    raise HTTPException(status_code=413, detail=detail)
+            return message
+
+        await self.app(scope, limited_receive, send)
@@ -0,0 +1,278 @@
+"""Prometheus metrics for the API, served at /metrics in the text exposition format.
+
+A handful of counters, gauges and histograms is kept in process, without a
+client library. MetricsMiddleware records every HTTP request, route handlers
+record solver and serialization times through `observe_solve`.
+"""
+
+import threading
+from collections.abc import Iterable
+from time import perf_counter
+
+import anyio.to_thread
+from fastapi import APIRouter, Request
+from fastapi.responses import PlainTextResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Upper bounds of the market size label, in participants on both sides
+_MARKET_SIZES = (10, 100, 1_000, 10_000)
+_SECONDS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+_COUNTS = (1, 10, 100, 1_000, 10_000, 100_000, 1_000_000)
+
+Labels = tuple[str, ...]
+
+
+def market_size_label(participants: int) -> str:
+    """Returns the market size bucket of a number of participants, e.g. "100" for 11 to 100."""
+    for bound in _MARKET_SIZES:
+        if participants <= bound:
+            return str(bound)
+    return "+Inf"
+
+
+def _format_labels(names: Iterable[str], values: Iterable[str]) -> str:
+    pairs = [f'{name}="{value}"' for name, value in zip(names, values, strict=True)]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(value)
+
+
+class Counter:
+    """Monotonically increasing value per label set."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Labels = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._values: dict[Labels, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(labels, 0)
+
+    def samples(self) -> list[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(v)}" for labels, v in items]
+
+
+class Gauge(Counter):
+    """Value per label set that can go up and down."""
+
+    kind = "gauge"
+
+    def dec(self, *labels: str, amount: float = 1) -> None:
+        self.inc(*labels, amount=-amount)
+
+    def set(self, *labels: str, value: float) -> None:
+        with self._lock:
+            self._values[labels] = value
+
+
+class Histogram:
+    """Cumulative bucket counts, sum and count of observations per label set."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, buckets: tuple[float, ...], labelnames: Labels = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = buckets
+        self._values: dict[Labels, tuple[list[int], float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        with self._lock:
+            counts, total = self._values.get(labels) or ([0] * (len(self.buckets) + 1), 0.0)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            else:
+                counts[-1] += 1
+            self._values[labels] = (counts, total + value)
+
+    def count(self, *labels: str) -> int:
+        counts, _ = self._values.get(labels, ([], 0.0))
+        return sum(counts)
+
+    def samples(self) -> list[str]:
+        with self._lock:
+            items = sorted((labels, (list(counts), total)) for labels, (counts, total) in self._values.items())
+        lines: list[str] = []
+        for labels, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip([*self.buckets, "+Inf"], counts, strict=True):
+                cumulative += count
+                le = bound if isinstance(bound, str) else _format_value(bound)
+                bucket_labels = _format_labels((*self.labelnames, "le"), (*labels, le))
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, labels)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, labels)} {cumulative}")
+        return lines
+
+
+class Metrics:
+    """All metrics of the API."""
+
+    def __init__(self) -> None:
+        self.requests = Counter(
+            "gale_shapley_http_requests_total",
+            "HTTP requests by method, route and status.",
+            ("method", "route", "status"),
+        )
+        self.request_seconds = Histogram(
+            "gale_shapley_http_request_duration_seconds",
+            "Time from receiving a request to sending the last byte of its response.",
+            _SECONDS,
+            ("route", "market_size"),
+        )
+        self.rejections = Counter(
+            "gale_shapley_rejected_requests_total",
+            "Requests rejected by size limits or admission control.",
+            ("reason",),
+        )
+        self.cancellations = Counter(
+            "gale_shapley_cancelled_solves_total",
+            "Solves stopped before finishing, by reason: timeout or disconnect.",
+            ("reason",),
+        )
+        self.requests_in_progress = Gauge("gale_shapley_http_requests_in_progress", "HTTP requests being handled.")
+        self.solve_seconds = Histogram(
+            "gale_shapley_solve_duration_seconds",
+            "Time spent building the market, running the algorithm and checking stability.",
+            _SECONDS,
+            ("endpoint", "market_size"),
+        )
+        self.serialize_seconds = Histogram(
+            "gale_shapley_serialize_duration_seconds",
+            "Time spent building and encoding the JSON response.",
+            _SECONDS,
+            ("endpoint", "market_size"),
+        )
+        self.rounds = Histogram("gale_shapley_rounds", "Rounds needed per solved market.", _COUNTS, ("endpoint",))
+        self.proposals = Histogram(
+            "gale_shapley_proposals", "Proposals to responders per solved market.", _COUNTS, ("endpoint",)
+        )
+        self.threadpool_tasks = Gauge(
+            "gale_shapley_threadpool_tasks", "Tasks in the worker threadpool by state.", ("state",)
+        )
+        self.session_lookups = Counter(
+            "gale_shapley_session_lookups_total",
+            "Session lookups by result: hit, miss or expired.",
+            ("result",),
+        )
+        self.jobs = Gauge("gale_shapley_jobs", "Jobs in the job worker pool by state: queued or running.", ("state",))
+        self.finished_jobs = Counter(
+            "gale_shapley_finished_jobs_total",
+            "Jobs finished by status: succeeded, failed or cancelled.",
+            ("status",),
+        )
+        self.sessions = Gauge("gale_shapley_sessions", "Market sessions held in memory.")
+        self.session_bytes = Gauge("gale_shapley_session_bytes", "Size of the event logs of all held sessions.")
+
+    @property
+    def families(self) -> list[Counter | Histogram]:
+        return [
+            self.requests,
+            self.request_seconds,
+            self.rejections,
+            self.cancellations,
+            self.requests_in_progress,
+            self.solve_seconds,
+            self.serialize_seconds,
+            self.rounds,
+            self.proposals,
+            self.threadpool_tasks,
+            self.session_lookups,
+            self.sessions,
+            self.session_bytes,
+            self.jobs,
+            self.finished_jobs,
+        ]
+
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        lines: list[str] = []
+        for family in self.families:
+            lines.append(f"# HELP {family.name} {family.documentation}")
+            lines.append(f"# TYPE {family.name} {family.kind}")
+            lines.extend(family.samples())
+        return "\n".join(lines) + "\n"
+
+
+metrics = Metrics()
+
+
+def observe_solve(
+    request: Request,
+    *,
+    endpoint: str,
+    participants: int,
+    rounds: int,
+    proposals: int,
+    solve_seconds: float,
+    serialize_seconds: float,
+) -> None:
+    """Record a solved market and tag the request with its market size."""
+    size = market_size_label(participants)
+    request.state.market_size = size
+    metrics.solve_seconds.observe(solve_seconds, endpoint, size)
+    metrics.serialize_seconds.observe(serialize_seconds, endpoint, size)
+    metrics.rounds.observe(rounds, endpoint)
+    metrics.proposals.observe(proposals, endpoint)
+
+
+class MetricsMiddleware:
+    """ASGI middleware counting HTTP requests and timing them until the response is fully sent."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        scope.setdefault("state", {})
+        metrics.requests_in_progress.inc()
+        started = perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            metrics.requests_in_progress.dec()
+            route = getattr(scope.get("route"), "path", "unmatched")
+            size = scope["state"].get("market_size", "none")
+            metrics.requests.inc(scope["method"], route, str(status))
+            metrics.request_seconds.observe(perf_counter() - started, route, size)
+
+
+router = APIRouter()
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics() -> PlainTextResponse:
+    """Prometheus metrics endpoint."""
+    statistics = anyio.to_thread.current_default_thread_limiter().statistics()
+    metrics.threadpool_tasks.set("running", value=statistics.borrowed_tokens)
+    metrics.threadpool_tasks.set("waiting", value=statistics.tasks_waiting)
+    return PlainTextResponse(metrics.render(), media_type=CONTENT_TYPE)
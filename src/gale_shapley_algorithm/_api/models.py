@@ -1,6 +1,8 @@
 """Pydantic request/response models for the API."""
 
-from pydantic import BaseModel
+from typing import Self
+
+from pydantic import BaseModel, model_validator
 
 
 class MatchingRequest(BaseModel):
@@ -45,3 +47,175 @@ class StepsResponse(BaseModel):
 
     steps: list[RoundStep]
     final_result: MatchingResponse
+
+
+class StepsStreamEnd(BaseModel):
+    """Last line of the streaming step-through endpoint."""
+
+    final_result: MatchingResponse
+
+
+class SessionResponse(BaseModel):
+    """Response for creating a market session."""
+
+    session_id: str
+    rounds: int
+    ttl_seconds: int
+    final_result: MatchingResponse
+
+
+class PairPage(BaseModel):
+    """One page of the matches or blocking pairs of a stored result."""
+
+    items: list[ProposalAction]
+    total: int
+    next_cursor: int | None
+
+
+class JobProgress(BaseModel):
+    """Progress of a running job after its last reported round."""
+
+    round: int
+    free_proposers: int
+    proposals: int
+
+
+class JobResponse(BaseModel):
+    """Status of a matching job."""
+
+    job_id: str
+    status: str
+    created_at: float
+    updated_at: float
+    progress: JobProgress | None
+    error: str | None
+
+
+class RoundRangeResponse(BaseModel):
+    """Consecutive rounds of a market session."""
+
+    steps: list[RoundStep]
+
+
+class DeltaRoundStep(BaseModel):
+    """Changes made in a single round of the algorithm.
+
+    Instead of the full tentative matching, only the matches made and broken in
+    this round are listed. Keyframe rounds also carry the full tentative matching.
+    """
+
+    round: int
+    proposals: list[ProposalAction]
+    rejections: list[ProposalAction]
+    new_matches: list[ProposalAction]
+    broken_matches: list[ProposalAction]
+    self_matches: list[str]
+    keyframe: list[ProposalAction] | None = None
+
+
+class DeltaStepsResponse(BaseModel):
+    """Response for the step-through endpoint in delta mode."""
+
+    steps: list[DeltaRoundStep]
+    keyframe_interval: int
+    final_result: MatchingResponse
+
+    def tentative_matches_at(self, round_num: int) -> list[ProposalAction]:
+        """Reconstruct the tentative matching after the given round.
+
+        Replays the deltas starting from the closest keyframe at or before the round.
+
+        Args:
+            round_num: Round number, 0 for the state before the first round.
+
+        Raises:
+            ValueError: If round_num is not between 0 and the number of steps.
+
+        Returns:
+            Tentative matches in no particular order.
+        """
+        if not 0 <= round_num <= len(self.steps):
+            raise ValueError(f"Round must be between 0 and {len(self.steps)}, got {round_num}.")
+        matches: dict[str, str] = {}
+        start = 0
+        if self.keyframe_interval > 0 and round_num >= self.keyframe_interval:
+            start = round_num - round_num % self.keyframe_interval
+            matches = {action.proposer: action.responder for action in self.steps[start - 1].keyframe or []}
+        for step in self.steps[start:round_num]:
+            _apply_delta(matches, step)
+        return [ProposalAction(proposer=p, responder=r) for p, r in matches.items()]
+
+    def to_steps_response(self) -> StepsResponse:
+        """Expand into a StepsResponse with the full tentative matching in every round.
+
+        Tentative matches are listed in no particular order.
+        """
+        matches: dict[str, str] = {}
+        steps: list[RoundStep] = []
+        for step in self.steps:
+            _apply_delta(matches, step)
+            steps.append(
+                RoundStep(
+                    round=step.round,
+                    proposals=step.proposals,
+                    rejections=step.rejections,
+                    tentative_matches=[ProposalAction(proposer=p, responder=r) for p, r in matches.items()],
+                    self_matches=step.self_matches,
+                )
+            )
+        return StepsResponse(steps=steps, final_result=self.final_result)
+
+
+def _apply_delta(matches: dict[str, str], step: DeltaRoundStep) -> None:
+    """Apply the matches broken and made in a round to a proposer -> responder mapping."""
+    for action in step.broken_matches:
+        del matches[action.proposer]
+    for action in step.new_matches:
+        matches[action.proposer] = action.responder
+
+
+class CompactMatchingRequest(BaseModel):
+    """Request body for the compact matching endpoint.
+
+    Names are sent once per side, preferences are lists of indices into the
+    other side's names.
+    """
+
+    proposers: list[str]
+    responders: list[str]
+    proposer_preferences: list[list[int]]
+    responder_preferences: list[list[int]]
+
+    @model_validator(mode="after")
+    def _check_tables(self) -> Self:
+        for side, names in (("proposers", self.proposers), ("responders", self.responders)):
+            if len(set(names)) != len(names):
+                raise ValueError(f"Names in {side} must be unique.")
+        for field, prefs, names, other_names in (
+            ("proposer_preferences", self.proposer_preferences, self.proposers, self.responders),
+            ("responder_preferences", self.responder_preferences, self.responders, self.proposers),
+        ):
+            if len(prefs) != len(names):
+                raise ValueError(f"{field} must have one list per name, got {len(prefs)} for {len(names)} names.")
+            for i, indices in enumerate(prefs):
+                if any(not 0 <= j < len(other_names) for j in indices):
+                    raise ValueError(f"{field}[{i}] has an index outside 0..{len(other_names) - 1}.")
+                if len(set(indices)) != len(indices):
+                    raise ValueError(f"{field}[{i}] has duplicate indices.")
+        return self
+
+
+class CompactMatchingResponse(BaseModel):
+    """Response for the compact matching endpoint.
+
+    Matches are indices into the other side's names, -1 meaning matched to self.
+    Blocking pairs are (proposer index, responder index) pairs.
+    """
+
+    rounds: int
+    proposer_matches: list[int]
+    responder_matches: list[int]
+    all_matched: bool
+    is_stable: bool
+    is_individually_rational: bool
+    blocking_pairs: list[tuple[int, int]]
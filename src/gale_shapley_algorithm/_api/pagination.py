@@ -0,0 +1,76 @@
+"""Pages of the matches and blocking pairs of stored results.
+
+Results kept by the server, of sessions and jobs, can be read a page at a
+time instead of in one body. Cursors are offsets into the filtered pairs, in
+the order of the full result, so a page is stable as long as the result is.
+Results are paged as `ResultPairs`, whose matches are a list rather than a
+dict, so unfiltered pages are sliced without walking the pairs before the
+cursor. Filtered pages keep only their own pairs while counting the rest.
+"""
+
+from collections.abc import Sequence
+from typing import Annotated, TypedDict
+
+from fastapi import Query
+
+from gale_shapley_algorithm._api.step_through import MatchingContent
+
+# Most pairs returned by one page
+MAX_PAGE_SIZE = 1_000
+
+Cursor = Annotated[int, Query(ge=0, description="Offset of the first pair, next_cursor of the previous page")]
+Limit = Annotated[int, Query(ge=1, le=MAX_PAGE_SIZE, description="Most pairs per page")]
+Prefix = Annotated[str | None, Query(description="Only pairs with a participant whose name starts with this")]
+Participant = Annotated[str | None, Query(description="Only pairs involving this participant")]
+
+
+class ResultPairs(TypedDict):
+    """The matches and blocking pairs of a result, as lists of (proposer, responder) pairs."""
+
+    matches: list[tuple[str, str]]
+    blocking_pairs: list[tuple[str, str]] | list[list[str]]
+
+
+def result_pairs(result: MatchingContent) -> ResultPairs:
+    """Returns the pairs of a result in a form pages can be sliced from."""
+    return {"matches": list(result["matches"].items()), "blocking_pairs": result["blocking_pairs"]}
+
+
+def pair_page(
+    pairs: Sequence[tuple[str, str]] | Sequence[list[str]],
+    cursor: int = 0,
+    limit: int = 100,
+    prefix: str | None = None,
+    participant: str | None = None,
+) -> dict[str, object]:
+    """Filter (proposer, responder) pairs and return one page as PairPage-shaped plain data.
+
+    Args:
+        pairs: Pairs in result order.
+        cursor: Offset of the first pair of the page in the filtered pairs. Defaults to 0.
+        limit: Most pairs in the page. Defaults to 100.
+        prefix: Keep pairs where either name starts with this. Defaults to None.
+        participant: Keep pairs where either name is this. Defaults to None.
+
+    Returns:
+        The page, the number of filtered pairs and the cursor of the next page,
+        None on the last page.
+    """
+    stop = cursor + limit
+    if prefix is None and participant is None:
+        total = len(pairs)
+        page = pairs[cursor:stop]
+    else:
+        total, page = 0, []
+        for p, r in pairs:
+            if (prefix is None or p.startswith(prefix) or r.startswith(prefix)) and (
+                participant is None or participant in (p, r)
+            ):
+                if cursor <= total < stop:
+                    page.append((p, r))
+                total += 1
+    return {
+        "items": [{"proposer": p, "responder": r} for p, r in page],
+        "total": total,
+        "next_cursor": stop if stop < total else None,
+    }
@@ -0,0 +1,64 @@
+"""Fast JSON responses that bypass Pydantic model construction and validation.
+
+Route handlers build plain dicts and lists straight from the solver's results
+and return them through FastJSONResponse. orjson is used when installed
+(`pip install gale-shapley-algorithm[fast]`), the standard library otherwise.
+
+The matching and step-through endpoints validate their content into their
+Pydantic response models by default, as FastAPI does with returned models.
+Setting GALE_SHAPLEY_FAST_JSON=1 opts them in to the fast path as well.
+"""
+
+import json
+import os
+from collections.abc import Mapping
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def dumps(content: object) -> bytes:
+    """Serialize plain JSON-compatible content to compact UTF-8 bytes."""
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def loads(data: bytes) -> object:
+    """Parse JSON bytes written by `dumps`."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class FastJSONResponse(Response):
+    """JSON response rendered with `dumps`, content must already be plain JSON-compatible data."""
+
+    media_type = "application/json"
+
+    def render(self, content: object) -> bytes:
+        return dumps(content)
+
+
+# Render model-shaped content without building the models, see the module docstring
+fast_json = os.environ.get("GALE_SHAPLEY_FAST_JSON", "") == "1"
+
+
+def model_response(content: Mapping[str, object], model: type[BaseModel]) -> Response:
+    """Respond with plain content shaped like model, through the fast path if opted in."""
+    if fast_json:
+        return FastJSONResponse(content)
+    return JSONResponse(jsonable_encoder(model.model_validate(content)))
+
+
+def model_line(content: Mapping[str, object], model: type[BaseModel]) -> bytes:
+    """Serialize plain content shaped like model as one NDJSON line, see `model_response`."""
+    if fast_json:
+        return dumps(content) + b"\n"
+    return model.model_validate(content).model_dump_json().encode() + b"\n"
@@ -1,10 +1,37 @@
 """API route handlers."""
 
-from fastapi import APIRouter
+from collections.abc import AsyncIterator, Iterator
+from time import perf_counter
+from typing import Annotated
 
-from gale_shapley_algorithm._api.models import MatchingRequest, MatchingResponse, StepsResponse
-from gale_shapley_algorithm._api.step_through import _build_matching_response, _build_participants, run_step_through
+from fastapi import APIRouter, Query, Request, Response
+from fastapi.exceptions import RequestValidationError
+from starlette.concurrency import iterate_in_threadpool, run_in_threadpool
+
+from gale_shapley_algorithm._api.compact import _build_compact_participants, compact_content
+from gale_shapley_algorithm._api.limits import (
+    Lane,
+    LaneStreamingResponse,
+    admit,
+    admitted,
+    limits,
+    run_cancellable,
+)
+from gale_shapley_algorithm._api.metrics import market_size_label, metrics, observe_solve
+from gale_shapley_algorithm._api.models import (
+    CompactMatchingRequest,
+    CompactMatchingResponse,
+    DeltaStepsResponse,
+    MatchingRequest,
+    MatchingResponse,
+    StepsResponse,
+)
+from gale_shapley_algorithm._api.responses import FastJSONResponse, model_response
+from gale_shapley_algorithm._api.step_through import _matching_content, steps_content, stream_step_through
+from gale_shapley_algorithm.cancellation import CancellationToken, SolveTimeoutError
+from gale_shapley_algorithm.matching import _build_algorithm
 from gale_shapley_algorithm.stability import check_stability
+from gale_shapley_algorithm.validation import validate_market
 
 router = APIRouter(prefix="/api")
 
@@ -15,16 +42,152 @@ def health() -> dict[str, str]:
     return {"status": "ok"}
 
 
-@router.post("/matching")
-def run_matching(req: MatchingRequest) -> MatchingResponse:
+def _dimensions(req: MatchingRequest | CompactMatchingRequest) -> tuple[int, int, int]:
+    """Number of proposers, number of responders and total preference list length of a request."""
+    if isinstance(req, CompactMatchingRequest):
+        lists = [*req.proposer_preferences, *req.responder_preferences]
+        return len(req.proposers), len(req.responders), sum(map(len, lists))
+    lists = [*req.proposer_preferences.values(), *req.responder_preferences.values()]
+    return len(req.proposer_preferences), len(req.responder_preferences), sum(map(len, lists))
+
+
+def _check_market(req: MatchingRequest) -> None:
+    """Reject unknown, repeated and colliding names with 422, located like Pydantic errors.
+
+    Raises:
+        RequestValidationError: If the market has validation errors.
+    """
+    if errors := validate_market(req.proposer_preferences, req.responder_preferences).errors:
+        raise RequestValidationError(
+            [{"type": issue.code, "loc": ("body", *issue.location), "msg": issue.message} for issue in errors]
+        )
+
+
+@router.post("/matching", response_model=MatchingResponse)
+async def run_matching(req: MatchingRequest, request: Request) -> Response:
     """Run the Gale-Shapley algorithm and return results with stability info."""
-    algorithm = _build_participants(req.proposer_preferences, req.responder_preferences)
-    result = algorithm.execute()
-    stability = check_stability(algorithm)
-    return _build_matching_response(result, stability)
+    return await run_cancellable(request, _solve_matching, req, request)
+
+
+def _solve_matching(req: MatchingRequest, request: Request, cancel: CancellationToken) -> Response:
+    with admitted(*_dimensions(req)):
+        _check_market(req)
+        started = perf_counter()
+        algorithm = _build_algorithm(req.proposer_preferences, req.responder_preferences)
+        result = algorithm.execute(cancel=cancel)
+        stability = check_stability(algorithm)
+        solved = perf_counter()
+    response = model_response(_matching_content(result, stability), MatchingResponse)
+    participants = len(algorithm.proposers) + len(algorithm.responders)
+    observe_solve(
+        request,
+        endpoint="matching",
+        participants=participants,
+        rounds=result.rounds,
+        proposals=algorithm.proposals,
+        solve_seconds=solved - started,
+        serialize_seconds=perf_counter() - solved,
+    )
+    return response
+
+
+@router.post("/matching/compact", response_model=CompactMatchingResponse)
+async def run_compact_matching(req: CompactMatchingRequest, request: Request) -> FastJSONResponse:
+    """Run the algorithm on index-based preferences and return index-based results."""
+    return await run_cancellable(request, _solve_compact_matching, req, request)
+
 
+def _solve_compact_matching(
+    req: CompactMatchingRequest, request: Request, cancel: CancellationToken
+) -> FastJSONResponse:
+    with admitted(*_dimensions(req)):
+        started = perf_counter()
+        algorithm = _build_compact_participants(req)
+        result = algorithm.execute(cancel=cancel)
+        stability = check_stability(algorithm)
+        solved = perf_counter()
+    response = FastJSONResponse(compact_content(algorithm, result, stability))
+    participants = len(algorithm.proposers) + len(algorithm.responders)
+    observe_solve(
+        request,
+        endpoint="compact",
+        participants=participants,
+        rounds=result.rounds,
+        proposals=algorithm.proposals,
+        solve_seconds=solved - started,
+        serialize_seconds=perf_counter() - solved,
+    )
+    return response
 
-@router.post("/matching/steps")
-def run_matching_steps(req: MatchingRequest) -> StepsResponse:
+
+@router.post("/matching/steps", response_model=StepsResponse | DeltaStepsResponse)
+async def run_matching_steps(
+    req: MatchingRequest,
+    request: Request,
+    delta: Annotated[bool, Query(description="Only list matches made and broken in each round")] = False,
+    keyframe_interval: Annotated[
+        int, Query(ge=0, description="In delta mode, attach the full matching every N rounds")
+    ] = 0,
+) -> Response:
     """Run the algorithm step by step, returning per-round snapshots."""
-    return run_step_through(req.proposer_preferences, req.responder_preferences)
+    return await run_cancellable(request, _solve_matching_steps, req, request, delta, keyframe_interval)
+
+
+def _solve_matching_steps(
+    req: MatchingRequest, request: Request, delta: bool, keyframe_interval: int, cancel: CancellationToken
+) -> Response:
+    with admitted(*_dimensions(req)):
+        _check_market(req)
+        started = perf_counter()
+        algorithm = _build_algorithm(req.proposer_preferences, req.responder_preferences)
+        content = steps_content(algorithm, delta, keyframe_interval, cancel=cancel)
+        solved = perf_counter()
+    response = model_response(content, DeltaStepsResponse if delta else StepsResponse)
+    participants = len(algorithm.proposers) + len(algorithm.responders)
+    observe_solve(
+        request,
+        endpoint="steps",
+        participants=participants,
+        rounds=algorithm.round,
+        proposals=algorithm.proposals,
+        solve_seconds=solved - started,
+        serialize_seconds=perf_counter() - solved,
+    )
+    return response
+
+
+async def _until_disconnected(request: Request, lines: Iterator[bytes]) -> AsyncIterator[bytes]:
+    """Yield lines computed in the threadpool, stopping as soon as the client disconnects.
+
+    The response has started by then, so a solve that times out ends the stream
+    without its final line. lines is closed on exit if it is a generator, which
+    stops its computation.
+    """
+    try:
+        async for line in iterate_in_threadpool(lines):
+            if await request.is_disconnected():
+                break
+            yield line
+    except SolveTimeoutError:
+        metrics.cancellations.inc("timeout")
+    finally:
+        if (close := getattr(lines, "close", None)) is not None:
+            close()
+
+
+def _admit_stream(req: MatchingRequest) -> tuple[Lane, int]:
+    """Check a streamed market and take a slot in its lane, returns the lane and the number of participants."""
+    _check_market(req)
+    num_proposers, num_responders, list_entries = _dimensions(req)
+    return admit(num_proposers, num_responders, list_entries), num_proposers + num_responders
+
+
+@router.post("/matching/steps/stream")
+async def stream_matching_steps(req: MatchingRequest, request: Request) -> LaneStreamingResponse:
+    """Stream per-round snapshots as newline-delimited JSON, ending with the final result."""
+    # Checking a large market takes a while, so it runs in the threadpool like the solves
+    lane, participants = await run_in_threadpool(_admit_stream, req)
+    request.state.market_size = market_size_label(participants)
+    cancel = CancellationToken(timeout=limits.solve_timeout)
+    lines = stream_step_through(req.proposer_preferences, req.responder_preferences, cancel)
+    return LaneStreamingResponse(_until_disconnected(request, lines), lane, media_type="application/x-ndjson")
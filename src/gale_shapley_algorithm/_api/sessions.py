@@ -0,0 +1,286 @@
+"""Server-side market sessions, queried round by round.
+
+Creating a session solves the market once, writing its event log to memory.
+Rounds are then rebuilt on demand from the log, so clients scrubbing through
+an animation only fetch the rounds they show, and the final result can be
+read a page of pairs at a time. Sessions are kept in a store
+bounded by count and total log size, evicting the least recently used, and
+expire once unused for `Limits.session_ttl` seconds.
+"""
+
+import io
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from functools import cached_property
+from time import perf_counter
+from typing import Annotated
+
+from fastapi import APIRouter, HTTPException, Path, Query, Request, Response
+
+from gale_shapley_algorithm._api.limits import admitted, limits, run_cancellable
+from gale_shapley_algorithm._api.metrics import metrics, observe_solve
+from gale_shapley_algorithm._api.models import (
+    MatchingRequest,
+    PairPage,
+    RoundRangeResponse,
+    RoundStep,
+    SessionResponse,
+)
+from gale_shapley_algorithm._api.pagination import (
+    Cursor,
+    Limit,
+    Participant,
+    Prefix,
+    ResultPairs,
+    pair_page,
+    result_pairs,
+)
+from gale_shapley_algorithm._api.responses import FastJSONResponse
+from gale_shapley_algorithm._api.routes import _check_market, _dimensions
+from gale_shapley_algorithm._api.step_through import MatchingContent, _matching_content
+from gale_shapley_algorithm.cancellation import CancellationToken
+from gale_shapley_algorithm.event_log import EventLogReader, EventLogWriter
+from gale_shapley_algorithm.matching import _build_algorithm
+from gale_shapley_algorithm.stability import check_stability
+
+# Most rounds returned by one range query
+MAX_RANGE = 1_000
+
+
+@dataclass
+class Session:
+    """A solved market, held as its event log."""
+
+    log: EventLogReader
+    size: int
+    final_result: MatchingContent
+    expires_at: float = 0.0
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    @property
+    def rounds(self) -> int:
+        return len(self.log.rounds)
+
+    @cached_property
+    def pairs(self) -> ResultPairs:
+        """The pairs of the final result, built on first use for paging."""
+        return result_pairs(self.final_result)
+
+
+class SessionStore:
+    """Sessions by ID, bounded by count and total size, with TTL expiry refreshed on use."""
+
+    def __init__(
+        self, max_sessions: int, max_bytes: int, ttl: float, clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        self.max_sessions = max_sessions
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._clock = clock
+        self._sessions: OrderedDict[str, Session] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def add(self, session: Session) -> str:
+        """Store a session, evicting expired and least recently used ones to make room.
+
+        Raises:
+            HTTPException: 413 if the session alone is larger than the store.
+
+        Returns:
+            The new session ID.
+        """
+        if session.size > self.max_bytes:
+            metrics.rejections.inc("session_size")
+            raise HTTPException(status_code=413, detail="Market too large to keep as a session.")
+        session_id = secrets.token_urlsafe(16)
+        with self._lock:
+            now = self._clock()
+            for expired in [key for key, held in self._sessions.items() if held.expires_at <= now]:
+                self._remove(expired)
+            while self._sessions and (
+                len(self._sessions) >= self.max_sessions or self._bytes + session.size > self.max_bytes
+            ):
+                self._remove(next(iter(self._sessions)))
+            session.expires_at = now + self.ttl
+            self._sessions[session_id] = session
+            self._bytes += session.size
+            self._update_gauges()
+        return session_id
+
+    def get(self, session_id: str) -> Session:
+        """Returns a session and extends its expiry.
+
+        Raises:
+            HTTPException: 404 if the session does not exist or has expired.
+        """
+        with self._lock:
+            session = self._sessions.get(session_id)
+            now = self._clock()
+            if session is not None and session.expires_at <= now:
+                self._remove(session_id)
+                self._update_gauges()
+                metrics.session_lookups.inc("expired")
+                session = None
+            elif session is None:
+                metrics.session_lookups.inc("miss")
+            else:
+                metrics.session_lookups.inc("hit")
+                session.expires_at = now + self.ttl
+                self._sessions.move_to_end(session_id)
+        if session is None:
+            raise HTTPException(status_code=404, detail="Session not found or expired.")
+        return session
+
+    def delete(self, session_id: str) -> bool:
+        """Remove a session, returns False if it did not exist."""
+        with self._lock:
+            if session_id not in self._sessions:
+                return False
+            self._remove(session_id)
+            self._update_gauges()
+            return True
+
+    def _remove(self, session_id: str) -> None:
+        session = self._sessions.pop(session_id)
+        self._bytes -= session.size
+        session.log.close()
+
+    def _update_gauges(self) -> None:
+        metrics.sessions.set(value=len(self._sessions))
+        metrics.session_bytes.set(value=self._bytes)
+
+
+sessions = SessionStore(limits.max_sessions, limits.max_session_bytes, limits.session_ttl)
+
+
+def _round_contents(session: Session, start: int, stop: int) -> list[dict[str, object]]:
+    """Rebuild rounds start..stop of a session as RoundStep-shaped plain data."""
+    log = session.log
+    with session.lock:
+        matches = log.matching_at(start - 1)
+        held_by = {responder: proposer for proposer, responder in matches.items()}
+        contents: list[dict[str, object]] = []
+        for round_ in range(start, stop + 1):
+            events = log.events(round_)
+            proposals = [(p, r) for kind, p, r in events if kind == "propose"]
+            proposed = set(proposals)
+            for kind, p, r in events:
+                if kind == "accept" and r is not None:
+                    if (previous := held_by.get(r)) is not None:
+                        del matches[previous]
+                    held_by[r], matches[p] = p, r
+            contents.append(
+                {
+                    "round": round_,
+                    "proposals": [{"proposer": p, "responder": r} for p, r in proposals],
+                    # Only proposals of this round, not proposers displaced from earlier rounds
+                    "rejections": [
+                        {"proposer": p, "responder": r}
+                        for kind, p, r in events
+                        if kind == "reject" and (p, r) in proposed
+                    ],
+                    "tentative_matches": [
+                        {"proposer": p, "responder": matches[p]} for p in log.proposers if p in matches
+                    ],
+                    "self_matches": [p for kind, p, _ in events if kind == "self"],
+                }
+            )
+    return contents
+
+
+router = APIRouter(prefix="/api/sessions")
+
+
+@router.post("", response_model=SessionResponse, status_code=201)
+async def create_session(req: MatchingRequest, request: Request) -> FastJSONResponse:
+    """Solve a market once and keep its event log for round queries."""
+    return await run_cancellable(request, _solve_session, req, request)
+
+
+def _solve_session(req: MatchingRequest, request: Request, cancel: CancellationToken) -> FastJSONResponse:
+    with admitted(*_dimensions(req)):
+        _check_market(req)
+        started = perf_counter()
+        algorithm = _build_algorithm(req.proposer_preferences, req.responder_preferences)
+        buffer = io.BytesIO()
+        with EventLogWriter(algorithm, buffer) as writer:
+            result = algorithm.execute(on_round=writer, cancel=cancel)
+        final_result = _matching_content(result, check_stability(algorithm))
+        solved = perf_counter()
+    session = Session(log=EventLogReader(buffer), size=buffer.getbuffer().nbytes, final_result=final_result)
+    session_id = sessions.add(session)
+    response = FastJSONResponse(
+        {"session_id": session_id, "rounds": result.rounds, "ttl_seconds": sessions.ttl, "final_result": final_result},
+        status_code=201,
+    )
+    participants = len(algorithm.proposers) + len(algorithm.responders)
+    observe_solve(
+        request,
+        endpoint="sessions",
+        participants=participants,
+        rounds=result.rounds,
+        proposals=algorithm.proposals,
+        solve_seconds=solved - started,
+        serialize_seconds=perf_counter() - solved,
+    )
+    return response
+
+
+@router.get("/{session_id}/rounds/{round_num}", response_model=RoundStep)
+def get_session_round(session_id: str, round_num: Annotated[int, Path(ge=1)]) -> FastJSONResponse:
+    """Return a single round of a session."""
+    session = sessions.get(session_id)
+    if round_num > session.rounds:
+        raise HTTPException(status_code=404, detail=f"Session has {session.rounds} rounds.")
+    return FastJSONResponse(_round_contents(session, round_num, round_num)[0])
+
+
+@router.get("/{session_id}/rounds", response_model=RoundRangeResponse)
+def get_session_rounds(
+    session_id: str,
+    start: Annotated[int, Query(ge=1, description="First round to return")] = 1,
+    stop: Annotated[int | None, Query(ge=1, description="Last round to return, defaults to the last round")] = None,
+) -> FastJSONResponse:
+    """Return consecutive rounds of a session, at most MAX_RANGE per request.
+
+    Like a slice, the range is cut at the last round and may be empty.
+    """
+    session = sessions.get(session_id)
+    stop = min(session.rounds if stop is None else stop, start + MAX_RANGE - 1, session.rounds)
+    if start > stop:
+        return FastJSONResponse({"steps": []})
+    return FastJSONResponse({"steps": _round_contents(session, start, stop)})
+
+
+@router.get("/{session_id}/result/matches", response_model=PairPage)
+def get_session_matches(
+    session_id: str, cursor: Cursor = 0, limit: Limit = 100, prefix: Prefix = None, participant: Participant = None
+) -> FastJSONResponse:
+    """Return a page of the matched pairs of a session's final result."""
+    matches = sessions.get(session_id).pairs["matches"]
+    return FastJSONResponse(pair_page(matches, cursor, limit, prefix, participant))
+
+
+@router.get("/{session_id}/result/blocking-pairs", response_model=PairPage)
+def get_session_blocking_pairs(
+    session_id: str, cursor: Cursor = 0, limit: Limit = 100, prefix: Prefix = None, participant: Participant = None
+) -> FastJSONResponse:
+    """Return a page of the blocking pairs of a session's final result."""
+    blocking_pairs = sessions.get(session_id).pairs["blocking_pairs"]
+    return FastJSONResponse(pair_page(blocking_pairs, cursor, limit, prefix, participant))
+
+
+@router.delete("/{session_id}", status_code=204)
+def delete_session(session_id: str) -> Response:
+    """Discard a session."""
+    if not sessions.delete(session_id):
+        raise HTTPException(status_code=404, detail="Session not found or expired.")
+    return Response(status_code=204)
@@ -1,168 +1,190 @@
 """Step-through execution of the Gale-Shapley algorithm, capturing per-round state."""
 
-from gale_shapley_algorithm._api.models import (
-    MatchingResponse,
-    ProposalAction,
-    RoundStep,
-    StepsResponse,
-)
+from collections.abc import Iterator
+from dataclasses import dataclass
+from typing import TypedDict
+
+from gale_shapley_algorithm._api.models import RoundStep, StepsStreamEnd
+from gale_shapley_algorithm._api.responses import model_line
 from gale_shapley_algorithm.algorithm import Algorithm
+from gale_shapley_algorithm.cancellation import CancellationToken
+from gale_shapley_algorithm.matching import _build_algorithm
 from gale_shapley_algorithm.person import Proposer, Responder
 from gale_shapley_algorithm.result import MatchingResult, StabilityResult
 from gale_shapley_algorithm.stability import check_stability
 
 
-def _build_participants(
-    proposer_preferences: dict[str, list[str]],
-    responder_preferences: dict[str, list[str]],
-) -> Algorithm:
-    """Build Proposer/Responder objects and return an Algorithm instance.
+@dataclass(slots=True)
+class _RoundChanges:
+    """What happened in a single round, as (proposer, responder) name pairs."""
+
+    round: int
+    proposals: list[tuple[str, str]]
+    rejections: list[tuple[str, str]]
+    new_matches: list[tuple[str, str]]
+    broken_matches: list[tuple[str, str]]
+    self_matches: list[str]
+
+
+def _run_round(algorithm: Algorithm) -> _RoundChanges:
+    """Run one round of the algorithm and record what changed.
 
-    This mirrors the logic in create_matching() but returns the Algorithm
-    before execution so we can step through it.
+    Only the proposers that propose and the responders that respond are
+    inspected, so the cost is proportional to the round's activity rather
+    than to the size of the market.
     """
-    proposers = {name: Proposer(name, "proposer") for name in proposer_preferences}
-    responders = {name: Responder(name, "responder") for name in responder_preferences}
-
-    for name, pref_names in proposer_preferences.items():
-        p = proposers[name]
-        prefs: list[Proposer | Responder] = [responders[r] for r in pref_names if r in responders]
-        if p not in prefs:
-            prefs.append(p)
-        for r in responders.values():
-            if r not in prefs:
-                prefs.append(r)
-        p.preferences = tuple(prefs)
-
-    for name, pref_names in responder_preferences.items():
-        r = responders[name]
-        prefs_r: list[Proposer | Responder] = [proposers[p] for p in pref_names if p in proposers]
-        if r not in prefs_r:
-            prefs_r.append(r)
-        for p in proposers.values():
-            if p not in prefs_r:
-                prefs_r.append(p)
-        r.preferences = tuple(prefs_r)
-
-    return Algorithm(list(proposers.values()), list(responders.values()))
-
-
-def _build_matching_response(result: MatchingResult, stability: StabilityResult) -> MatchingResponse:
-    """Combine MatchingResult and StabilityResult into a MatchingResponse."""
-    return MatchingResponse(
-        rounds=result.rounds,
-        matches=result.matches,
-        unmatched=result.unmatched,
-        self_matches=result.self_matches,
-        all_matched=result.all_matched,
-        is_stable=stability.is_stable,
-        is_individually_rational=stability.is_individually_rational,
-        blocking_pairs=stability.blocking_pairs,
+    proposing = algorithm.unmatched_proposers
+    algorithm.proposers_propose()
+
+    proposals: list[tuple[str, str]] = []
+    self_matches: list[str] = []
+    for proposer in proposing:
+        # If proposer proposed to themselves, it's a self-match
+        if proposer.last_proposal is proposer:
+            self_matches.append(proposer.name)
+        elif isinstance(proposer.last_proposal, Responder):
+            proposals.append((proposer.name, proposer.last_proposal.name))
+
+    responding = algorithm.awaiting_to_respond_responders
+    holders = [responder.match for responder in responding]
+    algorithm.responders_respond()
+    algorithm.round += 1
+
+    new_matches: list[tuple[str, str]] = []
+    broken_matches: list[tuple[str, str]] = []
+    for responder, holder in zip(responding, holders, strict=True):
+        if responder.match is holder:
+            continue
+        if isinstance(holder, Proposer):
+            broken_matches.append((holder.name, responder.name))
+        if isinstance(responder.match, Proposer):
+            new_matches.append((responder.match.name, responder.name))
+
+    # They proposed but are not matched -> rejected
+    rejections = [
+        (proposer.name, proposer.last_proposal.name)
+        for proposer in proposing
+        if proposer.match is None and isinstance(proposer.last_proposal, Responder)
+    ]
+
+    return _RoundChanges(
+        round=algorithm.round,
+        proposals=proposals,
+        rejections=rejections,
+        new_matches=new_matches,
+        broken_matches=broken_matches,
+        self_matches=self_matches,
     )
 
 
-def run_step_through(  # noqa: PLR0912
-    proposer_preferences: dict[str, list[str]],
-    responder_preferences: dict[str, list[str]],
-) -> StepsResponse:
-    """Run the algorithm step by step, capturing a RoundStep per round."""
-    algorithm = _build_participants(proposer_preferences, responder_preferences)
-    steps: list[RoundStep] = []
+def _pair_contents(pairs: list[tuple[str, str]]) -> list[dict[str, str]]:
+    return [{"proposer": p, "responder": r} for p, r in pairs]
+
 
+def _tentative_contents(algorithm: Algorithm) -> list[dict[str, str]]:
+    """All proposers currently holding a responder, in proposer order."""
+    return [
+        {"proposer": proposer.name, "responder": proposer.match.name}
+        for proposer in algorithm.proposers
+        if isinstance(proposer.match, Responder)
+    ]
+
+
+def _iter_step_contents(
+    algorithm: Algorithm, delta: bool = False, keyframe_interval: int = 0, cancel: CancellationToken | None = None
+) -> Iterator[dict[str, object]]:
+    """Run the algorithm round by round, yielding each round as plain data.
+
+    The yielded dicts have the shape of RoundStep, or DeltaRoundStep if delta is
+    True, without the cost of building the Pydantic models. If given, cancel is
+    checked before every round.
+    """
     while not algorithm.terminate():
-        round_num = algorithm.round + 1
-
-        # Capture who is unmatched before proposing
-        unmatched_before = {p.name for p in algorithm.unmatched_proposers}
-
-        # Proposers propose
-        algorithm.proposers_propose()
-
-        # After proposing, capture proposals by inspecting last_proposal
-        proposals: list[ProposalAction] = []
-        round_self_matches: list[str] = []
-        for proposer in algorithm.proposers:
-            if proposer.name not in unmatched_before:
-                continue
-            # If proposer proposed to themselves, it's a self-match
-            if proposer.last_proposal is proposer:
-                round_self_matches.append(proposer.name)
-            elif proposer.last_proposal is not None and isinstance(proposer.last_proposal, Responder):
-                proposals.append(ProposalAction(proposer=proposer.name, responder=proposer.last_proposal.name))
-
-        # Responders respond
-        algorithm.responders_respond()
-        algorithm.round += 1
-
-        # After responding, determine rejections and tentative matches
-        rejections: list[ProposalAction] = []
-        tentative_matches: list[ProposalAction] = []
-
-        for proposer in algorithm.proposers:
-            if proposer.name not in unmatched_before:
-                # Already matched from a previous round - still tentatively matched
-                if (
-                    proposer.match is not None
-                    and proposer.match is not proposer
-                    and isinstance(proposer.match, Responder)
-                ):
-                    tentative_matches.append(ProposalAction(proposer=proposer.name, responder=proposer.match.name))
-                continue
-            if proposer.name in round_self_matches:
-                continue
-            # Check if this proposer is now matched or rejected
-            if proposer.match is not None and isinstance(proposer.match, Responder):
-                tentative_matches.append(ProposalAction(proposer=proposer.name, responder=proposer.match.name))
-            elif proposer.last_proposal is not None and isinstance(proposer.last_proposal, Responder):
-                # They proposed but are not matched -> rejected
-                rejections.append(ProposalAction(proposer=proposer.name, responder=proposer.last_proposal.name))
-
-        steps.append(
-            RoundStep(
-                round=round_num,
-                proposals=proposals,
-                rejections=rejections,
-                tentative_matches=tentative_matches,
-                self_matches=round_self_matches,
-            )
-        )
-
-    # Finalize: set unmatched responders to self-match (same as Algorithm.execute)
-    for responder in algorithm.responders:
-        if not responder.is_matched:
-            responder.match = responder
-
-    # Build final result
-    matches: dict[str, str] = {}
-    unmatched: list[str] = []
-    self_matches: list[str] = []
+        if cancel is not None:
+            cancel.check()
+        changes = _run_round(algorithm)
+        content: dict[str, object] = {
+            "round": changes.round,
+            "proposals": _pair_contents(changes.proposals),
+            "rejections": _pair_contents(changes.rejections),
+        }
+        if delta:
+            is_keyframe = keyframe_interval > 0 and changes.round % keyframe_interval == 0
+            content["new_matches"] = _pair_contents(changes.new_matches)
+            content["broken_matches"] = _pair_contents(changes.broken_matches)
+            content["self_matches"] = changes.self_matches
+            content["keyframe"] = _tentative_contents(algorithm) if is_keyframe else None
+        else:
+            content["tentative_matches"] = _tentative_contents(algorithm)
+            content["self_matches"] = changes.self_matches
+        yield content
+
+
+class MatchingContent(TypedDict):
+    """MatchingResponse-shaped plain data, blocking pairs are lists once decoded from JSON."""
+
+    rounds: int
+    matches: dict[str, str]
+    unmatched: list[str]
+    self_matches: list[str]
+    all_matched: bool
+    is_stable: bool
+    is_individually_rational: bool
+    blocking_pairs: list[tuple[str, str]] | list[list[str]]
+
+
+def _matching_content(result: MatchingResult, stability: StabilityResult) -> MatchingContent:
+    """MatchingResponse-shaped plain data of a result and its stability."""
+    return {
+        "rounds": result.rounds,
+        "matches": result.matches,
+        "unmatched": result.unmatched,
+        "self_matches": result.self_matches,
+        "all_matched": result.all_matched,
+        "is_stable": stability.is_stable,
+        "is_individually_rational": stability.is_individually_rational,
+        "blocking_pairs": stability.blocking_pairs,
+    }
+
+
+def _final_content(algorithm: Algorithm) -> MatchingContent:
+    """Finalize a terminated algorithm and build its MatchingResponse as plain data."""
+    result = algorithm.execute()
+    return _matching_content(result, check_stability(algorithm))
+
+
+def steps_content(
+    algorithm: Algorithm,
+    delta: bool = False,
+    keyframe_interval: int = 0,
+    cancel: CancellationToken | None = None,
+) -> dict[str, object]:
+    """Run a built algorithm step by step, returning StepsResponse-shaped plain data.
+
+    With delta True the content has the shape of DeltaStepsResponse, keyframes
+    are attached every keyframe_interval rounds. If given, cancel is checked
+    before every round. The algorithm keeps its round and proposal counts.
+    """
+    content: dict[str, object] = {"steps": list(_iter_step_contents(algorithm, delta, keyframe_interval, cancel))}
+    if delta:
+        content["keyframe_interval"] = keyframe_interval
+    content["final_result"] = _final_content(algorithm)
+    return content
 
-    for proposer in algorithm.proposers:
-        match proposer.match:
-            case None:
-                unmatched.append(proposer.name)
-            case m if m.name == proposer.name:
-                self_matches.append(proposer.name)
-            case m:
-                matches[proposer.name] = m.name
-
-    for responder in algorithm.responders:
-        match responder.match:
-            case m if m == responder:
-                self_matches.append(responder.name)
-            case None:
-                unmatched.append(responder.name)
-
-    result = MatchingResult(
-        rounds=algorithm.round,
-        matches=matches,
-        unmatched=unmatched,
-        self_matches=self_matches,
-        all_matched=len(unmatched) == 0 and len(self_matches) == 0,
-    )
-    stability = check_stability(algorithm)
 
-    return StepsResponse(
-        steps=steps,
-        final_result=_build_matching_response(result, stability),
-    )
+def stream_step_through(
+    proposer_preferences: dict[str, list[str]],
+    responder_preferences: dict[str, list[str]],
+    cancel: CancellationToken | None = None,
+) -> Iterator[bytes]:
+    """Run the algorithm step by step, yielding newline-delimited JSON.
+
+    Each RoundStep is serialized as soon as its round is computed, followed by a
+    final StepsStreamEnd line. Rounds are only computed as lines are consumed, so
+    closing the iterator early stops the algorithm. If given, cancel is checked
+    before every round.
+    """
+    algorithm = _build_algorithm(proposer_preferences, responder_preferences)
+    for content in _iter_step_contents(algorithm, cancel=cancel):
+        yield model_line(content, RoundStep)
+    yield model_line({"final_result": _final_content(algorithm)}, StepsStreamEnd)
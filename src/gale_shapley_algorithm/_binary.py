@@ -0,0 +1,20 @@
+"""Little-endian integer arrays for the binary checkpoint and event log formats."""
+
+import sys
+from array import array
+
+
+def to_le_bytes(values: array) -> bytes:
+    """Little-endian bytes of an integer array."""
+    if sys.byteorder == "big":  # pragma: no cover
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def from_le_bytes(data: bytes, typecode: str = "i") -> array:
+    """Integer array from little-endian bytes, int32 by default."""
+    values = array(typecode, data)
+    if sys.byteorder == "big":  # pragma: no cover
+        values.byteswap()
+    return values
@@ -1,5 +1,17 @@
 """CLI package for the Gale-Shapley algorithm."""
 
-from rich.console import Console
+from typing import TYPE_CHECKING
 
-console = Console()
+if TYPE_CHECKING:
+    from rich.console import Console
+
+
+def __getattr__(name: str) -> "Console":
+    # The shared console is created on first use so that `--help` does not import Rich
+    if name != "console":
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from rich.console import Console
+
+    console = Console()
+    globals()["console"] = console
+    return console
@@ -5,17 +5,6 @@ from typing import TYPE_CHECKING
 
 import typer
 
-from gale_shapley_algorithm._cli import console
-from gale_shapley_algorithm._cli.display import display_preferences, display_results
-from gale_shapley_algorithm._cli.prompts import (
-    prompt_names,
-    prompt_preferences,
-    prompt_random_config,
-    prompt_side_names,
-)
-from gale_shapley_algorithm.matching import _build_algorithm
-from gale_shapley_algorithm.stability import check_stability
-
 if TYPE_CHECKING:
     from gale_shapley_algorithm.result import MatchingResult, StabilityResult
 
@@ -25,8 +14,9 @@ app = typer.Typer(help="Gale-Shapley Algorithm — interactive matching.")
 def _run_matching(
     proposer_prefs: dict[str, list[str]],
     responder_prefs: dict[str, list[str]],
+    memory_profile: bool = False,
 ) -> tuple["MatchingResult", "StabilityResult"]:
-    """Build an Algorithm from preference dicts, execute, and check stability.
+    """Build an Algorithm from preference dicts, execute with a progress bar, and check stability.
 
     Incomplete preference lists are padded: self is appended (for self-matching
     as a fallback), followed by any members of the other side not already listed.
@@ -36,12 +26,29 @@ def _run_matching(
             Need not be complete — missing responders are appended in arbitrary order.
         responder_prefs: Mapping of responder names to ordered list of proposer names.
             Need not be complete — missing proposers are appended in arbitrary order.
+        memory_profile: If True, measure and display the memory used by each stage.
 
     Returns:
         Tuple of (MatchingResult, StabilityResult).
     """
+    if memory_profile:
+        from gale_shapley_algorithm._cli.display import display_memory_profile
+        from gale_shapley_algorithm.profiling import profile_matching
+
+        result, stability, profile = profile_matching(proposer_prefs, responder_prefs)
+        display_memory_profile(profile)
+        return result, stability
+
+    from gale_shapley_algorithm._cli.display import matching_progress
+    from gale_shapley_algorithm.matching import _build_algorithm
+    from gale_shapley_algorithm.progress import ProgressReporter
+    from gale_shapley_algorithm.stability import check_stability
+
     algorithm = _build_algorithm(proposer_prefs, responder_prefs)
-    result = algorithm.execute()
+    with matching_progress(len(algorithm.proposers)) as on_progress:
+        reporter = ProgressReporter(on_progress)
+        result = algorithm.execute(on_round=reporter)
+        reporter.report(algorithm)
     stability = check_stability(algorithm)
     return result, stability
 
@@ -88,12 +95,26 @@ def _generate_random_preferences(
 def main(
     random_mode: bool = typer.Option(False, "--random", help="Generate random preferences"),
     swap_sides: bool = typer.Option(False, "--swap-sides", help="Run twice with swapped proposer/responder roles"),
+    memory_profile: bool = typer.Option(
+        False, "--memory-profile", help="Report peak memory of each stage (slower, uses tracemalloc)"
+    ),
 ) -> None:
     """Run the Gale-Shapley algorithm interactively.
 
     Supports manual preference entry or random generation (--random).
     Use --swap-sides to run the algorithm twice — once with each side proposing — and display both results.
+    Use --memory-profile to see how much memory building, executing and checking the matching take.
     """
+    # Deferred so that --help and shell completion do not pay for Rich and the algorithm
+    from gale_shapley_algorithm._cli import console
+    from gale_shapley_algorithm._cli.display import display_preferences, display_results
+    from gale_shapley_algorithm._cli.prompts import (
+        prompt_names,
+        prompt_preferences,
+        prompt_random_config,
+        prompt_side_names,
+    )
+
     try:
         console.print("\n[bold]Gale-Shapley Algorithm[/bold]\n")
 
@@ -111,17 +132,17 @@ def main(
             # Run 1: original sides
             console.print(f"\n[bold]Result 1: {proposer_side} proposing[/bold]")
             display_preferences(proposer_side, responder_side, proposer_prefs, responder_prefs)
-            result, stability = _run_matching(proposer_prefs, responder_prefs)
+            result, stability = _run_matching(proposer_prefs, responder_prefs, memory_profile)
             display_results(proposer_side, responder_side, result, stability)
 
             # Run 2: swapped sides
             console.print(f"\n[bold]Result 2: {responder_side} proposing[/bold]")
             display_preferences(responder_side, proposer_side, responder_prefs, proposer_prefs)
-            result, stability = _run_matching(responder_prefs, proposer_prefs)
+            result, stability = _run_matching(responder_prefs, proposer_prefs, memory_profile)
             display_results(responder_side, proposer_side, result, stability)
         else:
             display_preferences(proposer_side, responder_side, proposer_prefs, responder_prefs)
-            result, stability = _run_matching(proposer_prefs, responder_prefs)
+            result, stability = _run_matching(proposer_prefs, responder_prefs, memory_profile)
             display_results(proposer_side, responder_side, result, stability)
     except KeyboardInterrupt:
         console.print("\n[yellow]Interrupted.[/yellow]")
@@ -1,12 +1,17 @@
 """Rich output formatting for the CLI."""
 
+from collections.abc import Callable, Generator
+from contextlib import contextmanager
 from typing import TYPE_CHECKING
 
+from rich.progress import BarColumn, MofNCompleteColumn, Progress, TextColumn, TimeElapsedColumn
 from rich.table import Table
 
 from gale_shapley_algorithm._cli import console
 
 if TYPE_CHECKING:
+    from gale_shapley_algorithm.profiling import MemoryProfile
+    from gale_shapley_algorithm.progress import ProgressInfo
     from gale_shapley_algorithm.result import MatchingResult, StabilityResult
 
 
@@ -80,3 +85,52 @@ def display_results(
 
     if stability.blocking_pairs:
         console.print(f"[yellow]Blocking pairs: {stability.blocking_pairs}[/yellow]")
+
+
+def display_memory_profile(profile: "MemoryProfile", top: int = 3) -> None:
+    """Display peak and retained memory of each stage of a run.
+
+    Args:
+        profile: The memory profile from profile_matching().
+        top: Number of object types listed per stage.
+    """
+    table = Table(title="Memory Profile")
+    table.add_column("Stage", style="bold")
+    table.add_column("Peak (KiB)", justify="right")
+    table.add_column("Retained (KiB)", justify="right")
+    table.add_column("Largest types (KiB)")
+
+    for stage in profile.stages:
+        types = ", ".join(f"{name} {size / 1024:.1f}" for name, size in list(stage.by_type.items())[:top])
+        table.add_row(stage.name, f"{stage.peak_bytes / 1024:.1f}", f"{stage.retained_bytes / 1024:.1f}", types or "-")
+
+    console.print(table)
+
+
+@contextmanager
+def matching_progress(num_proposers: int) -> Generator[Callable[["ProgressInfo"], None], None, None]:
+    """Show a progress bar of settled proposers while the block runs, removed once it ends.
+
+    Args:
+        num_proposers: Number of proposers, the total of the bar.
+
+    Yields:
+        Callback updating the bar from a ProgressInfo.
+    """
+    with Progress(
+        TextColumn("Matching"),
+        BarColumn(),
+        MofNCompleteColumn(),
+        TextColumn("round {task.fields[round]}, {task.fields[proposals]} proposals"),
+        TimeElapsedColumn(),
+        console=console,
+        transient=True,
+    ) as progress:
+        task = progress.add_task("matching", total=num_proposers, round=0, proposals=0)
+
+        def update(info: "ProgressInfo") -> None:
+            progress.update(
+                task, completed=num_proposers - info.free_proposers, round=info.round, proposals=info.proposals
+            )
+
+        yield update
@@ -1,10 +1,13 @@
 """Algorithm module."""
 
+from array import array
+from collections.abc import Callable
 from dataclasses import dataclass
 from typing import Final
 
+from gale_shapley_algorithm.cancellation import CancellationToken
 from gale_shapley_algorithm.person import Proposer, Responder
-from gale_shapley_algorithm.result import MatchingResult
+from gale_shapley_algorithm.result import INT32_TYPECODE, ArrayMatchingResult, MatchingResult, MatchingStatistics
 
 
 @dataclass(slots=True)
@@ -17,6 +20,7 @@ class Algorithm:
     proposers: list[Proposer]
     responders: list[Responder]
     round: int = 0
+    proposals: int = 0
 
     @property
     def persons(self) -> list[Proposer | Responder]:
@@ -34,15 +38,32 @@ class Algorithm:
         return [responder for responder in self.responders if responder.awaiting_to_respond]
 
     def proposers_propose(self) -> None:
-        """Makes all unmatched proposers propose to their next choice."""
+        """Makes all unmatched proposers propose to their next choice, counting proposals to responders."""
         for proposer in self.unmatched_proposers:
             proposer.propose()
+            if proposer.match is None:  # proposed to a responder rather than to self
+                self.proposals += 1
 
     def responders_respond(self) -> None:
         """Makes all responders that are awaiting to respond respond."""
         for responder in self.awaiting_to_respond_responders:
             responder.respond()
 
+    def reset(self) -> None:
+        """Clear all matches, proposals and the round counter, keeping persons and preferences.
+
+        Lists are cleared in place, so the algorithm can be executed again without
+        building new persons.
+        """
+        self.round = 0
+        self.proposals = 0
+        for proposer in self.proposers:
+            proposer.match = None
+            proposer.last_proposal = None
+        for responder in self.responders:
+            responder.match = None
+            responder.current_proposals.clear()
+
     def terminate(self) -> bool:
         """Returns True if all proposers are matched, False otherwise."""
         return all(proposer.is_matched for proposer in self.proposers)
@@ -109,22 +130,125 @@ class Algorithm:
 
         return "\n".join(lines)
 
-    def execute(self) -> MatchingResult:
+    def statistics(self) -> MatchingStatistics:
+        """Compute statistics of the current matching in O(n) from the rank tables.
+
+        Every person that proposed or received a proposal has built its rank
+        table (see `Person.rank_of`) while checking acceptability during the
+        rounds, so each lookup here is O(1). A proposer has proposed to every
+        responder up to its last proposal, and every proposal that is not held
+        by a responder has been rejected, so no per-proposal bookkeeping is needed.
+
+        Returns:
+            MatchingStatistics with proposal counts, rejections and partner ranks.
+        """
+        proposals_per_proposer: dict[str, int] = {}
+        for proposer in self.proposers:
+            match proposer.last_proposal:
+                case None:
+                    proposals_per_proposer[proposer.name] = 0
+                case last if last is proposer:  # proposed to everyone ranked above self
+                    proposals_per_proposer[proposer.name] = proposer.rank_of(proposer)
+                case last:
+                    proposals_per_proposer[proposer.name] = proposer.rank_of(last) + 1
+        total_proposals = sum(proposals_per_proposer.values())
+
+        partner_ranks: dict[str, int] = {}
+        side_ranks: tuple[list[int], list[int]] = ([], [])
+        for side, persons in enumerate((self.proposers, self.responders)):
+            for person in persons:
+                if person.match is None or person.match is person:
+                    continue
+                rank = person.rank_of(person.match) + 1
+                partner_ranks[person.name] = rank
+                side_ranks[side].append(rank)
+        proposer_ranks, responder_ranks = side_ranks
+
+        return MatchingStatistics(
+            total_proposals=total_proposals,
+            proposals_per_proposer=proposals_per_proposer,
+            rejections=total_proposals - len(responder_ranks),
+            partner_ranks=partner_ranks,
+            proposer_average_rank=sum(proposer_ranks) / len(proposer_ranks) if proposer_ranks else None,
+            proposer_max_rank=max(proposer_ranks, default=None),
+            responder_average_rank=sum(responder_ranks) / len(responder_ranks) if responder_ranks else None,
+            responder_max_rank=max(responder_ranks, default=None),
+        )
+
+    def execute(
+        self,
+        on_round: Callable[["Algorithm"], None] | None = None,
+        collect_statistics: bool = False,
+        cancel: CancellationToken | None = None,
+    ) -> MatchingResult:
         """Run the algorithm and return structured results.
 
+        Args:
+            on_round: Called with the algorithm after every completed round, when no
+                proposals are pending. Defaults to None.
+            collect_statistics: If True, attach MatchingStatistics to the result. Defaults to False.
+            cancel: Checked before every round to stop the run early. Defaults to None.
+
+        Raises:
+            SolveCancelledError: If cancel is cancelled before the run terminates.
+            SolveTimeoutError: If the deadline of cancel passes before the run terminates.
+
         Returns:
             MatchingResult with rounds, matches, unmatched, self_matches, all_matched.
         """
+        self._run_rounds(on_round, cancel)
+        return self._build_result(collect_statistics)
+
+    def _run_rounds(
+        self, on_round: Callable[["Algorithm"], None] | None = None, cancel: CancellationToken | None = None
+    ) -> None:
+        """Run rounds until all proposers are matched, see `execute`."""
         while not self.terminate():
+            if cancel is not None:
+                cancel.check()
             self.proposers_propose()
             self.responders_respond()
             self.round += 1
+            if on_round is not None:
+                on_round(self)
+
+    def execute_array(
+        self, on_round: Callable[["Algorithm"], None] | None = None, cancel: CancellationToken | None = None
+    ) -> ArrayMatchingResult:
+        """Run the algorithm and return the matching as a partner array.
+
+        Unlike `execute`, no name dicts or lists are built, which matters for
+        large markets when only a few partners or counts are needed.
+
+        Args:
+            on_round: Called with the algorithm after every completed round. Defaults to None.
+            cancel: Checked before every round, see `execute`. Defaults to None.
 
-        # Change None to self matches for unmatched responders
+        Returns:
+            ArrayMatchingResult over proposers then responders.
+        """
+        self._run_rounds(on_round, cancel)
+        self._finalize()
+        persons = self.persons
+        index: dict[object, int] = {person: i for i, person in enumerate(persons)}
+        index[None] = -1
+        return ArrayMatchingResult(
+            rounds=self.round,
+            names=[person.name for person in persons],
+            num_proposers=len(self.proposers),
+            partners=array(INT32_TYPECODE, [index[person.match] for person in persons]),
+        )
+
+    def _finalize(self) -> None:
+        """Change None to self matches for unmatched responders of a terminated algorithm."""
         for responder in self.responders:
             if not responder.is_matched:
                 responder.match = responder
 
+    def _build_result(self, collect_statistics: bool = False) -> MatchingResult:
+        """Finalize the matching of a terminated algorithm and build the MatchingResult, see `execute`."""
+        self._finalize()
+
         matches: dict[str, str] = {}
         unmatched: list[str] = []
         self_matches: list[str] = []
@@ -151,4 +275,5 @@ class Algorithm:
             unmatched=unmatched,
             self_matches=self_matches,
             all_matched=len(unmatched) == 0 and len(self_matches) == 0,
+            statistics=self.statistics() if collect_statistics else None,
         )
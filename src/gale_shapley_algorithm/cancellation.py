@@ -0,0 +1,60 @@
+"""Cooperative cancellation and deadlines for long solves.
+
+A `CancellationToken` is passed to `Algorithm.execute` (or `create_matching`)
+and checked between rounds, so a solve stops cleanly at the next round once
+the token is cancelled from another thread or its deadline has passed. The
+algorithm is left between rounds, with no pending proposals.
+"""
+
+import threading
+import time
+from collections.abc import Callable
+
+
+class SolveCancelledError(Exception):
+    """Raised when a solve is stopped through its cancellation token."""
+
+
+class SolveTimeoutError(SolveCancelledError, TimeoutError):
+    """Raised when a solve runs past the deadline of its cancellation token."""
+
+
+class CancellationToken:
+    """Thread-safe cancellation flag with an optional deadline."""
+
+    def __init__(self, timeout: float | None = None, clock: Callable[[], float] = time.monotonic) -> None:
+        """Create a token, optionally expiring after timeout seconds.
+
+        Args:
+            timeout: Seconds from now after which the token expires. Defaults to None, no deadline.
+            clock: Monotonic clock in seconds. Defaults to time.monotonic.
+        """
+        self._clock = clock
+        self.deadline = None if timeout is None else clock() + timeout
+        self._cancelled = threading.Event()
+
+    def cancel(self) -> None:
+        """Request cancellation, the solve stops at its next check."""
+        self._cancelled.set()
+
+    @property
+    def cancelled(self) -> bool:
+        """Returns True if cancel was called."""
+        return self._cancelled.is_set()
+
+    @property
+    def expired(self) -> bool:
+        """Returns True if the deadline has passed."""
+        return self.deadline is not None and self._clock() >= self.deadline
+
+    def check(self) -> None:
+        """Raise if the token was cancelled or has expired.
+
+        Raises:
+            SolveCancelledError: If cancel was called.
+            SolveTimeoutError: If the deadline has passed.
+        """
+        if self._cancelled.is_set():
+            raise SolveCancelledError("Solve was cancelled.")
+        if self.expired:
+            raise SolveTimeoutError("Solve did not finish before its deadline.")
@@ -0,0 +1,192 @@
+"""Checkpoint and resume of an in-progress algorithm.
+
+Between rounds the whole state of the algorithm is the round and proposal
+counters, the last proposal of every proposer and the proposer held by every
+responder. A checkpoint stores these as int32 arrays of preference and proposer
+indices:
+
+    header     magic b"GSCK", version, round, #proposers, #responders, market crc32, #proposals
+    cursors    per proposer, rank of last_proposal in its preferences, -1 if none
+    holders    per responder, index of the proposer it holds, -1 if none
+
+Preferences are not stored. A checkpoint is restored into an algorithm built
+from the same market, which is verified through a checksum of all names and
+preference lists.
+"""
+
+import os
+import struct
+import zlib
+from array import array
+from pathlib import Path
+
+from gale_shapley_algorithm._binary import from_le_bytes, to_le_bytes
+from gale_shapley_algorithm.algorithm import Algorithm
+from gale_shapley_algorithm.person import Proposer
+from gale_shapley_algorithm.result import MatchingResult
+
+_MAGIC = b"GSCK"
+_VERSION = 2
+_HEADER = struct.Struct("<4sHIIIIQ")
+_NONE = -1
+
+
+def _market_checksum(algorithm: Algorithm) -> int:
+    """CRC32 of the names and preference lists of all persons, in order."""
+    crc = 0
+    for person in algorithm.persons:
+        line = "\x1f".join([person.name, *(other.name for other in person.preferences)]) + "\x1e"
+        crc = zlib.crc32(line.encode(), crc)
+    return crc
+
+
+def dump_checkpoint(algorithm: Algorithm) -> bytes:
+    """Serialize the state of an algorithm between rounds.
+
+    Args:
+        algorithm: An Algorithm instance with no pending proposals.
+
+    Raises:
+        ValueError: If some responder has not responded to its proposals yet.
+
+    Returns:
+        The checkpoint as bytes.
+    """
+    return _dump(algorithm, _market_checksum(algorithm))
+
+
+def _dump(algorithm: Algorithm, checksum: int) -> bytes:
+    """`dump_checkpoint` with the market checksum computed once by the caller."""
+    if algorithm.awaiting_to_respond_responders:
+        raise ValueError("Cannot checkpoint in the middle of a round, some proposals are pending.")
+
+    proposer_index = {proposer: i for i, proposer in enumerate(algorithm.proposers)}
+    cursors = array(
+        "i",
+        (
+            _NONE if proposer.last_proposal is None else proposer.rank_of(proposer.last_proposal)
+            for proposer in algorithm.proposers
+        ),
+    )
+    holders = array(
+        "i",
+        (
+            proposer_index[responder.match] if isinstance(responder.match, Proposer) else _NONE
+            for responder in algorithm.responders
+        ),
+    )
+    header = _HEADER.pack(
+        _MAGIC,
+        _VERSION,
+        algorithm.round,
+        len(algorithm.proposers),
+        len(algorithm.responders),
+        checksum,
+        algorithm.proposals,
+    )
+    return header + to_le_bytes(cursors) + to_le_bytes(holders)
+
+
+def restore_checkpoint(algorithm: Algorithm, data: bytes) -> None:
+    """Restore a state serialized by `dump_checkpoint` into an algorithm.
+
+    Args:
+        algorithm: An Algorithm instance built from the same market as the checkpoint.
+        data: The checkpoint bytes.
+
+    Raises:
+        ValueError: If the data is not a checkpoint, or was made for a different market.
+    """
+    if len(data) < _HEADER.size:
+        raise ValueError("Checkpoint is truncated.")
+    magic, version, round_, num_proposers, num_responders, checksum, proposals = _HEADER.unpack_from(data)
+    if magic != _MAGIC or version != _VERSION:
+        raise ValueError("Not a checkpoint, or written by an unsupported version.")
+    if (num_proposers, num_responders) != (len(algorithm.proposers), len(algorithm.responders)):
+        raise ValueError("Checkpoint was made for a market of a different size.")
+    if checksum != _market_checksum(algorithm):
+        raise ValueError("Checkpoint was made for a different market.")
+    if len(data) != _HEADER.size + 4 * (num_proposers + num_responders):
+        raise ValueError("Checkpoint is truncated.")
+
+    values = from_le_bytes(data[_HEADER.size :])
+    cursors, holders = values[:num_proposers], values[num_proposers:]
+
+    for proposer, cursor in zip(algorithm.proposers, cursors, strict=True):
+        proposer.last_proposal = None if cursor == _NONE else proposer.preferences[cursor]
+        proposer.match = proposer if proposer.last_proposal is proposer else None
+    for responder, holder in zip(algorithm.responders, holders, strict=True):
+        responder.current_proposals.clear()
+        responder.match = None
+        if holder != _NONE:
+            responder.match = algorithm.proposers[holder]
+            responder.match.match = responder
+    algorithm.round = round_
+    algorithm.proposals = proposals
+
+
+def save_checkpoint(algorithm: Algorithm, path: str | os.PathLike[str]) -> None:
+    """Write a checkpoint of an algorithm to a file.
+
+    The file is replaced atomically, so an interrupted save leaves the previous
+    checkpoint intact.
+
+    Args:
+        algorithm: An Algorithm instance with no pending proposals.
+        path: Destination file.
+    """
+    _write_atomically(Path(path), dump_checkpoint(algorithm))
+
+
+def _write_atomically(path: Path, data: bytes) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    with tmp.open("wb") as file:
+        file.write(data)
+        file.flush()
+        os.fsync(file.fileno())
+    tmp.replace(path)
+
+
+def load_checkpoint(algorithm: Algorithm, path: str | os.PathLike[str]) -> None:
+    """Restore an algorithm from a checkpoint file written by `save_checkpoint`.
+
+    Args:
+        algorithm: An Algorithm instance built from the same market as the checkpoint.
+        path: Checkpoint file.
+    """
+    restore_checkpoint(algorithm, Path(path).read_bytes())
+
+
+def execute_with_checkpoints(algorithm: Algorithm, path: str | os.PathLike[str], every: int = 100) -> MatchingResult:
+    """Execute an algorithm, resuming from and periodically saving a checkpoint file.
+
+    If the file exists the algorithm resumes from it, otherwise it starts from
+    scratch. The file is removed once the algorithm has finished. The market
+    checksum is computed once per run, a save costs O(#proposers + #responders)
+    plus the write.
+
+    Args:
+        algorithm: An Algorithm instance built from the market to solve.
+        path: Checkpoint file.
+        every: Save a checkpoint after every this many rounds. Defaults to 100.
+
+    Raises:
+        ValueError: If every is not positive.
+
+    Returns:
+        MatchingResult with the matching outcome.
+    """
+    if every < 1:
+        raise ValueError("every must be a positive number of rounds.")
+    path = Path(path)
+    if path.exists():
+        load_checkpoint(algorithm, path)
+    checksum = _market_checksum(algorithm)
+
+    def on_round(algorithm: Algorithm) -> None:
+        if algorithm.round % every == 0:
+            _write_atomically(path, _dump(algorithm, checksum))
+
+    result = algorithm.execute(on_round=on_round)
+    path.unlink(missing_ok=True)
+    return result
@@ -0,0 +1,287 @@
+"""Binary event log of an algorithm run, with replay of any round.
+
+`EventLogWriter` is passed as the `on_round` callback of `Algorithm.execute`.
+After each round it compares the state with the previous one and appends the
+round's events as int32 triples (kind, proposer index, responder index):
+
+    header       magic b"GSEV", version, #proposers, #responders, checkpoint interval
+    names        length-prefixed UTF-8 names of all proposers, then all responders
+    records      ROUND (round) marker, then the PROPOSE, SELF, ACCEPT and REJECT
+                 events of that round; every `checkpoint_every` rounds a
+                 CHECKPOINT (round) triple followed by the holder of every responder
+    index        (round, offset) int64 pairs of all ROUND markers, then of all CHECKPOINTs
+    trailer      index offset, #rounds, #checkpoints, magic b"GSEI"
+
+`EventLogReader` reads the trailer and index only. The tentative matching at a
+round is rebuilt from the closest checkpoint at or before it, replaying just
+the rounds in between, so no per-round snapshots are kept anywhere.
+"""
+
+import os
+import struct
+from array import array
+from bisect import bisect_right
+from pathlib import Path
+from types import TracebackType
+from typing import BinaryIO, Self
+
+from gale_shapley_algorithm._binary import from_le_bytes, to_le_bytes
+from gale_shapley_algorithm.algorithm import Algorithm
+from gale_shapley_algorithm.person import Proposer, Responder
+from gale_shapley_algorithm.result import MatchingResult
+
+_MAGIC = b"GSEV"
+_INDEX_MAGIC = b"GSEI"
+_VERSION = 1
+_HEADER = struct.Struct("<4sHIII")
+_NAME_LENGTH = struct.Struct("<H")
+_TRAILER = struct.Struct("<QII4s")
+_TRIPLE = 12
+_NONE = -1
+
+# Record kinds, the first int of every triple
+PROPOSE, ACCEPT, REJECT, SELF, ROUND, CHECKPOINT = range(6)
+KIND_NAMES = {PROPOSE: "propose", ACCEPT: "accept", REJECT: "reject", SELF: "self"}
+
+
+class EventLogWriter:
+    """Writes the events of an algorithm run to a binary file, round by round.
+
+    Call the writer after every round, typically through `execute(on_round=writer)`,
+    and close it once the run is over to write the index.
+    """
+
+    def __init__(
+        self, algorithm: Algorithm, path: str | os.PathLike[str] | BinaryIO, checkpoint_every: int = 16
+    ) -> None:
+        """Open the log and write the header and a checkpoint of the current state.
+
+        Args:
+            algorithm: The Algorithm instance whose rounds are logged.
+            path: Destination file, or a binary file object that is left open on close.
+            checkpoint_every: Write a checkpoint after every this many rounds. Defaults to 16.
+
+        Raises:
+            ValueError: If checkpoint_every is not positive.
+        """
+        if checkpoint_every < 1:
+            raise ValueError("checkpoint_every must be a positive number of rounds.")
+        self.checkpoint_every = checkpoint_every
+        self._proposers = algorithm.proposers
+        self._responders = algorithm.responders
+        self._proposer_index: dict[Proposer, int] = {p: i for i, p in enumerate(algorithm.proposers)}
+        self._responder_index = {r: i for i, r in enumerate(algorithm.responders)}
+        # Only proposers free after a round propose in the next one
+        self._free = [i for i, p in enumerate(algorithm.proposers) if not p.is_matched]
+        self._holders = array("i", (self._holder_of(r.match) for r in algorithm.responders))
+        self._rounds = array("q")
+        self._checkpoints = array("q")
+
+        self._owns_file = isinstance(path, str | os.PathLike)
+        # Closed by close() when the writer opened it
+        self._file = Path(path).open("wb") if isinstance(path, str | os.PathLike) else path  # noqa: SIM115
+        self._closed = False
+        self._file.write(_HEADER.pack(_MAGIC, _VERSION, len(self._proposers), len(self._responders), checkpoint_every))
+        for person in algorithm.persons:
+            name = person.name.encode()
+            self._file.write(_NAME_LENGTH.pack(len(name)) + name)
+        self._write_checkpoint(algorithm.round)
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self, exc_type: type[BaseException] | None, exc: BaseException | None, tb: TracebackType | None
+    ) -> None:
+        self.close()
+
+    def _holder_of(self, match: object) -> int:
+        return self._proposer_index[match] if isinstance(match, Proposer) else _NONE
+
+    def _write_checkpoint(self, round_: int) -> None:
+        self._checkpoints.extend((round_, self._file.tell()))
+        self._file.write(to_le_bytes(array("i", (CHECKPOINT, round_, len(self._holders)))) + to_le_bytes(self._holders))
+
+    def __call__(self, algorithm: Algorithm) -> None:
+        """Append the events of the round that just completed.
+
+        Only the proposers that were free before the round and the responders
+        they proposed to are visited, not the whole market.
+        """
+        proposals = array("i")
+        responses = array("i")
+        targets: set[int] = set()
+        for i in self._free:
+            proposer = self._proposers[i]
+            target = proposer.last_proposal
+            if isinstance(target, Responder):
+                r = self._responder_index[target]
+                proposals.extend((PROPOSE, i, r))
+                targets.add(r)
+                if target.match is not proposer:
+                    responses.extend((REJECT, i, r))
+            elif target is proposer:
+                proposals.extend((SELF, i, _NONE))
+        free = [i for i in self._free if not self._proposers[i].is_matched]
+        for r in sorted(targets):
+            holder = self._holder_of(self._responders[r].match)
+            previous = self._holders[r]
+            if holder == previous:
+                continue
+            self._holders[r] = holder
+            if holder != _NONE:
+                responses.extend((ACCEPT, holder, r))
+            if previous != _NONE:  # displaced by a better proposal
+                responses.extend((REJECT, previous, r))
+                free.append(previous)
+        free.sort()
+        self._free = free
+
+        self._rounds.extend((algorithm.round, self._file.tell()))
+        self._file.write(to_le_bytes(array("i", (ROUND, algorithm.round, 0))) + to_le_bytes(proposals + responses))
+        if algorithm.round % self.checkpoint_every == 0:
+            self._write_checkpoint(algorithm.round)
+
+    def close(self) -> None:
+        """Write the index and trailer, and close the file if the writer opened it."""
+        if self._closed:
+            return
+        self._closed = True
+        index_offset = self._file.tell()
+        self._file.write(to_le_bytes(self._rounds) + to_le_bytes(self._checkpoints))
+        self._file.write(_TRAILER.pack(index_offset, len(self._rounds) // 2, len(self._checkpoints) // 2, _INDEX_MAGIC))
+        if self._owns_file:
+            self._file.close()
+
+
+class EventLogReader:
+    """Random access to the rounds of an event log written by `EventLogWriter`."""
+
+    def __init__(self, path: str | os.PathLike[str] | BinaryIO) -> None:
+        """Open a log and read its names and index.
+
+        Args:
+            path: Event log file, or a seekable binary file object that is left open on close.
+
+        Raises:
+            ValueError: If the file is not a complete event log.
+        """
+        self._owns_file = isinstance(path, str | os.PathLike)
+        # Closed by close() when the reader opened it
+        self._file = Path(path).open("rb") if isinstance(path, str | os.PathLike) else path  # noqa: SIM115
+        try:
+            self._read_index()
+        except BaseException:
+            self.close()
+            raise
+
+    def _read_index(self) -> None:
+        self._file.seek(0)
+        header = self._file.read(_HEADER.size)
+        if len(header) < _HEADER.size:
+            raise ValueError("Not an event log.")
+        magic, version, num_proposers, num_responders, self.checkpoint_every = _HEADER.unpack(header)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError("Not an event log, or written by an unsupported version.")
+        names = []
+        for _ in range(num_proposers + num_responders):
+            (length,) = _NAME_LENGTH.unpack(self._file.read(_NAME_LENGTH.size))
+            names.append(self._file.read(length).decode())
+        self.proposers, self.responders = names[:num_proposers], names[num_proposers:]
+
+        end = self._file.seek(0, os.SEEK_END)
+        if end < _TRAILER.size:
+            raise ValueError("Event log is incomplete, the writer was not closed.")
+        self._file.seek(end - _TRAILER.size)
+        index_offset, num_rounds, num_checkpoints, index_magic = _TRAILER.unpack(self._file.read(_TRAILER.size))
+        if index_magic != _INDEX_MAGIC:
+            raise ValueError("Event log is incomplete, the writer was not closed.")
+        self._file.seek(index_offset)
+        index = from_le_bytes(self._file.read(16 * (num_rounds + num_checkpoints)), "q")
+        rounds, checkpoints = index[: 2 * num_rounds], index[2 * num_rounds :]
+        # (round, offset) pairs, in order of rounds
+        self._round_offsets = dict(zip(rounds[::2], rounds[1::2], strict=True))
+        self._checkpoint_rounds = list(checkpoints[::2])
+        self._checkpoint_offsets = list(checkpoints[1::2])
+        # Record offsets in file order, the records of a round end at the next one
+        self._boundaries = sorted([*rounds[1::2], *self._checkpoint_offsets, index_offset])
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self, exc_type: type[BaseException] | None, exc: BaseException | None, tb: TracebackType | None
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the file if the reader opened it."""
+        if self._owns_file:
+            self._file.close()
+
+    @property
+    def rounds(self) -> list[int]:
+        """Returns the logged round numbers."""
+        return list(self._round_offsets)
+
+    def _records(self, round_: int) -> array:
+        """Read the triples of one round, without its marker and checkpoint."""
+        try:
+            start = self._round_offsets[round_]
+        except KeyError:
+            raise ValueError(f"Round {round_} is not in the event log.") from None
+        stop = self._boundaries[bisect_right(self._boundaries, start)]
+        self._file.seek(start + _TRIPLE)
+        return from_le_bytes(self._file.read(stop - start - _TRIPLE))
+
+    def events(self, round_: int) -> list[tuple[str, str, str | None]]:
+        """Returns the (kind, proposer, responder) events of a round in logged order.
+
+        Proposals come first, then the responses. Responder is None for SELF events.
+
+        Raises:
+            ValueError: If the round is not in the log.
+        """
+        records = self._records(round_)
+        return [
+            (KIND_NAMES[kind], self.proposers[p], None if r == _NONE else self.responders[r])
+            for kind, p, r in zip(records[::3], records[1::3], records[2::3], strict=True)
+        ]
+
+    def matching_at(self, round_: int) -> dict[str, str]:
+        """Rebuild the tentative matching after a round, as proposer to responder names.
+
+        Replays the rounds after the closest checkpoint at or before round_.
+
+        Raises:
+            ValueError: If the round is before the first checkpoint or after the last logged round.
+        """
+        i = bisect_right(self._checkpoint_rounds, round_) - 1
+        if i < 0 or (round_ != self._checkpoint_rounds[i] and round_ not in self._round_offsets):
+            raise ValueError(f"Round {round_} is not in the event log.")
+        self._file.seek(self._checkpoint_offsets[i] + _TRIPLE)
+        holders = from_le_bytes(self._file.read(4 * len(self.responders)))
+        for replayed in range(self._checkpoint_rounds[i] + 1, round_ + 1):
+            records = self._records(replayed)
+            # A responder only lets go of a proposer by accepting a better one
+            for kind, p, r in zip(records[::3], records[1::3], records[2::3], strict=True):
+                if kind == ACCEPT:
+                    holders[r] = p
+        return {self.proposers[p]: self.responders[r] for r, p in enumerate(holders) if p != _NONE}
+
+
+def execute_with_event_log(
+    algorithm: Algorithm, path: str | os.PathLike[str] | BinaryIO, checkpoint_every: int = 16
+) -> MatchingResult:
+    """Execute an algorithm, writing its events to an event log file.
+
+    Args:
+        algorithm: An Algorithm instance built from the market to solve.
+        path: Destination file or binary file object, see `EventLogWriter`.
+        checkpoint_every: Write a checkpoint after every this many rounds. Defaults to 16.
+
+    Returns:
+        MatchingResult with the matching outcome.
+    """
+    with EventLogWriter(algorithm, path, checkpoint_every) as writer:
+        return algorithm.execute(on_round=writer)
@@ -1,8 +1,29 @@
-"""Convenience function for creating matchings."""
+"""Convenience functions for creating matchings."""
+
+from collections.abc import Callable, Iterable, Mapping, Sequence
+from dataclasses import replace
 
 from gale_shapley_algorithm.algorithm import Algorithm
+from gale_shapley_algorithm.cancellation import CancellationToken
 from gale_shapley_algorithm.person import Proposer, Responder
+from gale_shapley_algorithm.progress import ProgressInfo, ProgressReporter
+from gale_shapley_algorithm.pruning import prune_preferences
 from gale_shapley_algorithm.result import MatchingResult
+from gale_shapley_algorithm.validation import MarketValidationError, validate_market
+
+
+def _wire_preferences(
+    person: Proposer | Responder,
+    listed: list[Proposer | Responder],
+    others: Iterable[Proposer | Responder],
+) -> None:
+    """Set the preferences of person to listed, then self, then the remaining others."""
+    prefs = listed
+    if person not in prefs:
+        prefs.append(person)
+    ranked = set(prefs)
+    prefs.extend(other for other in others if other not in ranked)
+    person.preferences = tuple(prefs)
 
 
 def _build_algorithm(
@@ -27,31 +48,141 @@ def _build_algorithm(
     responders = {name: Responder(name, "responder") for name in responder_preferences}
 
     for name, pref_names in proposer_preferences.items():
-        p = proposers[name]
-        prefs: list[Proposer | Responder] = [responders[r] for r in pref_names if r in responders]
-        if p not in prefs:
-            prefs.append(p)
-        for r in responders.values():
-            if r not in prefs:
-                prefs.append(r)
-        p.preferences = tuple(prefs)
+        _wire_preferences(proposers[name], [responders[r] for r in pref_names if r in responders], responders.values())
 
     for name, pref_names in responder_preferences.items():
-        r = responders[name]
-        prefs_r: list[Proposer | Responder] = [proposers[p] for p in pref_names if p in proposers]
-        if r not in prefs_r:
-            prefs_r.append(r)
-        for p in proposers.values():
-            if p not in prefs_r:
-                prefs_r.append(p)
-        r.preferences = tuple(prefs_r)
+        _wire_preferences(responders[name], [proposers[p] for p in pref_names if p in proposers], proposers.values())
 
     return Algorithm(list(proposers.values()), list(responders.values()))
 
 
+class MatchingEngine:
+    """Solves many markets with the same participants, reusing one Algorithm.
+
+    Persons, their lists and the algorithm are created once. Each solve resets
+    the algorithm in place and rewires only the preference lists that changed
+    since the previous solve; unchanged ones keep their padded preferences and
+    rank tables. Batches of markets that differ only in some preferences thus
+    neither rebuild the object graph nor re-pad every list.
+    """
+
+    def __init__(self, proposers: Iterable[str], responders: Iterable[str]) -> None:
+        proposer_names, responder_names = list(proposers), list(responders)
+        if len(set(proposer_names)) != len(proposer_names) or len(set(responder_names)) != len(responder_names):
+            raise ValueError("Participant names must be unique on each side.")
+        self.algorithm = Algorithm(
+            [Proposer(name, "proposer") for name in proposer_names],
+            [Responder(name, "responder") for name in responder_names],
+        )
+        self._proposers = {p.name: p for p in self.algorithm.proposers}
+        self._responders = {r.name: r for r in self.algorithm.responders}
+        # The unpadded list each person was last wired with
+        self._wired: dict[Proposer | Responder, list[Proposer | Responder]] = {}
+
+    def solve(
+        self,
+        proposer_preferences: Mapping[str, Sequence[str]],
+        responder_preferences: Mapping[str, Sequence[str]],
+        prune: bool = False,
+    ) -> MatchingResult:
+        """Solve a market over the engine's participants, given by names.
+
+        Preferences are padded like in `create_matching`. Participants missing
+        from a mapping find nobody acceptable, unknown names inside lists are ignored.
+
+        Args:
+            proposer_preferences: Mapping of proposer names to ordered list of responder names.
+            responder_preferences: Mapping of responder names to ordered list of proposer names.
+            prune: If True, prune the preferences before execution, see `create_matching`.
+
+        Raises:
+            ValueError: If a mapping has a key that is not a participant of the engine.
+
+        Returns:
+            MatchingResult with the matching outcome.
+        """
+        if unknown := (proposer_preferences.keys() - self._proposers.keys()) | (
+            responder_preferences.keys() - self._responders.keys()
+        ):
+            raise ValueError(f"Unknown participants: {sorted(unknown)}")
+        proposers, responders = self._proposers, self._responders
+        return self._solve(
+            [
+                [responders[r] for r in proposer_preferences.get(p.name, ()) if r in responders]
+                for p in proposers.values()
+            ],
+            [
+                [proposers[p] for p in responder_preferences.get(r.name, ()) if p in proposers]
+                for r in responders.values()
+            ],
+            prune,
+        )
+
+    def solve_indices(
+        self,
+        proposer_preferences: Sequence[Sequence[int]],
+        responder_preferences: Sequence[Sequence[int]],
+        prune: bool = False,
+    ) -> MatchingResult:
+        """Solve a market over the engine's participants, given as rank arrays of indices.
+
+        Args:
+            proposer_preferences: For each proposer, in order, the indices of its acceptable responders.
+            responder_preferences: For each responder, in order, the indices of its acceptable proposers.
+            prune: If True, prune the preferences before execution, see `create_matching`.
+
+        Raises:
+            ValueError: If the number of lists does not match the number of participants,
+                or an index is out of range.
+
+        Returns:
+            MatchingResult with the matching outcome.
+        """
+        proposers, responders = self.algorithm.proposers, self.algorithm.responders
+        if len(proposer_preferences) != len(proposers) or len(responder_preferences) != len(responders):
+            raise ValueError("Expected one preference list per participant.")
+        for lists, size in ((proposer_preferences, len(responders)), (responder_preferences, len(proposers))):
+            if any(not 0 <= i < size for indices in lists for i in indices):
+                raise ValueError("Preference index out of range.")
+        return self._solve(
+            [[responders[i] for i in indices] for indices in proposer_preferences],
+            [[proposers[i] for i in indices] for indices in responder_preferences],
+            prune,
+        )
+
+    def _solve(
+        self,
+        proposer_lists: list[list[Proposer | Responder]],
+        responder_lists: list[list[Proposer | Responder]],
+        prune: bool,
+    ) -> MatchingResult:
+        algorithm = self.algorithm
+        algorithm.reset()
+        for persons, lists, others in (
+            (algorithm.proposers, proposer_lists, algorithm.responders),
+            (algorithm.responders, responder_lists, algorithm.proposers),
+        ):
+            for person, listed in zip(persons, lists, strict=True):
+                if self._wired.get(person) != listed:
+                    self._wired[person] = listed.copy()
+                    _wire_preferences(person, listed, others)
+        if not prune:
+            return algorithm.execute()
+        # Pruning rewrites the preferences in place, so they are all rewired next time
+        self._wired.clear()
+        pruning = prune_preferences(algorithm)
+        return replace(algorithm.execute(), pruning=pruning)
+
+
 def create_matching(
     proposer_preferences: dict[str, list[str]],
     responder_preferences: dict[str, list[str]],
+    *,
+    prune: bool = False,
+    collect_statistics: bool = False,
+    validate: bool = False,
+    cancel: CancellationToken | None = None,
+    on_progress: Callable[[ProgressInfo], None] | None = None,
 ) -> MatchingResult:
     """Create a matching from preference dictionaries.
 
@@ -65,6 +196,23 @@ def create_matching(
     Args:
         proposer_preferences: Mapping of proposer names to ordered list of responder names.
         responder_preferences: Mapping of responder names to ordered list of proposer names.
+        prune: If True, remove pairs that cannot be part of any stable matching
+            before execution (see `prune_preferences`). The matching is unchanged,
+            but fewer proposals and rounds are needed, and the result's `pruning`
+            reports what was removed. Defaults to False.
+        collect_statistics: If True, the result carries MatchingStatistics with
+            proposal counts, rejections and partner ranks. Defaults to False.
+        validate: If True, reject unknown names, repeated names and names used on
+            both sides instead of ignoring them (see `validate_market`). Defaults to False.
+        cancel: Checked before every round to stop a long run early, see
+            `CancellationToken`. Defaults to None.
+        on_progress: Called with a ProgressInfo after the first round, then at most
+            every 0.1 seconds, and once the run terminates. Defaults to None.
+
+    Raises:
+        MarketValidationError: If validate is True and the market has errors.
+        SolveCancelledError: If cancel is cancelled before the run terminates.
+        SolveTimeoutError: If the deadline of cancel passes before the run terminates.
 
     Returns:
         MatchingResult with the matching outcome.
@@ -83,5 +231,14 @@ def create_matching(
         >>> result.matches
         {'alice': 'bob', 'dave': 'charlie'}
     """
+    if validate and (errors := validate_market(proposer_preferences, responder_preferences).errors):
+        raise MarketValidationError(errors)
     algorithm = _build_algorithm(proposer_preferences, responder_preferences)
-    return algorithm.execute()
+    pruning = prune_preferences(algorithm) if prune else None
+    if on_progress is None:
+        result = algorithm.execute(collect_statistics=collect_statistics, cancel=cancel)
+    else:
+        reporter = ProgressReporter(on_progress)
+        result = algorithm.execute(on_round=reporter, collect_statistics=collect_statistics, cancel=cancel)
+        reporter.report(algorithm)
+    return result if pruning is None else replace(result, pruning=pruning)
@@ -0,0 +1,188 @@
+"""Parallel stability verification for large markets.
+
+Preferences are flattened into integer arrays placed in one shared memory
+block. Worker processes attach to it once and check chunks of proposers for
+blocking pairs, so no Person objects are pickled.
+"""
+
+import os
+from array import array
+from bisect import bisect_left
+from dataclasses import dataclass
+from multiprocessing.shared_memory import SharedMemory
+from typing import TYPE_CHECKING
+
+from gale_shapley_algorithm.algorithm import Algorithm
+from gale_shapley_algorithm.result import StabilityResult
+from gale_shapley_algorithm.stability import is_individually_rational
+
+if TYPE_CHECKING:
+    from gale_shapley_algorithm.person import Proposer, Responder
+
+# Responder match ranks with a special meaning
+_UNMATCHED = -2  # any proposer ranking the responder above their match blocks
+_NOT_LISTED = -1  # match is not in the responder's preferences, nobody blocks
+
+
+@dataclass(frozen=True, slots=True)
+class _Layout:
+    """Offsets of the arrays packed into the shared int32 buffer.
+
+    Proposer p ranks the responders p_idx[p_ptr[p]:p_ptr[p + 1]] above its match.
+    Responder r lists the proposers r_ids[r_ptr[r]:r_ptr[r + 1]] (sorted) at the
+    ranks r_rank[r_ptr[r]:r_ptr[r + 1]], and holds its match at rank r_match[r].
+    """
+
+    num_proposers: int
+    num_responders: int
+    p_ptr: int
+    p_idx: int
+    r_ptr: int
+    r_ids: int
+    r_rank: int
+    r_match: int
+    size: int
+
+
+def _pack(algorithm: Algorithm) -> tuple[array, _Layout]:
+    """Flatten the preferences and matches of an executed algorithm into one int32 array."""
+    # Keyed by Proposer | Responder, as they are looked up with persons from preference lists
+    responder_index: dict[Proposer | Responder, int] = {r: i for i, r in enumerate(algorithm.responders)}
+    proposer_index: dict[Proposer | Responder, int] = {p: i for i, p in enumerate(algorithm.proposers)}
+
+    p_ptr = array("i", [0])
+    p_idx = array("i")
+    for proposer in algorithm.proposers:
+        if proposer.preferences and proposer.is_matched:
+            better_than_match = proposer.preferences[: proposer.preferences.index(proposer.match)]
+            p_idx.extend(responder_index[r] for r in better_than_match if r in responder_index)
+        p_ptr.append(len(p_idx))
+
+    r_ptr = array("i", [0])
+    r_ids = array("i")
+    r_rank = array("i")
+    r_match = array("i")
+    for responder in algorithm.responders:
+        ranks: dict[int, int] = {}
+        for rank, person in enumerate(responder.preferences):
+            if person in proposer_index:
+                ranks.setdefault(proposer_index[person], rank)
+        for i in sorted(ranks):
+            r_ids.append(i)
+            r_rank.append(ranks[i])
+        r_ptr.append(len(r_ids))
+        if not responder.is_matched:
+            r_match.append(_UNMATCHED)
+        elif responder.match in responder.preferences:
+            r_match.append(responder.preferences.index(responder.match))
+        else:
+            r_match.append(_NOT_LISTED)
+
+    data = array("i")
+    offsets = []
+    for part in (p_ptr, p_idx, r_ptr, r_ids, r_rank, r_match):
+        offsets.append(len(data))
+        data.extend(part)
+    layout = _Layout(len(algorithm.proposers), len(algorithm.responders), *offsets, size=len(data))
+    return data, layout
+
+
+def _blocking_pairs_in_chunk(data: memoryview, layout: _Layout, start: int, stop: int) -> list[tuple[int, int]]:
+    """Find blocking pairs (proposer index, responder index) for proposers start..stop-1.
+
+    Mirrors `find_blocking_pairs`, reading only the packed integer arrays.
+    """
+    p_ptr = data[layout.p_ptr : layout.p_idx]
+    p_idx = data[layout.p_idx : layout.r_ptr]
+    r_ptr = data[layout.r_ptr : layout.r_ids]
+    r_ids = data[layout.r_ids : layout.r_rank]
+    r_rank = data[layout.r_rank : layout.r_match]
+    r_match = data[layout.r_match : layout.size]
+
+    blocking: list[tuple[int, int]] = []
+    for p in range(start, stop):
+        for k in range(p_ptr[p], p_ptr[p + 1]):
+            r = p_idx[k]
+            match_rank = r_match[r]
+            if match_rank == _UNMATCHED:
+                blocking.append((p, r))
+                continue
+            lo, hi = r_ptr[r], r_ptr[r + 1]
+            j = bisect_left(r_ids, p, lo, hi)
+            if j < hi and r_ids[j] == p and r_rank[j] < match_rank:
+                blocking.append((p, r))
+    return blocking
+
+
+# Set in each worker process by _attach
+_shared: tuple[SharedMemory, _Layout] | None = None
+
+
+def _attach(name: str, layout: _Layout) -> None:
+    """Worker initializer, attaches to the shared buffer once per process."""
+    global _shared  # noqa: PLW0603
+    _shared = (SharedMemory(name=name), layout)
+
+
+def _worker_chunk(bounds: tuple[int, int]) -> list[tuple[int, int]]:
+    """Check one chunk of proposers against the shared buffer."""
+    assert _shared is not None
+    shm, layout = _shared
+    buf = shm.buf
+    assert buf is not None
+    # Release the view right away so the worker can close the block on exit
+    with buf.cast("i") as data:
+        return _blocking_pairs_in_chunk(data, layout, *bounds)
+
+
+def check_stability_parallel(
+    algorithm: Algorithm,
+    max_workers: int | None = None,
+    chunk_size: int | None = None,
+) -> StabilityResult:
+    """Check the stability of an algorithm's matching using several processes.
+
+    Gives the same result as `check_stability`. Proposers are split into chunks
+    that worker processes check for blocking pairs against read-only integer
+    arrays in shared memory, and the blocking pairs are merged in proposer order.
+
+    Args:
+        algorithm: An Algorithm instance that has been executed.
+        max_workers: Number of worker processes. Defaults to the number of CPUs.
+            With 1, all chunks are checked in the current process.
+        chunk_size: Number of proposers per chunk. Defaults to splitting the
+            proposers into four chunks per worker.
+
+    Returns:
+        StabilityResult with is_stable, is_individually_rational, and blocking_pairs.
+    """
+    data, layout = _pack(algorithm)
+    workers = max_workers or os.cpu_count() or 1
+    num_proposers = layout.num_proposers
+    step = chunk_size or max(1, -(-num_proposers // (4 * workers)))
+    chunks = [(start, min(start + step, num_proposers)) for start in range(0, num_proposers, step)]
+
+    if workers == 1 or len(chunks) <= 1:
+        view = memoryview(data)
+        results = [_blocking_pairs_in_chunk(view, layout, start, stop) for start, stop in chunks]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        shm = SharedMemory(create=True, size=max(1, data.itemsize * len(data)))
+        try:
+            buf = shm.buf
+            assert buf is not None
+            buf[: data.itemsize * len(data)] = memoryview(data).cast("B")
+            with ProcessPoolExecutor(max_workers=workers, initializer=_attach, initargs=(shm.name, layout)) as pool:
+                results = list(pool.map(_worker_chunk, chunks))
+        finally:
+            shm.close()
+            shm.unlink()
+
+    bp = [(algorithm.proposers[p].name, algorithm.responders[r].name) for chunk in results for p, r in chunk]
+    ir = is_individually_rational(algorithm.proposers, algorithm.responders)
+    return StabilityResult(
+        is_stable=ir and len(bp) == 0,
+        is_individually_rational=ir,
+        blocking_pairs=bp,
+    )
@@ -13,7 +13,7 @@ class Person:
     def __init__(self, name: str, side: str) -> None:
         self.name = name
         self.side = side
-        self.preferences: tuple[Proposer | Responder, ...] = ()
+        self.preferences = ()
         self.match: Proposer | Responder | None = None
 
     def __repr__(self) -> str:
@@ -23,6 +23,41 @@ class Person:
             case _:
                 return f"Name: {self.name}, Side: {self.side}, Match: {self.match.name}"
 
+    @property
+    def preferences(self) -> tuple[Proposer | Responder, ...]:
+        """Returns the ranked persons, most preferred first."""
+        return self._preferences
+
+    @preferences.setter
+    def preferences(self, value: tuple[Proposer | Responder, ...]) -> None:
+        self._preferences = value
+        self._ranks: dict[Person, int] | None = None
+
+    def rank_of(self, person: Person) -> int:
+        """Returns the 0-based position of person in preferences.
+
+        The rank table is built on first use and kept until preferences change,
+        so repeated lookups are O(1) instead of a scan of the preferences.
+
+        Args:
+            person: The person to look up.
+
+        Raises:
+            ValueError: If person is not in preferences.
+
+        Returns:
+            Position of the first occurrence of person in preferences.
+        """
+        if self._ranks is None:
+            ranks: dict[Person, int] = {}
+            for i, other in enumerate(self._preferences):
+                ranks.setdefault(other, i)
+            self._ranks = ranks
+        try:
+            return self._ranks[person]
+        except KeyError:
+            raise ValueError(f"{person} is not in preferences of {self}.") from None
+
     def is_acceptable(self, person: Proposer | Responder) -> bool:
         """Check if person is acceptable (ranked at or above self in preferences).
 
@@ -35,9 +70,10 @@ class Person:
         Returns:
             True if person is acceptable, False otherwise.
         """
-        if person in self.preferences and self in self.preferences:
-            return self.preferences.index(person) <= self.preferences.index(self)
-        raise ValueError(f"Either {self} or {person} is not in preferences.")
+        try:
+            return self.rank_of(person) <= self.rank_of(self)
+        except ValueError:
+            raise ValueError(f"Either {self} or {person} is not in preferences.") from None
 
     def format_preferences(self) -> str:
         """Format the preferences of the person as a string, * indicates acceptable."""
@@ -120,8 +156,11 @@ class Responder(Person):
         Raises:
             ValueError: If preferences or proposals is empty, or proposal not in preferences.
         """
-        if bool(self.preferences) and bool(proposals) and all(proposal in self.preferences for proposal in proposals):
-            return min(proposals, key=self.preferences.index)
+        try:
+            if bool(self.preferences) and bool(proposals):
+                return min(proposals, key=self.rank_of)
+        except ValueError:
+            pass
         raise ValueError("Either preferences or proposals is empty, or one of the proposals is not in preferences.")
 
     def respond(self) -> None:
@@ -138,4 +177,4 @@ class Responder(Person):
                     new_match = self._most_preferred(self.acceptable_proposals)
                     self.match = new_match
                     new_match.match = self
-        self.current_proposals = []
+        self.current_proposals.clear()
@@ -0,0 +1,130 @@
+"""Memory profiling of matching runs.
+
+Peak and retained memory are measured per stage with tracemalloc. The
+breakdown by type covers objects tracked by the garbage collector (persons,
+tuples, lists, dicts, ...) that were created during a stage and are still
+alive at its end. Profiling is slow and meant for sizing workers, not for
+production runs.
+"""
+
+import gc
+import sys
+import tracemalloc
+from collections import Counter
+from collections.abc import Generator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+
+from gale_shapley_algorithm.matching import _build_algorithm
+from gale_shapley_algorithm.result import MatchingResult, StabilityResult
+from gale_shapley_algorithm.stability import check_stability
+
+
+@dataclass(frozen=True)
+class StageMemory:
+    """Memory used by one stage of a run, in bytes."""
+
+    name: str
+    peak_bytes: int
+    retained_bytes: int
+    by_type: dict[str, int]
+
+
+@dataclass
+class MemoryProfile:
+    """Memory used by the stages of a run, in the order they ran."""
+
+    stages: list[StageMemory] = field(default_factory=list)
+
+    @property
+    def peak_bytes(self) -> int:
+        """Returns the highest peak among the stages."""
+        return max((stage.peak_bytes for stage in self.stages), default=0)
+
+    @contextmanager
+    def stage(self, name: str) -> Generator[None, None, None]:
+        """Measure the code run inside the with block as a stage called name.
+
+        The stage is recorded even if the block raises. Objects that exist when
+        the stage starts are kept alive until it ends, so the objects it creates
+        cannot reuse their ids and be missed in `StageMemory.by_type`.
+
+        Raises:
+            RuntimeError: If tracemalloc is not tracing, see `memory_profile`.
+        """
+        if not tracemalloc.is_tracing():
+            raise RuntimeError("tracemalloc is not tracing, use the memory_profile() context manager.")
+        gc.collect()
+        existing_objects = gc.get_objects()
+        existing = {id(obj) for obj in existing_objects}
+        tracemalloc.reset_peak()
+        start, _ = tracemalloc.get_traced_memory()
+        try:
+            yield
+        finally:
+            current, peak = tracemalloc.get_traced_memory()
+            by_type: Counter[str] = Counter()
+            for obj in gc.get_objects():
+                if id(obj) in existing or obj is existing or obj is existing_objects or obj is by_type:
+                    continue
+                by_type[type(obj).__name__] += sys.getsizeof(obj)
+            del existing_objects
+            self.stages.append(
+                StageMemory(
+                    name=name,
+                    peak_bytes=peak - start,
+                    retained_bytes=current - start,
+                    by_type=dict(by_type.most_common()),
+                )
+            )
+
+
+@contextmanager
+def memory_profile() -> Generator[MemoryProfile, None, None]:
+    """Trace memory allocations and collect stages measured with `MemoryProfile.stage`.
+
+    tracemalloc is started if needed and stopped again on exit.
+
+    Example:
+        >>> with memory_profile() as profile:
+        ...     with profile.stage("build"):
+        ...         data = [[0] * 100 for _ in range(100)]
+        >>> profile.stages[0].by_type["list"] > 0
+        True
+    """
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    try:
+        yield MemoryProfile()
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+
+
+def profile_matching(
+    proposer_preferences: dict[str, list[str]],
+    responder_preferences: dict[str, list[str]],
+) -> tuple[MatchingResult, StabilityResult, MemoryProfile]:
+    """Solve a market like `create_matching` and check stability, profiling each stage.
+
+    The stages are "build" (creating and padding persons), "execute" (the rounds),
+    "result" (finalizing the MatchingResult) and "stability" (`check_stability`).
+
+    Args:
+        proposer_preferences: Mapping of proposer names to ordered list of responder names.
+        responder_preferences: Mapping of responder names to ordered list of proposer names.
+
+    Returns:
+        Tuple of (MatchingResult, StabilityResult, MemoryProfile).
+    """
+    with memory_profile() as profile:
+        with profile.stage("build"):
+            algorithm = _build_algorithm(proposer_preferences, responder_preferences)
+        with profile.stage("execute"):
+            algorithm._run_rounds()
+        with profile.stage("result"):
+            result = algorithm._build_result()
+        with profile.stage("stability"):
+            stability = check_stability(algorithm)
+    return result, stability, profile
@@ -0,0 +1,65 @@
+"""Progress reporting for long matching runs.
+
+`ProgressReporter` is passed as the `on_round` callback of `Algorithm.execute`
+and hands a `ProgressInfo` to a user callback after a round, at most once per
+interval. Between reports a round costs one clock read, the free proposers
+are only counted when a report is due.
+"""
+
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from gale_shapley_algorithm.algorithm import Algorithm
+
+
+@dataclass(frozen=True)
+class ProgressInfo:
+    """State of a run after a completed round."""
+
+    round: int
+    free_proposers: int
+    proposals: int
+    elapsed: float
+
+
+class ProgressReporter:
+    """Reports the progress of a run to a callback, throttled by wall-clock time."""
+
+    def __init__(
+        self,
+        callback: Callable[[ProgressInfo], None],
+        interval: float = 0.1,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Create a reporter, the first completed round is always reported.
+
+        Args:
+            callback: Called with a ProgressInfo.
+            interval: Least number of seconds between two reports. Defaults to 0.1.
+            clock: Monotonic clock in seconds. Defaults to time.monotonic.
+        """
+        self.callback = callback
+        self.interval = interval
+        self._clock = clock
+        self._started = clock()
+        self._last_report: float | None = None
+
+    def __call__(self, algorithm: Algorithm) -> None:
+        """Report the round that just completed if the interval has passed since the last report."""
+        now = self._clock()
+        if self._last_report is None or now - self._last_report >= self.interval:
+            self.report(algorithm, now)
+
+    def report(self, algorithm: Algorithm, now: float | None = None) -> None:
+        """Report the current state of the algorithm unconditionally, e.g. once it has terminated."""
+        now = self._clock() if now is None else now
+        self._last_report = now
+        self.callback(
+            ProgressInfo(
+                round=algorithm.round,
+                free_proposers=len(algorithm.unmatched_proposers),
+                proposals=algorithm.proposals,
+                elapsed=now - self._started,
+            )
+        )
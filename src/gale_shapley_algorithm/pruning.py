@@ -0,0 +1,108 @@
+"""Preference-list pruning for built markets.
+
+Removes entries that can never be part of a stable matching before the
+algorithm runs, so proposers do not waste proposals on them.
+"""
+
+from gale_shapley_algorithm.algorithm import Algorithm
+from gale_shapley_algorithm.person import Proposer, Responder
+from gale_shapley_algorithm.result import PruningResult
+
+
+def _acceptable(person: Proposer | Responder, others: set[Proposer] | set[Responder]) -> list[Proposer | Responder]:
+    """Returns the distinct members of others that person ranks above self, in preference order.
+
+    Raises:
+        ValueError: If person is not in its own preferences.
+    """
+    ranked_above_self = person.preferences[: person.preferences.index(person)]
+    return list(dict.fromkeys(other for other in ranked_above_self if other in others))
+
+
+def prune_preferences(algorithm: Algorithm) -> PruningResult:
+    """Prune the preference lists of a built, not yet executed, algorithm in place.
+
+    Two reductions are applied:
+
+    1. Pairs where only one side finds the other acceptable are removed, since
+       they can never be part of an individually rational matching.
+    2. If a proposer's first remaining choice is a responder, every proposer that
+       responder ranks below it is removed from the responder's list (and the
+       responder from theirs). This is repeated until no list changes.
+
+    Neither reduction removes a pair that belongs to any stable matching, so the
+    algorithm still produces the proposer-optimal stable matching. Removed persons
+    are moved behind self in the preference order, making them unacceptable while
+    keeping the lists complete.
+
+    Args:
+        algorithm: An Algorithm instance that has not been executed yet.
+
+    Raises:
+        ValueError: If a person is not in its own preferences.
+
+    Returns:
+        PruningResult with the number of pairs removed by each reduction.
+    """
+    proposer_set = set(algorithm.proposers)
+    responder_set = set(algorithm.responders)
+    # Keyed by Proposer | Responder, as the lists hold persons of either side
+    proposer_lists: dict[Proposer | Responder, list[Proposer | Responder]] = {
+        p: _acceptable(p, responder_set) for p in algorithm.proposers
+    }
+    responder_lists: dict[Proposer | Responder, list[Proposer | Responder]] = {
+        r: _acceptable(r, proposer_set) for r in algorithm.responders
+    }
+
+    # 1. Drop one-sided entries so that p lists r exactly when r lists p
+    listed_by = {person: set(lst) for person, lst in (proposer_lists | responder_lists).items()}
+    listed = sum(len(lst) for lst in proposer_lists.values()) + sum(len(lst) for lst in responder_lists.values())
+    for p, lst in proposer_lists.items():
+        proposer_lists[p] = [r for r in lst if p in listed_by[r]]
+    for r, lst in responder_lists.items():
+        responder_lists[r] = [p for p in lst if r in listed_by[p]]
+    mutual = sum(len(lst) for lst in proposer_lists.values())
+    unacceptable_removed = listed - 2 * mutual
+
+    # 2. Delete successors of the best proposer, a pair (p, r) stays alive while
+    # p is ranked within r's cutoff, so only responders' cutoffs need updating
+    ranks: dict[Proposer | Responder, dict[Proposer | Responder, int]] = {
+        r: {p: i for i, p in enumerate(lst)} for r, lst in responder_lists.items()
+    }
+    cutoffs: dict[Proposer | Responder, int] = {r: len(lst) for r, lst in responder_lists.items()}
+    positions: dict[Proposer | Responder, int] = dict.fromkeys(algorithm.proposers, 0)
+    dominated_removed = 0
+    stack: list[Proposer | Responder] = list(algorithm.proposers)
+    while stack:
+        p = stack.pop()
+        lst = proposer_lists[p]
+        i = positions[p]
+        while i < len(lst) and ranks[lst[i]][p] >= cutoffs[lst[i]]:
+            i += 1
+        positions[p] = i
+        if i == len(lst):
+            continue
+        r = lst[i]
+        cutoff = ranks[r][p] + 1
+        if cutoff < cutoffs[r]:
+            for q in responder_lists[r][cutoff : cutoffs[r]]:
+                if positions[q] < len(proposer_lists[q]) and proposer_lists[q][positions[q]] is r:
+                    stack.append(q)
+            dominated_removed += cutoffs[r] - cutoff
+            cutoffs[r] = cutoff
+
+    for r, lst in responder_lists.items():
+        responder_lists[r] = lst[: cutoffs[r]]
+    for p, lst in proposer_lists.items():
+        proposer_lists[p] = [r for r in lst[positions[p] :] if ranks[r][p] < cutoffs[r]]
+
+    for person, kept in (proposer_lists | responder_lists).items():
+        kept_set = set(kept)
+        rest = [other for other in person.preferences if other is not person and other not in kept_set]
+        person.preferences = (*kept, person, *rest)
+
+    return PruningResult(
+        unacceptable_pairs_removed=unacceptable_removed,
+        dominated_pairs_removed=dominated_removed,
+        remaining_pairs=mutual - dominated_removed,
+    )
@@ -1,6 +1,36 @@
 """Result types for the Gale-Shapley algorithm."""
 
+import sys
+from array import array
 from dataclasses import dataclass
+from functools import cached_property
+from typing import Any
+
+# array typecode of 32-bit signed integers on this platform, used for partner arrays
+INT32_TYPECODE = "i" if array("i").itemsize == 4 else "l"
+
+
+@dataclass(frozen=True)
+class MatchingStatistics:
+    """Statistics of a matching, ranks are 1-based positions in preference lists."""
+
+    total_proposals: int
+    proposals_per_proposer: dict[str, int]
+    rejections: int
+    partner_ranks: dict[str, int]
+    proposer_average_rank: float | None
+    proposer_max_rank: int | None
+    responder_average_rank: float | None
+    responder_max_rank: int | None
+
+
+@dataclass(frozen=True)
+class PruningResult:
+    """Result of pruning the preference lists of a market."""
+
+    unacceptable_pairs_removed: int
+    dominated_pairs_removed: int
+    remaining_pairs: int
 
 
 @dataclass(frozen=True)
@@ -12,6 +42,112 @@ class MatchingResult:
     unmatched: list[str]
     self_matches: list[str]
     all_matched: bool
+    statistics: MatchingStatistics | None = None
+    pruning: PruningResult | None = None
+
+
+class ArrayMatchingResult:
+    """Result of running the Gale-Shapley algorithm, backed by an int32 partner array.
+
+    Participants are numbered proposers first, then responders, as in `names`.
+    `partners[i]` is the index of the partner of participant i, i itself for a
+    self match and -1 if unmatched. The name based views of `MatchingResult`
+    are only built when first accessed.
+    """
+
+    def __init__(self, rounds: int, names: list[str], num_proposers: int, partners: array) -> None:
+        """Wrap a partner array.
+
+        Raises:
+            ValueError: If partners does not hold 32-bit integers.
+        """
+        if partners.itemsize != 4:
+            raise ValueError(f"partners must hold 32-bit integers, got typecode {partners.typecode!r}.")
+        self.rounds = rounds
+        self.names = names
+        self.num_proposers = num_proposers
+        self.partners = partners
+
+    def __repr__(self) -> str:
+        return f"ArrayMatchingResult(rounds={self.rounds}, participants={len(self.names)})"
+
+    @cached_property
+    def _index(self) -> dict[str, int]:
+        return {name: i for i, name in enumerate(self.names)}
+
+    def partner_of(self, name: str) -> str | None:
+        """Returns the name of the partner of a participant, its own name for a self match.
+
+        Raises:
+            KeyError: If name is not a participant.
+        """
+        partner = self.partners[self._index[name]]
+        return None if partner < 0 else self.names[partner]
+
+    @cached_property
+    def num_matches(self) -> int:
+        """Returns the number of matched proposer-responder pairs."""
+        n = self.num_proposers
+        return sum(1 for partner in self.partners[:n] if partner >= n)
+
+    @cached_property
+    def matches(self) -> dict[str, str]:
+        """Returns proposer to responder names of all matched pairs."""
+        names, n = self.names, self.num_proposers
+        return {names[i]: names[partner] for i, partner in enumerate(self.partners[:n]) if partner >= n}
+
+    @cached_property
+    def unmatched(self) -> list[str]:
+        """Returns the names of unmatched participants."""
+        return [self.names[i] for i, partner in enumerate(self.partners) if partner < 0]
+
+    @cached_property
+    def self_matches(self) -> list[str]:
+        """Returns the names of participants matched to self."""
+        return [self.names[i] for i, partner in enumerate(self.partners) if partner == i]
+
+    @property
+    def all_matched(self) -> bool:
+        """Returns True if every participant has a partner on the other side."""
+        return 2 * self.num_matches == len(self.names)
+
+    def to_matching_result(self) -> MatchingResult:
+        """Materialize all views as a MatchingResult."""
+        return MatchingResult(
+            rounds=self.rounds,
+            matches=self.matches,
+            unmatched=self.unmatched,
+            self_matches=self.self_matches,
+            all_matched=self.all_matched,
+        )
+
+    def as_buffer(self) -> memoryview:
+        """Returns the partner array as a buffer of little-endian int32.
+
+        On little-endian hosts the buffer shares the memory of `partners`, no
+        copy is made. Big-endian hosts get a byte-swapped copy.
+        """
+        if sys.byteorder == "big":  # pragma: no cover
+            partners = array(self.partners.typecode, self.partners)
+            partners.byteswap()
+            return memoryview(partners)
+        return memoryview(self.partners)
+
+    def to_bytes(self) -> bytes:
+        """Returns a copy of the partner array as little-endian int32 bytes, see `as_buffer`."""
+        return self.as_buffer().tobytes()
+
+    def to_numpy(self) -> Any:
+        """Returns the partner array as an int32 NumPy array sharing its memory.
+
+        Raises:
+            ImportError: If NumPy is not installed.
+        """
+        try:
+            import numpy as np  # ty: ignore[unresolved-import]
+        except ImportError:
+            raise ImportError("NumPy is not installed. Install with: pip install numpy") from None
+        return np.frombuffer(self.partners, dtype=np.int32)
 
 
 @dataclass(frozen=True)
@@ -21,3 +157,49 @@ class StabilityResult:
     is_stable: bool
     is_individually_rational: bool
     blocking_pairs: list[tuple[str, str]]
+
+
+@dataclass(frozen=True)
+class TruncationOutcome:
+    """Outcome for a responder that declares only its top proposers acceptable.
+
+    Ranks are 1-based positions in the responder's true preferences.
+    """
+
+    length: int
+    partner: str | None
+    partner_rank: int | None
+    improved: bool
+
+
+@dataclass(frozen=True)
+class ValidationIssue:
+    """A problem found in a market.
+
+    The location is the path to the offending value, e.g.
+    ("proposer_preferences", "alice", 2) for the third entry of alice's list.
+    """
+
+    code: str
+    severity: str
+    location: tuple[str | int, ...]
+    message: str
+
+
+@dataclass(frozen=True)
+class ValidationResult:
+    """Issues found in a market, and the market cleaned of them."""
+
+    issues: list[ValidationIssue]
+    proposer_preferences: dict[str, list[str]]
+    responder_preferences: dict[str, list[str]]
+
+    @property
+    def errors(self) -> list[ValidationIssue]:
+        """Returns the issues that make the market ambiguous or wrong."""
+        return [issue for issue in self.issues if issue.severity == "error"]
+
+    @property
+    def is_valid(self) -> bool:
+        """Returns True if there are no errors, warnings are allowed."""
+        return not self.errors
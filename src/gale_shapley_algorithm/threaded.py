@@ -0,0 +1,138 @@
+"""Threaded round engine for free-threaded Python builds.
+
+Within a round, every unmatched proposer picks its next choice independently,
+and every responder answers only the proposals addressed to it. Both phases
+are split across a thread pool:
+
+1. Proposers are divided into contiguous chunks. Each thread writes only to
+   its own proposers and to a private outbox, bucketed by responder partition.
+2. Each thread owns a fixed partition of responders. It fills their inboxes
+   from all outboxes in chunk order, then lets them respond. A proposer is
+   touched by at most one responder per round, so no locks are needed.
+
+Proposals arrive in proposer order, so the matching is identical to the one
+produced by `Algorithm`. With the GIL enabled threads cannot run the pure
+Python phases in parallel, and the engine falls back to the serial rounds.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from gale_shapley_algorithm.algorithm import Algorithm
+from gale_shapley_algorithm.person import Proposer, Responder
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from gale_shapley_algorithm.cancellation import CancellationToken
+    from gale_shapley_algorithm.result import MatchingResult
+
+# Proposals of one proposer chunk, bucketed by responder partition
+Outbox = list[list[tuple[Responder, Proposer]]]
+
+
+def _gil_enabled() -> bool:
+    """Returns False only on a free-threaded build running with the GIL disabled."""
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    return is_gil_enabled is None or is_gil_enabled()
+
+
+def _propose_chunk(proposers: list[Proposer], partition_of: dict[Responder, int], partitions: int) -> Outbox:
+    """Make each proposer propose, collecting the proposals instead of delivering them."""
+    outbox: Outbox = [[] for _ in range(partitions)]
+    for proposer in proposers:
+        target = proposer.next_proposal
+        if isinstance(target, Proposer):  # meaning self is next
+            proposer.match = proposer
+        else:
+            outbox[partition_of[target]].append((target, proposer))
+        proposer.last_proposal = target
+    return outbox
+
+
+def _respond_partition(partition: int, outboxes: list[Outbox]) -> None:
+    """Deliver the proposals addressed to one responder partition and let those responders respond."""
+    responding: list[Responder] = []
+    for outbox in outboxes:
+        for responder, proposer in outbox[partition]:
+            if not responder.current_proposals:
+                responding.append(responder)
+            responder.current_proposals.append(proposer)
+    for responder in responding:
+        responder.respond()
+
+
+@dataclass(slots=True)
+class ThreadedAlgorithm(Algorithm):
+    """Gale-Shapley Algorithm running the propose and respond phases on a thread pool.
+
+    Produces the same matching and round count as `Algorithm`. Threads are only
+    used on free-threaded builds (e.g. python3.13t) with the GIL disabled,
+    otherwise `execute` runs the serial rounds.
+    """
+
+    max_workers: int | None = None
+    _executor: ThreadPoolExecutor | None = field(default=None, init=False, repr=False)
+    _partition_of: dict[Responder, int] = field(default_factory=dict, init=False, repr=False)
+    _outboxes: list[Outbox] = field(default_factory=list, init=False, repr=False)
+
+    @property
+    def workers(self) -> int:
+        """Returns the number of threads used per phase."""
+        return max(1, self.max_workers or os.cpu_count() or 1)
+
+    def proposers_propose(self) -> None:
+        """Makes all unmatched proposers propose, one contiguous chunk per thread."""
+        if self._executor is None:
+            Algorithm.proposers_propose(self)
+            return
+        proposers = self.unmatched_proposers
+        step = -(-len(proposers) // self.workers)
+        chunks = [proposers[i : i + step] for i in range(0, len(proposers), step)]
+        self._outboxes = list(
+            self._executor.map(_propose_chunk, chunks, [self._partition_of] * len(chunks), [self.workers] * len(chunks))
+        )
+        self.proposals += sum(len(bucket) for outbox in self._outboxes for bucket in outbox)
+
+    def responders_respond(self) -> None:
+        """Makes responders with proposals respond, one responder partition per thread."""
+        if self._executor is None:
+            Algorithm.responders_respond(self)
+            return
+        outboxes, self._outboxes = self._outboxes, []
+        list(self._executor.map(_respond_partition, range(self.workers), [outboxes] * self.workers))
+
+    def execute(
+        self,
+        on_round: Callable[[Algorithm], None] | None = None,
+        collect_statistics: bool = False,
+        cancel: CancellationToken | None = None,
+    ) -> MatchingResult:
+        """Run the algorithm on a thread pool and return structured results.
+
+        Falls back to `Algorithm.execute` with a single worker or while the GIL
+        is enabled.
+
+        Args:
+            on_round: Called with the algorithm after every completed round. Defaults to None.
+            collect_statistics: If True, attach MatchingStatistics to the result. Defaults to False.
+            cancel: Checked before every round, see `Algorithm.execute`. Defaults to None.
+
+        Returns:
+            MatchingResult with rounds, matches, unmatched, self_matches, all_matched.
+        """
+        if self.workers == 1 or _gil_enabled():
+            return Algorithm.execute(self, on_round, collect_statistics, cancel)
+
+        self._partition_of = {responder: i % self.workers for i, responder in enumerate(self.responders)}
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="gale-shapley") as executor:
+            self._executor = executor
+            try:
+                return Algorithm.execute(self, on_round, collect_statistics, cancel)
+            finally:
+                self._executor = None
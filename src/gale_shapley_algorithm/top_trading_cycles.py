@@ -0,0 +1,160 @@
+"""Top Trading Cycles on the same markets as the Gale-Shapley algorithm.
+
+Every remaining proposer points to its most preferred remaining responder, and
+every responder points to its most preferred remaining proposer, so each
+proposer points to another proposer through a responder. Proposers on a cycle
+get the responder they point to and leave the market, together with their
+responders. Only mutually acceptable pairs are considered, and proposers left
+without a responder are matched to self.
+
+Cycles are found by pointer chasing over integer IDs along a path of
+proposers. Each pointer only moves forward through its preference list, so a
+market is solved in time linear in the total length of the lists, O(n^2).
+"""
+
+from typing import TYPE_CHECKING
+
+from gale_shapley_algorithm.algorithm import Algorithm
+from gale_shapley_algorithm.matching import _build_algorithm
+from gale_shapley_algorithm.result import MatchingResult
+
+if TYPE_CHECKING:
+    from gale_shapley_algorithm.person import Proposer, Responder
+
+
+def _trading_cycles(choices: list[list[int]], priorities: list[list[int]]) -> tuple[list[int | None], int]:
+    """Run TTC on mutually acceptable lists of integer IDs.
+
+    Args:
+        choices: For each proposer, its acceptable responders in order.
+        priorities: For each responder, its acceptable proposers in order.
+
+    Returns:
+        Tuple of (responder of each proposer or None, number of cycles).
+    """
+    num_proposers = len(choices)
+    partner: list[int | None] = [None] * num_proposers
+    removed_proposer = [False] * num_proposers
+    removed_responder = [False] * len(priorities)
+    choice_at = [0] * num_proposers
+    priority_at = [0] * len(priorities)
+    on_path = [False] * num_proposers
+    cycles = 0
+
+    def top_responder(p: int) -> int | None:
+        listed, i = choices[p], choice_at[p]
+        while i < len(listed) and removed_responder[listed[i]]:
+            i += 1
+        choice_at[p] = i
+        return listed[i] if i < len(listed) else None
+
+    def top_proposer(r: int) -> int:
+        # r is acceptable to a remaining proposer pointing at it, so the list is never exhausted
+        listed, i = priorities[r], priority_at[r]
+        while removed_proposer[listed[i]]:
+            i += 1
+        priority_at[r] = i
+        return listed[i]
+
+    for start in range(num_proposers):
+        if removed_proposer[start]:
+            continue
+        path = [start]
+        on_path[start] = True
+        while path:
+            p = path[-1]
+            r = top_responder(p)
+            if r is None:  # nobody left to point to, matched to self
+                removed_proposer[p] = True
+                on_path[path.pop()] = False
+                continue
+            q = top_proposer(r)
+            if not on_path[q]:
+                path.append(q)
+                on_path[q] = True
+                continue
+            cycles += 1
+            while True:
+                p = path.pop()
+                on_path[p] = False
+                r = choices[p][choice_at[p]]
+                partner[p] = r
+                removed_proposer[p] = removed_responder[r] = True
+                if p == q:
+                    break
+    return partner, cycles
+
+
+def top_trading_cycles(algorithm: Algorithm) -> MatchingResult:
+    """Run Top Trading Cycles on the preferences of an algorithm's market.
+
+    Only preferences are read, so the same built market can also be executed
+    with Gale-Shapley for comparison, before or after.
+
+    Args:
+        algorithm: An Algorithm instance with wired preferences.
+
+    Returns:
+        MatchingResult with the TTC matching, its rounds being the number of trading cycles.
+    """
+    proposers, responders = algorithm.proposers, algorithm.responders
+    # Keyed by Proposer | Responder, as they are looked up with persons from preference lists
+    proposer_index: dict[Proposer | Responder, int] = {p: i for i, p in enumerate(proposers)}
+    responder_index: dict[Proposer | Responder, int] = {r: i for i, r in enumerate(responders)}
+
+    proposer_lists = [
+        [responder_index[r] for r in p.preferences[: p.rank_of(p)] if r in responder_index] for p in proposers
+    ]
+    responder_lists = [
+        [proposer_index[p] for p in r.preferences[: r.rank_of(r)] if p in proposer_index] for r in responders
+    ]
+    acceptable_to = [set(listed) for listed in responder_lists]
+    choices = [[r for r in listed if p in acceptable_to[r]] for p, listed in enumerate(proposer_lists)]
+    chosen_by = [set(listed) for listed in choices]
+    priorities = [[p for p in listed if r in chosen_by[p]] for r, listed in enumerate(responder_lists)]
+
+    partner, cycles = _trading_cycles(choices, priorities)
+    matches = {proposers[p].name: responders[r].name for p, r in enumerate(partner) if r is not None}
+    matched = set(partner)
+    self_matches = [p.name for p, r in zip(proposers, partner, strict=True) if r is None]
+    self_matches += [r.name for i, r in enumerate(responders) if i not in matched]
+    return MatchingResult(
+        rounds=cycles,
+        matches=matches,
+        unmatched=[],
+        self_matches=self_matches,
+        all_matched=len(self_matches) == 0,
+    )
+
+
+def create_ttc_matching(
+    proposer_preferences: dict[str, list[str]],
+    responder_preferences: dict[str, list[str]],
+) -> MatchingResult:
+    """Create a Top Trading Cycles matching from preference dictionaries.
+
+    Takes the same input as `create_matching`. Persons not listed in a
+    preference list are considered unacceptable.
+
+    Args:
+        proposer_preferences: Mapping of proposer names to ordered list of responder names.
+        responder_preferences: Mapping of responder names to ordered list of proposer names.
+
+    Returns:
+        MatchingResult with the matching outcome.
+
+    Example:
+        >>> result = create_ttc_matching(
+        ...     proposer_preferences={
+        ...         "alice": ["bob", "charlie"],
+        ...         "dave": ["bob", "charlie"],
+        ...     },
+        ...     responder_preferences={
+        ...         "bob": ["dave", "alice"],
+        ...         "charlie": ["alice", "dave"],
+        ...     },
+        ... )
+        >>> result.matches
+        {'alice': 'charlie', 'dave': 'bob'}
+    """
+    return top_trading_cycles(_build_algorithm(proposer_preferences, responder_preferences))
@@ -0,0 +1,192 @@
+"""What-if analysis of responders truncating their preference lists.
+
+A responder truncates its list by declaring only its top k proposers
+acceptable. Truncating only adds rejections, so the deferred acceptance run of
+the truncated market can be resumed from the proposer-optimal matching: the
+responder rejects its partner and only the rejection chain that follows has to
+be replayed. Shorter truncations add further rejections, so they resume from
+the state of the previous one.
+
+Chains run on integer snapshots of the market. The solved state is shared,
+and each responder records the changes of its chains in small overlay dicts.
+"""
+
+import os
+from dataclasses import dataclass
+
+from gale_shapley_algorithm.algorithm import Algorithm
+from gale_shapley_algorithm.person import Proposer, Responder
+from gale_shapley_algorithm.result import TruncationOutcome
+
+
+@dataclass(frozen=True, slots=True)
+class _Market:
+    """Integer snapshot of an executed algorithm.
+
+    Proposer p proposes to the responders choices[p] in order and is held by
+    choices[p][position[p]], or has exhausted its choices if position[p] is
+    len(choices[p]). Responder r finds the proposers in ranks[r] acceptable,
+    at the given 0-based ranks, and holds holder[r] or nobody.
+    """
+
+    choices: list[list[int]]
+    position: list[int]
+    ranks: list[dict[int, int]]
+    holder: list[int | None]
+
+
+def _snapshot(algorithm: Algorithm) -> _Market:
+    """Index the preferences and the matching of an executed algorithm."""
+    # Keyed by Proposer | Responder, as they are looked up with persons from preference lists
+    responder_index: dict[Proposer | Responder, int] = {r: i for i, r in enumerate(algorithm.responders)}
+    proposer_index: dict[Proposer | Responder, int] = {p: i for i, p in enumerate(algorithm.proposers)}
+
+    choices: list[list[int]] = []
+    position: list[int] = []
+    for proposer in algorithm.proposers:
+        acceptable = proposer.preferences[: proposer.rank_of(proposer)]
+        listed = [responder_index[r] for r in acceptable if r in responder_index]
+        choices.append(listed)
+        match proposer.match:
+            case Responder() as partner:
+                position.append(listed.index(responder_index[partner]))
+            case _:
+                position.append(len(listed))
+
+    ranks: list[dict[int, int]] = []
+    holder: list[int | None] = []
+    for responder in algorithm.responders:
+        acceptable = responder.preferences[: responder.rank_of(responder)]
+        ranks.append({proposer_index[p]: rank for rank, p in enumerate(acceptable) if p in proposer_index})
+        holder.append(proposer_index.get(responder.match))
+    return _Market(choices, position, ranks, holder)
+
+
+def _truncations(market: _Market, r: int) -> list[tuple[int, int | None]]:
+    """Returns (length, partner) for every truncation of r that drops its partner, longest first."""
+    held = market.holder[r]
+    if held is None:
+        return []
+    holder: dict[int, int | None] = {}
+    position: dict[int, int] = {}
+    outcomes: list[tuple[int, int | None]] = []
+    for length in range(market.ranks[r][held], -1, -1):
+        current = holder.get(r, market.holder[r])
+        if current is not None and market.ranks[r][current] >= length:
+            holder[r] = None
+            _reject(market, r, length, current, holder=holder, position=position)
+        outcomes.append((length, holder.get(r, market.holder[r])))
+    return outcomes
+
+
+def _reject(
+    market: _Market,
+    r: int,
+    length: int,
+    proposer: int | None,
+    *,
+    holder: dict[int, int | None],
+    position: dict[int, int],
+) -> None:
+    """Replay the rejection chain started by rejecting proposer, with r truncated to length."""
+    while proposer is not None:
+        choices = market.choices[proposer]
+        pos = position.get(proposer, market.position[proposer]) + 1
+        position[proposer] = pos
+        if pos >= len(choices):  # exhausted, matched to self
+            return
+        responder = choices[pos]
+        rank = market.ranks[responder].get(proposer)
+        if rank is None or (responder == r and rank >= length):
+            continue
+        current = holder.get(responder, market.holder[responder])
+        if current is None or rank < market.ranks[responder][current]:
+            holder[responder] = proposer
+            proposer = current
+
+
+# Set in each worker process by _share
+_market: _Market | None = None
+
+
+def _share(market: _Market) -> None:
+    """Worker initializer, receives the snapshot once per process."""
+    global _market  # noqa: PLW0603
+    _market = market
+
+
+def _worker_chunk(responders: list[int]) -> list[list[tuple[int, int | None]]]:
+    """Analyze the truncations of a chunk of responders against the shared snapshot."""
+    assert _market is not None
+    return [_truncations(_market, r) for r in responders]
+
+
+def analyze_truncations(
+    algorithm: Algorithm,
+    responders: list[str] | None = None,
+    max_workers: int | None = None,
+) -> dict[str, list[TruncationOutcome]]:
+    """Find the outcome of every truncation strategy of each responder.
+
+    Reuses the proposer-optimal matching of an executed algorithm instead of
+    solving one market per truncation. Truncations keeping a responder's partner
+    do not change the matching and are left out, so a responder whose list cannot
+    be usefully truncated, e.g. because it is unmatched, gets an empty list.
+
+    Args:
+        algorithm: An Algorithm instance that has been executed.
+        responders: Names of the responders to analyze. Defaults to all responders.
+        max_workers: Number of worker processes. Defaults to the number of CPUs.
+            With 1, all responders are analyzed in the current process.
+
+    Raises:
+        ValueError: If the algorithm has not been executed or a responder name is unknown.
+
+    Returns:
+        Mapping of responder names to their outcomes, from the longest truncation to the empty list.
+
+    Example:
+        >>> from gale_shapley_algorithm.matching import MatchingEngine
+        >>> engine = MatchingEngine(["a", "b"], ["x", "y"])
+        >>> engine.solve(
+        ...     {"a": ["x", "y"], "b": ["y", "x"]}, {"x": ["b", "a"], "y": ["a", "b"]}
+        ... ).matches
+        {'a': 'x', 'b': 'y'}
+        >>> outcome = analyze_truncations(engine.algorithm, max_workers=1)["x"][0]
+        >>> outcome.partner, outcome.improved
+        ('b', True)
+    """
+    if not algorithm.terminate():
+        raise ValueError("The algorithm must be executed before analyzing truncations.")
+    index = {r.name: i for i, r in enumerate(algorithm.responders)}
+    names = list(index) if responders is None else responders
+    if unknown := [name for name in names if name not in index]:
+        raise ValueError(f"Unknown responders: {unknown}")
+    targets = [index[name] for name in names]
+
+    market = _snapshot(algorithm)
+    workers = max_workers or os.cpu_count() or 1
+    step = max(1, -(-len(targets) // (4 * workers)))
+    chunks = [targets[start : start + step] for start in range(0, len(targets), step)]
+    if workers == 1 or len(chunks) <= 1:
+        results = [[_truncations(market, r) for r in chunk] for chunk in chunks]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=_share, initargs=(market,)) as pool:
+            results = list(pool.map(_worker_chunk, chunks))
+
+    proposers = algorithm.proposers
+    analysis: dict[str, list[TruncationOutcome]] = {}
+    for r, outcomes in zip(targets, (o for chunk in results for o in chunk), strict=True):
+        ranks, held = market.ranks[r], market.holder[r]
+        analysis[algorithm.responders[r].name] = [
+            TruncationOutcome(
+                length=length,
+                partner=None if partner is None else proposers[partner].name,
+                partner_rank=None if partner is None else ranks[partner] + 1,
+                improved=partner is not None and held is not None and ranks[partner] < ranks[held],
+            )
+            for length, partner in outcomes
+        ]
+    return analysis
@@ -0,0 +1,96 @@
+"""Validation of name-based markets.
+
+`create_matching` pads and trusts its input: unknown names are dropped and
+repeated names are kept, which silently changes the market. `validate_market`
+checks every preference list in a single pass, O(total list length), and
+reports each problem with its location:
+
+    name_collision   error    a name is both a proposer and a responder
+    unknown_name     error    a list names someone who is not on the other side
+    duplicate        error    a list names someone more than once
+    empty_list       warning  a list is empty, so nobody is acceptable
+"""
+
+from gale_shapley_algorithm.result import ValidationIssue, ValidationResult
+
+
+class MarketValidationError(ValueError):
+    """Raised for a market with validation errors, which are kept in `issues`."""
+
+    def __init__(self, issues: list[ValidationIssue]) -> None:
+        self.issues = issues
+        lines = [f"{_format_location(issue.location)}: {issue.message}" for issue in issues]
+        super().__init__("Invalid market:\n" + "\n".join(lines))
+
+
+def _format_location(location: tuple[str | int, ...]) -> str:
+    field, *keys = location
+    return str(field) + "".join(f"[{key!r}]" for key in keys)
+
+
+def _clean_side(
+    field: str,
+    preferences: dict[str, list[str]],
+    other_names: dict[str, list[str]],
+    other_side: str,
+    issues: list[ValidationIssue],
+) -> dict[str, list[str]]:
+    cleaned: dict[str, list[str]] = {}
+    for name, listed in preferences.items():
+        if not listed:
+            issues.append(ValidationIssue("empty_list", "warning", (field, name), f"{name} finds nobody acceptable."))
+        seen: set[str] = set()
+        kept: list[str] = []
+        for i, other in enumerate(listed):
+            if other not in other_names:
+                issues.append(
+                    ValidationIssue("unknown_name", "error", (field, name, i), f"{other!r} is not a {other_side}.")
+                )
+            elif other in seen:
+                issues.append(
+                    ValidationIssue("duplicate", "error", (field, name, i), f"{other!r} is listed more than once.")
+                )
+            else:
+                seen.add(other)
+                kept.append(other)
+        cleaned[name] = kept
+    return cleaned
+
+
+def validate_market(
+    proposer_preferences: dict[str, list[str]],
+    responder_preferences: dict[str, list[str]],
+) -> ValidationResult:
+    """Check a market for ambiguous or wrong input in one linear pass.
+
+    The cleaned market keeps the first occurrence of every name and drops
+    unknown names, which is how `create_matching` would treat them, minus the
+    repeated entries.
+
+    Args:
+        proposer_preferences: Mapping of proposer names to ordered list of responder names.
+        responder_preferences: Mapping of responder names to ordered list of proposer names.
+
+    Returns:
+        ValidationResult with the issues found and the cleaned preferences.
+
+    Example:
+        >>> result = validate_market({"alice": ["bob", "bob", "eve"]}, {"bob": ["alice"]})
+        >>> [(issue.code, issue.location) for issue in result.errors]
+        [('duplicate', ('proposer_preferences', 'alice', 1)), ('unknown_name', ('proposer_preferences', 'alice', 2))]
+        >>> result.proposer_preferences
+        {'alice': ['bob']}
+    """
+    issues: list[ValidationIssue] = [
+        ValidationIssue(
+            "name_collision",
+            "error",
+            ("responder_preferences", name),
+            f"{name!r} is also a proposer, names must be unique across both sides.",
+        )
+        for name in responder_preferences
+        if name in proposer_preferences
+    ]
+    proposers = _clean_side("proposer_preferences", proposer_preferences, responder_preferences, "responder", issues)
+    responders = _clean_side("responder_preferences", responder_preferences, proposer_preferences, "proposer", issues)
+    return ValidationResult(issues=issues, proposer_preferences=proposers, responder_preferences=responders)
@@ -1,8 +1,15 @@
 """Tests for the algorithm module."""
 
+import sys
+from array import array
+
+import pytest
+
 from gale_shapley_algorithm.algorithm import Algorithm
+from gale_shapley_algorithm.matching import _build_algorithm
 from gale_shapley_algorithm.person import Proposer, Responder
-from gale_shapley_algorithm.result import MatchingResult
+from gale_shapley_algorithm.result import ArrayMatchingResult, MatchingResult, MatchingStatistics
+from tests.conftest import random_market
 
 
 class TestAlgorithmProperties:
@@ -180,6 +187,139 @@ class TestExecute:
         assert "w" in result.self_matches
         assert not result.all_matched
 
+    def test_reset_and_execute_again(self, ran_algorithm_fix: Algorithm) -> None:
+        inboxes = [r.current_proposals for r in ran_algorithm_fix.responders]
+        first = MatchingResult(
+            rounds=ran_algorithm_fix.round,
+            matches={"m_1": "w_1"},
+            unmatched=[],
+            self_matches=["m_2", "w_2"],
+            all_matched=False,
+        )
+        proposals = ran_algorithm_fix.proposals
+        ran_algorithm_fix.reset()
+        assert ran_algorithm_fix.round == 0
+        assert ran_algorithm_fix.proposals == 0
+        assert all(person.match is None for person in ran_algorithm_fix.persons)
+        assert all(proposer.last_proposal is None for proposer in ran_algorithm_fix.proposers)
+        assert ran_algorithm_fix.execute() == first
+        assert ran_algorithm_fix.proposals == proposals == 2
+        assert [r.current_proposals for r in ran_algorithm_fix.responders] == inboxes
+        assert all(
+            a is b for a, b in zip(inboxes, (r.current_proposals for r in ran_algorithm_fix.responders), strict=True)
+        )
+
+
+class TestExecuteArray:
+    """Tests for execute_array() returning ArrayMatchingResult."""
+
+    def test_deterministic(self, ran_algorithm_fix: Algorithm) -> None:
+        ran_algorithm_fix.reset()
+        result = ran_algorithm_fix.execute_array()
+        assert result.names == ["m_1", "m_2", "w_1", "w_2"]
+        assert result.partners == array("i", [2, 1, 0, 3])
+        assert result.partner_of("m_1") == "w_1"
+        assert result.partner_of("w_2") == "w_2"
+        assert result.num_matches == 1
+        assert not result.all_matched
+        assert result.to_bytes() == bytes.fromhex("02000000 01000000 00000000 03000000")
+        buffer = result.as_buffer()
+        assert buffer.format == result.partners.typecode
+        assert buffer.tolist() == [2, 1, 0, 3]
+        result.partners[1] = -1
+        assert buffer[1] == -1
+        with pytest.raises(KeyError):
+            result.partner_of("nobody")
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_same_as_execute(self, seed: int) -> None:
+        proposer_preferences, responder_preferences = random_market(12, seed, num_responders=10)
+        expected = _build_algorithm(proposer_preferences, responder_preferences).execute()
+        result = _build_algorithm(proposer_preferences, responder_preferences).execute_array()
+        assert result.to_matching_result() == expected
+        assert result.num_matches == len(expected.matches)
+        assert all(result.partner_of(p) == r for p, r in expected.matches.items())
+
+    def test_unmatched_and_all_matched(self) -> None:
+        result = ArrayMatchingResult(
+            rounds=1, names=["a", "b", "x", "y"], num_proposers=2, partners=array("i", [3, -1, -1, 0])
+        )
+        assert result.unmatched == ["b", "x"]
+        assert result.partner_of("b") is None
+        assert result.matches == {"a": "y"}
+        assert not result.all_matched
+        full = ArrayMatchingResult(rounds=1, names=["a", "x"], num_proposers=1, partners=array("i", [1, 0]))
+        assert full.all_matched
+        assert repr(full) == "ArrayMatchingResult(rounds=1, participants=2)"
+
+    def test_requires_int32_partners(self) -> None:
+        with pytest.raises(ValueError, match="32-bit"):
+            ArrayMatchingResult(rounds=0, names=["a"], num_proposers=1, partners=array("q", [0]))
+
+    def test_to_numpy(self, ran_algorithm_fix: Algorithm) -> None:
+        np = pytest.importorskip("numpy")
+        ran_algorithm_fix.reset()
+        result = ran_algorithm_fix.execute_array()
+        partners = result.to_numpy()
+        assert partners.dtype == np.int32
+        assert partners.tolist() == [2, 1, 0, 3]
+        assert np.shares_memory(partners, np.frombuffer(result.partners, dtype=np.int32))
+
+    def test_to_numpy_without_numpy(self, ran_algorithm_fix: Algorithm, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setitem(sys.modules, "numpy", None)
+        with pytest.raises(ImportError, match="pip install numpy"):
+            ran_algorithm_fix.execute_array().to_numpy()
+
+
+class TestStatistics:
+    """Tests for matching statistics."""
+
+    def test_not_collected_by_default(self, ran_algorithm_fix: Algorithm) -> None:
+        ran_algorithm_fix.reset()
+        assert ran_algorithm_fix.execute().statistics is None
+
+    def test_deterministic(self, ran_algorithm_fix: Algorithm) -> None:
+        ran_algorithm_fix.reset()
+        statistics = ran_algorithm_fix.execute(collect_statistics=True).statistics
+        assert statistics == MatchingStatistics(
+            total_proposals=2,
+            proposals_per_proposer={"m_1": 1, "m_2": 1},
+            rejections=1,
+            partner_ranks={"m_1": 1, "w_1": 1},
+            proposer_average_rank=1.0,
+            proposer_max_rank=1,
+            responder_average_rank=1.0,
+            responder_max_rank=1,
+        )
+
+    def test_nobody_matched(self) -> None:
+        m = Proposer("m", "man")
+        w = Responder("w", "woman")
+        m.preferences = (m, w)
+        w.preferences = (w, m)
+        statistics = Algorithm([m], [w]).execute(collect_statistics=True).statistics
+        assert statistics is not None
+        assert statistics.total_proposals == 0
+        assert statistics.partner_ranks == {}
+        assert statistics.proposer_average_rank is None
+        assert statistics.responder_max_rank is None
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_same_as_scanning_preferences(self, seed: int) -> None:
+        algorithm = _build_algorithm(*random_market(12, seed, num_responders=10))
+        algorithm.execute()
+        built = [person for person in algorithm.persons if person._ranks is not None]
+        statistics = algorithm.statistics()
+        # The rounds built every rank table the statistics need
+        assert [person for person in algorithm.persons if person._ranks is not None] == built
+
+        assert statistics.total_proposals == algorithm.proposals
+        matched = [person for person in algorithm.persons if person.match not in (None, person)]
+        assert statistics.partner_ranks == {p.name: p.preferences.index(p.match) + 1 for p in matched}
+        responder_ranks = [statistics.partner_ranks[r.name] for r in algorithm.responders if r in matched]
+        assert statistics.rejections == algorithm.proposals - len(responder_ranks)
+        assert statistics.responder_max_rank == max(responder_ranks, default=None)
+
 
 class TestRun:
     """Tests for backward-compatible run() via execute()."""
@@ -1,9 +1,33 @@
 """Tests for the FastAPI backend API."""
 
+import asyncio
+import json
+import threading
+import time
+from collections.abc import Iterator
+from pathlib import Path
+
 import pytest
+from fastapi import HTTPException
 from fastapi.testclient import TestClient
 
+from gale_shapley_algorithm._api import jobs, limits, responses, routes, sessions
 from gale_shapley_algorithm._api.app import app
+from gale_shapley_algorithm._api.jobs import JobQueue, JobStore
+from gale_shapley_algorithm._api.limits import Lane, Limits
+from gale_shapley_algorithm._api.metrics import Histogram, market_size_label, metrics
+from gale_shapley_algorithm._api.models import (
+    CompactMatchingResponse,
+    DeltaStepsResponse,
+    MatchingResponse,
+    StepsResponse,
+)
+from gale_shapley_algorithm._api.pagination import pair_page
+from gale_shapley_algorithm._api.responses import FastJSONResponse, dumps
+from gale_shapley_algorithm._api.routes import _until_disconnected
+from gale_shapley_algorithm._api.sessions import Session, SessionStore
+from gale_shapley_algorithm.cancellation import CancellationToken
+from tests.conftest import random_market
 
 
 @pytest.fixture
@@ -93,6 +117,28 @@ class TestMatching:
         assert data["self_matches"] == []
         assert data["unmatched"] == []
 
+    def test_invalid_market_located_errors(self, client: TestClient) -> None:
+        response = client.post(
+            "/api/matching",
+            json={
+                "proposer_preferences": {"alice": ["bob", "bob", "eve"], "bob": []},
+                "responder_preferences": {"bob": ["alice"]},
+            },
+        )
+        assert response.status_code == 422
+        assert [(error["type"], error["loc"]) for error in response.json()["detail"]] == [
+            ("name_collision", ["body", "responder_preferences", "bob"]),
+            ("duplicate", ["body", "proposer_preferences", "alice", 1]),
+            ("unknown_name", ["body", "proposer_preferences", "alice", 2]),
+        ]
+
+    @pytest.mark.parametrize("path", ["/api/matching/steps", "/api/matching/steps/stream", "/api/sessions"])
+    def test_invalid_market_on_every_endpoint(self, client: TestClient, path: str) -> None:
+        payload = {"proposer_preferences": {"a": ["x", "y"]}, "responder_preferences": {"x": ["a"]}}
+        response = client.post(path, json=payload)
+        assert response.status_code == 422
+        assert response.json()["detail"][0]["loc"] == ["body", "proposer_preferences", "a", 1]
+
 
 class TestMatchingSteps:
     """Tests for the POST /api/matching/steps endpoint."""
@@ -177,3 +223,875 @@ class TestMatchingSteps:
         for step in data["steps"]:
             all_step_self_matches.extend(step["self_matches"])
         assert "B" in all_step_self_matches
+
+
+class TestMatchingStepsStream:
+    """Tests for the POST /api/matching/steps/stream endpoint."""
+
+    def test_stream_matches_steps_endpoint(self, client: TestClient) -> None:
+        prefs = {
+            "proposer_preferences": {"A": ["X", "Y"], "B": ["X", "Y"]},
+            "responder_preferences": {"X": ["A", "B"], "Y": ["B", "A"]},
+        }
+        steps_response = client.post("/api/matching/steps", json=prefs).json()
+        with client.stream("POST", "/api/matching/steps/stream", json=prefs) as response:
+            assert response.status_code == 200
+            assert response.headers["content-type"] == "application/x-ndjson"
+            lines = [json.loads(line) for line in response.iter_lines() if line]
+
+        assert lines[:-1] == steps_response["steps"]
+        assert lines[-1] == {"final_result": steps_response["final_result"]}
+
+    def test_stream_ends_at_solve_timeout(self, client: TestClient, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(routes, "limits", Limits(solve_timeout=0))
+        timeouts = metrics.cancellations.value("timeout")
+        with client.stream("POST", "/api/matching/steps/stream", json=_random_prefs(size=4, seed=3)) as response:
+            assert response.status_code == 200
+            assert [line for line in response.iter_lines() if line] == []
+        assert metrics.cancellations.value("timeout") == timeouts + 1
+
+    def test_market_is_checked_off_the_event_loop(self, client: TestClient, monkeypatch: pytest.MonkeyPatch) -> None:
+        loops: list[bool] = []
+        check = routes._check_market
+
+        def check_and_record(req: object) -> None:
+            try:
+                asyncio.get_running_loop()
+            except RuntimeError:
+                loops.append(False)
+            else:
+                loops.append(True)
+            check(req)
+
+        monkeypatch.setattr(routes, "_check_market", check_and_record)
+        assert client.post("/api/matching/steps/stream", json=_random_prefs(size=3, seed=1)).status_code == 200
+        assert loops == [False]
+
+    def test_stream_without_rounds(self, client: TestClient) -> None:
+        with client.stream(
+            "POST",
+            "/api/matching/steps/stream",
+            json={"proposer_preferences": {}, "responder_preferences": {"X": []}},
+        ) as response:
+            lines = [json.loads(line) for line in response.iter_lines() if line]
+
+        assert len(lines) == 1
+        assert lines[0]["final_result"]["self_matches"] == ["X"]
+
+    def test_stops_computing_when_disconnected(self) -> None:
+        class DisconnectedRequest:
+            async def is_disconnected(self) -> bool:
+                return True
+
+        consumed: list[int] = []
+
+        def lines() -> Iterator[bytes]:
+            for i in range(3):
+                consumed.append(i)
+                yield b"{}\n"
+
+        async def collect() -> list[bytes]:
+            return [line async for line in _until_disconnected(DisconnectedRequest(), lines())]  # type: ignore[arg-type]
+
+        assert asyncio.run(collect()) == []
+        assert consumed == [0]
+
+    def test_streams_plain_iterators(self) -> None:
+        class ConnectedRequest:
+            async def is_disconnected(self) -> bool:
+                return False
+
+        async def collect() -> list[bytes]:
+            lines = iter([b"{}\n", b"{}\n"])
+            return [line async for line in _until_disconnected(ConnectedRequest(), lines)]  # type: ignore[arg-type]
+
+        assert asyncio.run(collect()) == [b"{}\n", b"{}\n"]
+
+
+def _random_prefs(size: int, seed: int) -> dict[str, dict[str, list[str]]]:
+    """A random market with complete lists, as a MatchingRequest body."""
+    proposer_preferences, responder_preferences = random_market(size, seed, min_length=size)
+    return {"proposer_preferences": proposer_preferences, "responder_preferences": responder_preferences}
+
+
+def _sorted_matches(actions: list[dict[str, str]]) -> list[tuple[str, str]]:
+    return sorted((a["proposer"], a["responder"]) for a in actions)
+
+
+class TestMatchingStepsDelta:
+    """Tests for POST /api/matching/steps?delta=true."""
+
+    def test_delta_structure(self, client: TestClient) -> None:
+        response = client.post(
+            "/api/matching/steps?delta=true",
+            json={
+                "proposer_preferences": {"A": ["X", "Y"], "B": ["X", "Y"]},
+                "responder_preferences": {"X": ["B", "A"], "Y": ["B", "A"]},
+            },
+        )
+        assert response.status_code == 200
+        steps = response.json()["steps"]
+        assert [s["round"] for s in steps] == [1, 2]
+        assert _sorted_matches(steps[0]["new_matches"]) == [("B", "X")]
+        assert steps[0]["broken_matches"] == []
+        assert _sorted_matches(steps[1]["new_matches"]) == [("A", "Y")]
+        assert "tentative_matches" not in steps[0]
+        assert steps[0]["keyframe"] is None
+
+    def test_broken_matches(self, client: TestClient) -> None:
+        """B holds X until A, whom X prefers, proposes in round 2."""
+        response = client.post(
+            "/api/matching/steps?delta=true",
+            json={
+                "proposer_preferences": {"A": ["Y", "X"], "B": ["X", "Y"], "C": ["Y"]},
+                "responder_preferences": {"X": ["A", "B"], "Y": ["C", "A", "B"]},
+            },
+        )
+        steps = response.json()["steps"]
+        assert _sorted_matches(steps[1]["broken_matches"]) == [("B", "X")]
+        assert _sorted_matches(steps[1]["new_matches"]) == [("A", "X")]
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_expands_to_full_steps(self, client: TestClient, seed: int) -> None:
+        prefs = _random_prefs(size=8, seed=seed)
+        full = StepsResponse.model_validate(client.post("/api/matching/steps", json=prefs).json())
+        delta = DeltaStepsResponse.model_validate(client.post("/api/matching/steps?delta=true", json=prefs).json())
+        expanded = delta.to_steps_response()
+
+        assert expanded.final_result == full.final_result
+        for expanded_step, full_step in zip(expanded.steps, full.steps, strict=True):
+            assert expanded_step.proposals == full_step.proposals
+            assert expanded_step.rejections == full_step.rejections
+            assert expanded_step.self_matches == full_step.self_matches
+            assert sorted(expanded_step.tentative_matches, key=str) == sorted(full_step.tentative_matches, key=str)
+
+    @pytest.mark.parametrize("seed", range(3))
+    def test_keyframes(self, client: TestClient, seed: int) -> None:
+        prefs = _random_prefs(size=10, seed=seed)
+        full = StepsResponse.model_validate(client.post("/api/matching/steps", json=prefs).json())
+        delta = DeltaStepsResponse.model_validate(
+            client.post("/api/matching/steps?delta=true&keyframe_interval=2", json=prefs).json()
+        )
+        assert delta.keyframe_interval == 2
+        assert [step.keyframe is not None for step in delta.steps] == [step.round % 2 == 0 for step in delta.steps]
+        assert delta.tentative_matches_at(0) == []
+        for step in full.steps:
+            reconstructed = delta.tentative_matches_at(step.round)
+            assert sorted(reconstructed, key=str) == sorted(step.tentative_matches, key=str)
+
+    def test_round_out_of_range(self, client: TestClient) -> None:
+        prefs = _random_prefs(size=3, seed=0)
+        delta = DeltaStepsResponse.model_validate(client.post("/api/matching/steps?delta=true", json=prefs).json())
+        with pytest.raises(ValueError):
+            delta.tentative_matches_at(len(delta.steps) + 1)
+
+    def test_negative_keyframe_interval(self, client: TestClient) -> None:
+        response = client.post("/api/matching/steps?delta=true&keyframe_interval=-1", json=_random_prefs(2, 0))
+        assert response.status_code == 422
+
+
+@pytest.fixture(params=[False, True], ids=["models", "fast"])
+def fast_json(request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch) -> bool:
+    monkeypatch.setattr(responses, "fast_json", request.param)
+    return request.param
+
+
+class TestFastSerialization:
+    """The opt-in fast serialization path produces the same JSON as the Pydantic models."""
+
+    @pytest.mark.parametrize("seed", range(3))
+    def test_fast_path_matches_models(self, client: TestClient, monkeypatch: pytest.MonkeyPatch, seed: int) -> None:
+        prefs = _random_prefs(size=6, seed=seed)
+        urls = ["/api/matching", "/api/matching/steps", "/api/matching/steps?delta=true&keyframe_interval=2"]
+        by_path = {}
+        for fast in (False, True):
+            monkeypatch.setattr(responses, "fast_json", fast)
+            by_path[fast] = [client.post(url, json=prefs).json() for url in urls]
+            with client.stream("POST", "/api/matching/steps/stream", json=prefs) as response:
+                by_path[fast].append([json.loads(line) for line in response.iter_lines() if line])
+        assert by_path[False] == by_path[True]
+
+    def test_models_by_default(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        content = {"rounds": 0, "matches": {}, "unmatched": [], "self_matches": [], "all_matched": True}
+        content |= {"is_stable": True, "is_individually_rational": True, "blocking_pairs": []}
+        monkeypatch.setattr(responses, "fast_json", False)
+        assert not isinstance(responses.model_response(content, MatchingResponse), FastJSONResponse)
+        with pytest.raises(ValueError, match="rounds"):
+            responses.model_response(content | {"rounds": "many"}, MatchingResponse)
+        monkeypatch.setattr(responses, "fast_json", True)
+        assert isinstance(responses.model_response(content, MatchingResponse), FastJSONResponse)
+
+    def test_stdlib_fallback(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        content = {"matches": {"ä": "b"}, "blocking_pairs": [("a", "b")]}
+        monkeypatch.setattr(responses, "orjson", None)
+        assert dumps(content) == '{"matches":{"ä":"b"},"blocking_pairs":[["a","b"]]}'.encode()
+
+    @pytest.mark.usefixtures("fast_json")
+    def test_matching_response_content_type(self, client: TestClient) -> None:
+        response = client.post(
+            "/api/matching",
+            json={"proposer_preferences": {"a": ["b"]}, "responder_preferences": {"b": ["a"]}},
+        )
+        assert response.headers["content-type"] == "application/json"
+        assert MatchingResponse.model_validate(response.json()).matches == {"a": "b"}
+
+    def test_openapi_keeps_response_models(self, client: TestClient) -> None:
+        paths = client.get("/openapi.json").json()["paths"]
+        schema = paths["/api/matching"]["post"]["responses"]["200"]["content"]["application/json"]["schema"]
+        assert schema == {"$ref": "#/components/schemas/MatchingResponse"}
+
+
+def _to_compact(prefs: dict[str, dict[str, list[str]]]) -> dict[str, object]:
+    proposers = list(prefs["proposer_preferences"])
+    responders = list(prefs["responder_preferences"])
+    return {
+        "proposers": proposers,
+        "responders": responders,
+        "proposer_preferences": [[responders.index(r) for r in lst] for lst in prefs["proposer_preferences"].values()],
+        "responder_preferences": [[proposers.index(p) for p in lst] for lst in prefs["responder_preferences"].values()],
+    }
+
+
+class TestCompactMatching:
+    """Tests for the POST /api/matching/compact endpoint."""
+
+    def test_basic(self, client: TestClient) -> None:
+        response = client.post(
+            "/api/matching/compact",
+            json={
+                "proposers": ["alice", "dave", "eve"],
+                "responders": ["bob", "charlie"],
+                "proposer_preferences": [[0, 1], [1, 0], []],
+                "responder_preferences": [[0, 1], [1, 0]],
+            },
+        )
+        assert response.status_code == 200
+        data = CompactMatchingResponse.model_validate(response.json())
+        assert data.proposer_matches == [0, 1, -1]
+        assert data.responder_matches == [0, 1]
+        assert data.blocking_pairs == []
+        assert data.is_stable
+        assert not data.all_matched
+
+    @pytest.mark.parametrize("seed", range(3))
+    def test_same_outcome_as_named_endpoint(self, client: TestClient, seed: int) -> None:
+        prefs = _random_prefs(size=7, seed=seed)
+        for lst in prefs["proposer_preferences"].values():
+            del lst[seed:]
+        compact_request = _to_compact(prefs)
+        named = client.post("/api/matching", json=prefs).json()
+        compact = client.post("/api/matching/compact", json=compact_request).json()
+
+        proposers, responders = compact_request["proposers"], compact_request["responders"]
+        assert compact["rounds"] == named["rounds"]
+        assert {proposers[i]: responders[j] for i, j in enumerate(compact["proposer_matches"]) if j >= 0} == named[
+            "matches"
+        ]
+        assert {responders[j] for j, i in enumerate(compact["responder_matches"]) if i < 0} == {
+            name for name in named["self_matches"] if name in responders
+        }
+
+    @pytest.mark.parametrize(
+        ("field", "value"),
+        [
+            ("proposers", ["a", "a"]),
+            ("proposer_preferences", [[2], []]),
+            ("proposer_preferences", [[-1], []]),
+            ("proposer_preferences", [[0, 0], []]),
+            ("responder_preferences", [[0]]),
+        ],
+    )
+    def test_invalid_tables(self, client: TestClient, field: str, value: object) -> None:
+        body: dict[str, object] = {
+            "proposers": ["a", "b"],
+            "responders": ["x", "y"],
+            "proposer_preferences": [[0], [1]],
+            "responder_preferences": [[0], [1]],
+        }
+        body[field] = value
+        response = client.post("/api/matching/compact", json=body)
+        assert response.status_code == 422
+
+
+class TestMetrics:
+    """Tests for the GET /metrics endpoint and the metric types."""
+
+    def test_exposition_format(self, client: TestClient) -> None:
+        response = client.get("/metrics")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        assert "# TYPE gale_shapley_http_requests_total counter" in response.text
+        assert "# TYPE gale_shapley_solve_duration_seconds histogram" in response.text
+        assert 'gale_shapley_threadpool_tasks{state="waiting"} 0' in response.text
+
+    def test_matching_request_is_recorded(self, client: TestClient) -> None:
+        requests = metrics.requests.value("POST", "/api/matching", "200")
+        solved = metrics.solve_seconds.count("matching", "10")
+        client.post("/api/matching", json=_random_prefs(size=4, seed=0))
+        assert metrics.requests.value("POST", "/api/matching", "200") == requests + 1
+        assert metrics.solve_seconds.count("matching", "10") == solved + 1
+        assert metrics.serialize_seconds.count("matching", "10") >= 1
+        text = client.get("/metrics").text
+        assert 'gale_shapley_http_request_duration_seconds_count{route="/api/matching",market_size="10"}' in text
+        assert 'gale_shapley_proposals_bucket{endpoint="matching",le="+Inf"}' in text
+
+    @pytest.mark.parametrize(
+        ("path", "payload", "endpoint"),
+        [
+            ("/api/matching/steps", _random_prefs(size=6, seed=1), "steps"),
+            ("/api/matching/compact", _to_compact(_random_prefs(size=6, seed=1)), "compact"),
+        ],
+    )
+    def test_other_endpoints_are_recorded(self, client: TestClient, path: str, payload: dict, endpoint: str) -> None:
+        rounds = metrics.rounds.count(endpoint)
+        assert client.post(path, json=payload).status_code == 200
+        assert metrics.rounds.count(endpoint) == rounds + 1
+        assert metrics.solve_seconds.count(endpoint, "100") >= 1
+
+    def test_stream_and_errors_are_recorded(self, client: TestClient) -> None:
+        client.post("/api/matching/steps/stream", json=_random_prefs(size=3, seed=2))
+        assert metrics.request_seconds.count("/api/matching/steps/stream", "10") >= 1
+        client.post("/api/matching", json={"proposer_preferences": 1})
+        assert metrics.requests.value("POST", "/api/matching", "422") >= 1
+        client.get("/no/such/path")
+        assert metrics.requests.value("GET", "unmatched", "404") >= 1
+        assert metrics.requests_in_progress.value() == 0
+
+    def test_market_size_label(self) -> None:
+        assert [market_size_label(n) for n in (0, 10, 11, 10_000, 10_001)] == ["10", "10", "100", "10000", "+Inf"]
+
+    def test_histogram_samples(self) -> None:
+        histogram = Histogram("h", "Help.", (1.0, 2.5), ("kind",))
+        for value in (0.5, 2.0, 3.0):
+            histogram.observe(value, "a")
+        assert histogram.samples() == [
+            'h_bucket{kind="a",le="1"} 1',
+            'h_bucket{kind="a",le="2.5"} 2',
+            'h_bucket{kind="a",le="+Inf"} 3',
+            'h_sum{kind="a"} 5.5',
+            'h_count{kind="a"} 3',
+        ]
+
+
+@pytest.fixture
+def tight_limits(monkeypatch: pytest.MonkeyPatch) -> Limits:
+    """Small limits, with fresh lanes so tests do not share slots."""
+    tight = Limits(max_body_bytes=2_000, max_participants=10, max_list_entries=20, max_cost=16, small_cost=4)
+    monkeypatch.setattr(limits, "limits", tight)
+    monkeypatch.setattr(limits, "lanes", {"small": Lane("small", 1), "large": Lane("large", 1)})
+    return tight
+
+
+def _square_market(size: int) -> dict[str, dict[str, list[str]]]:
+    p_names = [f"p{i}" for i in range(size)]
+    r_names = [f"r{i}" for i in range(size)]
+    return {
+        "proposer_preferences": dict.fromkeys(p_names, r_names[:1]),
+        "responder_preferences": dict.fromkeys(r_names, p_names[:1]),
+    }
+
+
+@pytest.mark.usefixtures("tight_limits")
+class TestLimits:
+    """Tests for request size limits and admission control."""
+
+    def test_within_limits(self, client: TestClient) -> None:
+        response = client.post("/api/matching", json=_square_market(2))
+        assert response.status_code == 200
+        assert limits.lanes["small"].active == 0
+
+    def test_body_too_large(self, client: TestClient) -> None:
+        payload = {"proposer_preferences": {"p" * 3_000: []}, "responder_preferences": {}}
+        response = client.post("/api/matching", json=payload)
+        assert response.status_code == 413
+        assert "bytes" in response.json()["detail"]
+
+    def test_chunked_body_too_large(self, client: TestClient) -> None:
+        body = json.dumps({"proposer_preferences": {"p" * 3_000: []}, "responder_preferences": {}}).encode()
+        chunks = iter([body[:1_000], body[1_000:]])
+        response = client.post("/api/matching", content=chunks, headers={"content-type": "application/json"})
+        assert response.status_code == 413
+
+    def test_too_many_participants(self, client: TestClient) -> None:
+        response = client.post("/api/matching", json=_square_market(6))
+        assert response.status_code == 413
+        assert "participants" in response.json()["detail"]
+
+    def test_too_many_list_entries(self, client: TestClient) -> None:
+        payload = {"proposer_preferences": {"p": ["r"] * 21}, "responder_preferences": {"r": ["p"]}}
+        response = client.post("/api/matching/steps", json=payload)
+        assert response.status_code == 413
+        assert "list entries" in response.json()["detail"]
+
+    def test_cost_over_limit(self, client: TestClient) -> None:
+        payload = {"proposers": [f"p{i}" for i in range(5)], "responders": [f"r{i}" for i in range(5)]}
+        payload |= {"proposer_preferences": [[]] * 5, "responder_preferences": [[]] * 5}
+        response = client.post("/api/matching/compact", json=payload)
+        assert response.status_code == 413
+        assert "proposers x responders" in response.json()["detail"]
+        assert metrics.rejections.value("cost") >= 1
+
+    def test_lane_full(self, client: TestClient) -> None:
+        limits.lanes["large"].acquire(retry_after=1)
+        response = client.post("/api/matching", json=_square_market(3))
+        assert response.status_code == 503
+        assert response.headers["retry-after"] == "1"
+        # Small markets still go through while the large lane is busy
+        assert client.post("/api/matching", json=_square_market(2)).status_code == 200
+
+    def test_stream_releases_lane(self, client: TestClient) -> None:
+        with client.stream("POST", "/api/matching/steps/stream", json=_square_market(3)) as response:
+            lines = list(response.iter_lines())
+        assert json.loads(lines[-1])["final_result"]["rounds"] >= 1
+        assert limits.lanes["large"].active == 0
+
+    def test_stream_disconnect_before_first_chunk_releases_lane(self, client: TestClient) -> None:
+        body = json.dumps(_square_market(2)).encode()
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "POST",
+            "scheme": "http",
+            "path": "/api/matching/steps/stream",
+            "raw_path": b"/api/matching/steps/stream",
+            "root_path": "",
+            "query_string": b"",
+            "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+            "client": ("testclient", 50000),
+            "server": ("testserver", 80),
+        }
+
+        async def disconnect_after_body() -> None:
+            messages = iter([{"type": "http.request", "body": body, "more_body": False}])
+
+            async def receive() -> dict:
+                return next(messages, {"type": "http.disconnect"})
+
+            async def send(message: dict) -> None:
+                pass
+
+            await app(scope, receive, send)
+
+        for _ in range(3):
+            asyncio.run(disconnect_after_body())
+        assert limits.lanes["small"].active == 0
+        assert client.post("/api/matching/steps/stream", json=_square_market(2)).status_code == 200
+
+    def test_limits_from_env(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("GALE_SHAPLEY_MAX_PARTICIPANTS", "50")
+        monkeypatch.setenv("GALE_SHAPLEY_LARGE_LANE_SIZE", "4")
+        assert Limits.from_env() == Limits(max_participants=50, large_lane_size=4)
+        monkeypatch.setenv("GALE_SHAPLEY_MAX_COST", "-1")
+        with pytest.raises(ValueError, match="GALE_SHAPLEY_MAX_COST"):
+            Limits.from_env()
+
+
+class TestCancellation:
+    """Tests for solve timeouts and cancellation on client disconnect."""
+
+    @pytest.mark.parametrize("path", ["/api/matching", "/api/matching/compact", "/api/matching/steps", "/api/sessions"])
+    def test_timeout(self, client: TestClient, monkeypatch: pytest.MonkeyPatch, path: str) -> None:
+        monkeypatch.setattr(limits, "limits", Limits(solve_timeout=0))
+        prefs = _random_prefs(size=4, seed=0)
+        payload = _to_compact(prefs) if path.endswith("compact") else prefs
+        timeouts = metrics.cancellations.value("timeout")
+        response = client.post(path, json=payload)
+        assert response.status_code == 504
+        assert "0 seconds" in response.json()["detail"]
+        assert metrics.cancellations.value("timeout") == timeouts + 1
+        assert all(lane.active == 0 for lane in limits.lanes.values())
+
+    def test_cancelled_on_disconnect(self) -> None:
+        class DisconnectedRequest:
+            async def receive(self) -> dict[str, str]:
+                return {"type": "http.disconnect"}
+
+        def solve(cancel: CancellationToken) -> None:
+            while True:
+                cancel.check()
+                time.sleep(0.001)
+
+        disconnects = metrics.cancellations.value("disconnect")
+        with pytest.raises(HTTPException) as excinfo:
+            asyncio.run(limits.run_cancellable(DisconnectedRequest(), solve))  # type: ignore[arg-type]
+        assert excinfo.value.status_code == 499
+        assert metrics.cancellations.value("disconnect") == disconnects + 1
+
+    def test_finished_solve_stops_watching(self) -> None:
+        class SilentRequest:
+            async def receive(self) -> dict[str, str]:
+                await asyncio.sleep(60)
+                return {"type": "http.disconnect"}
+
+        result = asyncio.run(limits.run_cancellable(SilentRequest(), lambda x, cancel: x * 2, 21))  # type: ignore[arg-type]
+        assert result == 42
+
+
+class FakeClock:
+    """Monotonic clock advanced by hand."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def session_store(monkeypatch: pytest.MonkeyPatch) -> SessionStore:
+    store = SessionStore(max_sessions=3, max_bytes=1_000_000, ttl=60, clock=FakeClock())
+    monkeypatch.setattr(sessions, "sessions", store)
+    return store
+
+
+def _create_session(client: TestClient, prefs: dict) -> dict:
+    response = client.post("/api/sessions", json=prefs)
+    assert response.status_code == 201
+    return response.json()
+
+
+class TestSessions:
+    """Tests for the /api/sessions endpoints."""
+
+    @pytest.mark.parametrize("seed", range(3))
+    def test_rounds_match_steps_endpoint(self, client: TestClient, session_store: SessionStore, seed: int) -> None:
+        prefs = _random_prefs(size=10, seed=seed)
+        full = client.post("/api/matching/steps", json=prefs).json()
+        created = _create_session(client, prefs)
+        assert created["rounds"] == len(full["steps"])
+        assert created["final_result"] == full["final_result"]
+        assert created["ttl_seconds"] == 60
+
+        base = f"/api/sessions/{created['session_id']}"
+        for step in full["steps"]:
+            assert client.get(f"{base}/rounds/{step['round']}").json() == step
+        assert client.get(f"{base}/rounds").json() == {"steps": full["steps"]}
+        assert client.get(f"{base}/rounds?start=2&stop=3").json() == {"steps": full["steps"][1:3]}
+        assert client.get(f"{base}/rounds?start=99").json() == {"steps": []}
+
+    def test_unknown_session_and_round(self, client: TestClient, session_store: SessionStore) -> None:
+        assert client.get("/api/sessions/nope/rounds/1").status_code == 404
+        session_id = _create_session(client, _random_prefs(size=4, seed=1))["session_id"]
+        response = client.get(f"/api/sessions/{session_id}/rounds/99")
+        assert response.status_code == 404
+        assert "rounds" in response.json()["detail"]
+        assert client.get(f"/api/sessions/{session_id}/rounds/0").status_code == 422
+
+    def test_delete(self, client: TestClient, session_store: SessionStore) -> None:
+        session_id = _create_session(client, _random_prefs(size=4, seed=2))["session_id"]
+        assert client.delete(f"/api/sessions/{session_id}").status_code == 204
+        assert len(session_store) == 0
+        assert client.delete(f"/api/sessions/{session_id}").status_code == 404
+
+    def test_lookups_are_counted(self, client: TestClient, session_store: SessionStore) -> None:
+        session_id = _create_session(client, _random_prefs(size=4, seed=3))["session_id"]
+        hits, misses = metrics.session_lookups.value("hit"), metrics.session_lookups.value("miss")
+        client.get(f"/api/sessions/{session_id}/rounds/1")
+        client.get("/api/sessions/nope/rounds/1")
+        assert metrics.session_lookups.value("hit") == hits + 1
+        assert metrics.session_lookups.value("miss") == misses + 1
+        assert metrics.sessions.value() == 1
+        assert 'gale_shapley_session_lookups_total{result="hit"}' in client.get("/metrics").text
+
+    def test_result_pages(self, client: TestClient, session_store: SessionStore) -> None:
+        created = _create_session(client, _random_prefs(size=10, seed=4))
+        base = f"/api/sessions/{created['session_id']}/result"
+        pairs, cursor = [], 0
+        while cursor is not None:
+            page = client.get(f"{base}/matches?cursor={cursor}&limit=3").json()
+            assert len(page["items"]) <= 3
+            assert page["total"] == len(created["final_result"]["matches"])
+            pairs += [(item["proposer"], item["responder"]) for item in page["items"]]
+            cursor = page["next_cursor"]
+        assert dict(pairs) == created["final_result"]["matches"]
+
+        page = client.get(f"{base}/matches?participant=p1").json()
+        assert page["items"] == [{"proposer": "p1", "responder": created["final_result"]["matches"]["p1"]}]
+        assert client.get(f"{base}/blocking-pairs?participant=p1").json() == {
+            "items": [],
+            "total": 0,
+            "next_cursor": None,
+        }
+        assert client.get(f"{base}/matches?limit=1001").status_code == 422
+        assert client.get(f"{base}/matches?cursor=-1").status_code == 422
+        assert client.get("/api/sessions/nope/result/matches").status_code == 404
+
+
+class TestSessionStore:
+    """Tests for SessionStore eviction."""
+
+    @staticmethod
+    def _session(size: int = 10) -> Session:
+        return Session(log=None, size=size, final_result={})  # type: ignore[arg-type]
+
+    @pytest.fixture(autouse=True)
+    def _no_logs(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(SessionStore, "_remove", _remove_without_log)
+
+    def test_ttl_is_refreshed_on_use(self) -> None:
+        clock = FakeClock()
+        store = SessionStore(max_sessions=10, max_bytes=1_000, ttl=60, clock=clock)
+        session_id = store.add(self._session())
+        clock.now = 50
+        assert store.get(session_id)
+        clock.now = 100
+        assert store.get(session_id)
+        expired = metrics.session_lookups.value("expired")
+        clock.now = 200
+        with pytest.raises(HTTPException) as excinfo:
+            store.get(session_id)
+        assert excinfo.value.status_code == 404
+        assert metrics.session_lookups.value("expired") == expired + 1
+        assert len(store) == 0
+
+    def test_expired_sessions_are_dropped_on_add(self) -> None:
+        clock = FakeClock()
+        store = SessionStore(max_sessions=10, max_bytes=1_000, ttl=60, clock=clock)
+        store.add(self._session())
+        clock.now = 61
+        store.add(self._session())
+        assert len(store) == 1
+
+    def test_least_recently_used_is_evicted(self) -> None:
+        store = SessionStore(max_sessions=2, max_bytes=1_000, ttl=60, clock=FakeClock())
+        first, second = store.add(self._session()), store.add(self._session())
+        store.get(first)
+        store.add(self._session())
+        assert store.get(first)
+        with pytest.raises(HTTPException):
+            store.get(second)
+
+    def test_total_size_is_bounded(self) -> None:
+        store = SessionStore(max_sessions=10, max_bytes=100, ttl=60, clock=FakeClock())
+        first = store.add(self._session(size=60))
+        store.add(self._session(size=60))
+        assert len(store) == 1
+        with pytest.raises(HTTPException):
+            store.get(first)
+        with pytest.raises(HTTPException) as excinfo:
+            store.add(self._session(size=101))
+        assert excinfo.value.status_code == 413
+
+
+def _remove_without_log(self: SessionStore, session_id: str) -> None:
+    session = self._sessions.pop(session_id)
+    self._bytes -= session.size
+
+
+@pytest.fixture
+def job_queue(monkeypatch: pytest.MonkeyPatch) -> Iterator[JobQueue]:
+    queue = JobQueue(JobStore(), workers=1, max_pending=2)
+    monkeypatch.setattr(jobs, "jobs", queue)
+    yield queue
+    queue.shutdown()
+    queue.store.close()
+
+
+def _wait_for_job(client: TestClient, job_id: str) -> dict:
+    for _ in range(500):
+        job = client.get(f"/api/jobs/{job_id}").json()
+        if job["status"] not in ("queued", "running"):
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"Job {job_id} did not finish")
+
+
+@pytest.fixture
+def blocked_worker(monkeypatch: pytest.MonkeyPatch) -> Iterator[threading.Event]:
+    """Jobs wait for the returned event before building their market."""
+    release = threading.Event()
+    build = jobs._build_algorithm
+
+    def wait_then_build(*args: object) -> object:
+        release.wait(timeout=5)
+        return build(*args)
+
+    monkeypatch.setattr(jobs, "_build_algorithm", wait_then_build)
+    yield release
+    release.set()
+
+
+@pytest.mark.usefixtures("job_queue")
+class TestJobs:
+    """Tests for the /api/jobs endpoints."""
+
+    def test_lifecycle(self, client: TestClient, blocked_worker: threading.Event) -> None:
+        prefs = _random_prefs(size=8, seed=4)
+        response = client.post("/api/jobs", json=prefs)
+        assert response.status_code == 202
+        job_id = response.json()["job_id"]
+        assert response.headers["location"] == f"/api/jobs/{job_id}"
+        assert response.json()["status"] in ("queued", "running")
+        assert client.get(f"/api/jobs/{job_id}").json()["status"] in ("queued", "running")
+
+        blocked_worker.set()
+        job = _wait_for_job(client, job_id)
+        assert job["status"] == "succeeded"
+        assert job["error"] is None
+        assert job["progress"]["free_proposers"] == 0
+        result = client.get(f"/api/jobs/{job_id}/result")
+        assert result.json() == client.post("/api/matching", json=prefs).json()
+        assert job["progress"]["round"] == result.json()["rounds"]
+
+        assert client.delete(f"/api/jobs/{job_id}").status_code == 204
+        assert client.get(f"/api/jobs/{job_id}").status_code == 404
+        assert client.get(f"/api/jobs/{job_id}/result").status_code == 404
+        assert client.delete(f"/api/jobs/{job_id}").status_code == 404
+
+    def test_rejected_before_queueing(self, client: TestClient, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(limits, "limits", Limits(job_max_participants=10, job_max_cost=16))
+        monkeypatch.setattr(jobs, "limits", limits.limits)
+        invalid = {"proposer_preferences": {"a": ["x", "y"]}, "responder_preferences": {"x": ["a"]}}
+        assert client.post("/api/jobs", json=invalid).status_code == 422
+        response = client.post("/api/jobs", json=_square_market(6))
+        assert response.status_code == 413
+        assert "10 participants" in response.json()["detail"]
+        response = client.post("/api/jobs", json=_square_market(5))
+        assert response.status_code == 413
+        assert "at most 16" in response.json()["detail"]
+
+    def test_job_limits_admit_large_markets(self) -> None:
+        job_limits = {"max_participants": Limits().job_max_participants, "max_cost": Limits().job_max_cost}
+        assert limits.check_size(25_000, 25_000, 50_000, **job_limits) == 625_000_000
+        with pytest.raises(HTTPException):
+            limits.check_size(25_000, 25_000, 50_000)
+
+    def test_cancel_and_pending_limit(self, client: TestClient, blocked_worker: threading.Event) -> None:
+        prefs = _random_prefs(size=4, seed=1)
+        running = client.post("/api/jobs", json=prefs).json()["job_id"]
+        queued = client.post("/api/jobs", json=prefs).json()["job_id"]
+        response = client.post("/api/jobs", json=prefs)
+        assert response.status_code == 503
+        assert "Retry-After" in response.headers
+
+        result = client.get(f"/api/jobs/{queued}/result")
+        assert result.status_code == 409
+        assert "queued" in result.json()["detail"]
+        assert client.delete(f"/api/jobs/{queued}").status_code == 204
+        blocked_worker.set()
+        assert _wait_for_job(client, running)["status"] == "succeeded"
+        cancelled = _wait_for_job(client, queued)
+        assert cancelled["status"] == "cancelled"
+        assert cancelled["progress"] is None
+        assert metrics.jobs.value("queued") == metrics.jobs.value("running") == 0
+
+    def test_timeout(self, client: TestClient, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(limits, "limits", Limits(job_timeout=0))
+        monkeypatch.setattr(jobs, "limits", limits.limits)
+        job_id = client.post("/api/jobs", json=_random_prefs(size=4, seed=2)).json()["job_id"]
+        job = _wait_for_job(client, job_id)
+        assert job["status"] == "failed"
+        assert "0 seconds" in job["error"]
+
+    def test_failed_job(self, client: TestClient, monkeypatch: pytest.MonkeyPatch) -> None:
+        def broken(*args: object) -> None:
+            raise RuntimeError("boom")
+
+        monkeypatch.setattr(jobs, "_build_algorithm", broken)
+        failures = metrics.finished_jobs.value("failed")
+        job_id = client.post("/api/jobs", json=_random_prefs(size=4, seed=3)).json()["job_id"]
+        job = _wait_for_job(client, job_id)
+        assert job["status"] == "failed"
+        assert job["error"] == "RuntimeError: boom"
+        assert client.get(f"/api/jobs/{job_id}/result").status_code == 409
+        assert metrics.finished_jobs.value("failed") == failures + 1
+
+    def test_result_pages(self, client: TestClient, blocked_worker: threading.Event) -> None:
+        prefs = {
+            "proposer_preferences": {"ann": ["xav", "yul"], "amy": ["xav"], "bob": ["yul"]},
+            "responder_preferences": {"xav": ["amy", "ann"], "yul": ["ann", "bob"]},
+        }
+        job_id = client.post("/api/jobs", json=prefs).json()["job_id"]
+        assert client.get(f"/api/jobs/{job_id}/result/matches").status_code == 409
+        blocked_worker.set()
+        _wait_for_job(client, job_id)
+
+        page = client.get(f"/api/jobs/{job_id}/result/matches?limit=1").json()
+        assert page == {"items": [{"proposer": "ann", "responder": "yul"}], "total": 2, "next_cursor": 1}
+        page = client.get(f"/api/jobs/{job_id}/result/matches?cursor=1&limit=1").json()
+        assert page == {"items": [{"proposer": "amy", "responder": "xav"}], "total": 2, "next_cursor": None}
+        page = client.get(f"/api/jobs/{job_id}/result/matches?prefix=y").json()
+        assert page["items"] == [{"proposer": "ann", "responder": "yul"}]
+        assert client.get(f"/api/jobs/{job_id}/result/blocking-pairs").json()["total"] == 0
+        assert client.get("/api/jobs/nope/result/blocking-pairs").status_code == 404
+
+    def test_server_stop_drops_queued_jobs(self, job_queue: JobQueue, blocked_worker: threading.Event) -> None:
+        prefs = _random_prefs(size=4, seed=5)
+        with TestClient(app) as client:
+            running = client.post("/api/jobs", json=prefs).json()["job_id"]
+            queued = client.post("/api/jobs", json=prefs).json()["job_id"]
+            while job_queue.store.get(running)["status"] != "running":  # type: ignore[index]
+                time.sleep(0.01)
+            threading.Timer(0.1, blocked_worker.set).start()
+        for job_id in (running, queued):
+            job = job_queue.store.get(job_id)
+            assert job is not None
+            assert job["status"] == "failed"
+            assert job["error"] == "Server stopped before the job finished."
+        assert job_queue.store.get(queued)["progress"] is None  # type: ignore[index]
+        assert metrics.jobs.value("queued") == metrics.jobs.value("running") == 0
+
+
+class TestPairPage:
+    """Tests for pair_page."""
+
+    def test_filters_before_paging(self) -> None:
+        blocking_pairs = [["ann", "xav"], ["bob", "xav"], ["ann", "yul"], ["cat", "zed"]]
+        page = pair_page(blocking_pairs, limit=1, participant="ann")
+        assert page == {"items": [{"proposer": "ann", "responder": "xav"}], "total": 2, "next_cursor": 1}
+        page = pair_page(blocking_pairs, cursor=1, prefix="x")
+        assert page == {"items": [{"proposer": "bob", "responder": "xav"}], "total": 2, "next_cursor": None}
+        assert pair_page(blocking_pairs, prefix="a", participant="yul")["total"] == 1
+        assert pair_page(blocking_pairs, cursor=9)["items"] == []
+
+    def test_unfiltered_pages_are_sliced(self) -> None:
+        matches = [(f"p{i}", f"r{i}") for i in range(5)]
+        page = pair_page(matches, cursor=3, limit=1)
+        assert page == {"items": [{"proposer": "p3", "responder": "r3"}], "total": 5, "next_cursor": 4}
+        assert pair_page(matches, cursor=4)["next_cursor"] is None
+
+
+class TestJobStore:
+    """Tests for JobStore."""
+
+    def test_unfinished_jobs_fail_on_reopen(self, tmp_path: Path) -> None:
+        path = str(tmp_path / "jobs.sqlite3")
+        store = JobStore(path)
+        job_id = store.create()
+        store.close()
+        store = JobStore(path)
+        job = store.get(job_id)
+        assert job is not None
+        assert job["status"] == "failed"
+        assert "stopped" in job["error"]
+        store.close()
+
+    def test_result_pairs_are_cached(self) -> None:
+        store = JobStore()
+        job_ids = [store.create() for _ in range(jobs.RESULT_CACHE_SIZE + 1)]
+        for job_id in job_ids:
+            store.set_status(job_id, "succeeded", result=b'{"matches": {"a": "x"}, "blocking_pairs": []}')
+        assert store.result_pairs(store.create()) is None
+        pairs = store.result_pairs(job_ids[0])
+        assert pairs == {"matches": [("a", "x")], "blocking_pairs": []}
+        assert store.result_pairs(job_ids[0]) is pairs
+        for job_id in job_ids[1:]:
+            store.result_pairs(job_id)
+        assert store.result_pairs(job_ids[0]) is not pairs
+
+        store.delete(job_ids[0])
+        assert store.result_pairs(job_ids[0]) is None
+        store.close()
+
+    def test_purge_keeps_active_jobs(self) -> None:
+        clock = FakeClock()
+        store = JobStore(clock=clock)
+        active, finished = store.create(), store.create()
+        store.set_status(finished, "succeeded", result=b"{}")
+        clock.now = 10
+        assert store.purge(before=5) == 1
+        assert store.get(finished) is None
+        assert store.get(active) is not None
+        assert store.result(active) is None
+        store.close()
@@ -0,0 +1,99 @@
+"""Tests for the cancellation module."""
+
+import threading
+
+import pytest
+
+from gale_shapley_algorithm.algorithm import Algorithm
+from gale_shapley_algorithm.cancellation import CancellationToken, SolveCancelledError, SolveTimeoutError
+from gale_shapley_algorithm.matching import _build_algorithm, create_matching
+from gale_shapley_algorithm.threaded import ThreadedAlgorithm
+
+PROPOSER_PREFERENCES = {"a": ["x", "y"], "b": ["x", "y"], "c": ["x", "y"]}
+RESPONDER_PREFERENCES = {"x": ["c", "b", "a"], "y": ["b", "a", "c"]}
+
+
+class FakeClock:
+    """Monotonic clock advanced by hand."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestCancellationToken:
+    """Tests for CancellationToken."""
+
+    def test_cancel(self) -> None:
+        token = CancellationToken()
+        token.check()
+        assert not token.cancelled
+        assert token.deadline is None
+        token.cancel()
+        assert token.cancelled
+        with pytest.raises(SolveCancelledError, match="cancelled"):
+            token.check()
+
+    def test_deadline(self) -> None:
+        clock = FakeClock()
+        token = CancellationToken(timeout=5, clock=clock)
+        clock.now = 4.9
+        token.check()
+        clock.now = 5
+        assert token.expired
+        with pytest.raises(SolveTimeoutError):
+            token.check()
+
+    def test_timeout_is_a_cancellation(self) -> None:
+        assert issubclass(SolveTimeoutError, SolveCancelledError)
+        assert issubclass(SolveTimeoutError, TimeoutError)
+
+    def test_cancel_from_another_thread(self) -> None:
+        token = CancellationToken()
+        thread = threading.Thread(target=token.cancel)
+        thread.start()
+        thread.join()
+        assert token.cancelled
+
+
+class TestExecuteWithCancellation:
+    """Tests for cancel in Algorithm.execute and create_matching."""
+
+    def test_stops_between_rounds(self) -> None:
+        algorithm = _build_algorithm(PROPOSER_PREFERENCES, RESPONDER_PREFERENCES)
+        token = CancellationToken()
+
+        def on_round(algorithm: Algorithm) -> None:
+            if algorithm.round == 1:
+                token.cancel()
+
+        with pytest.raises(SolveCancelledError):
+            algorithm.execute(on_round=on_round, cancel=token)
+        assert algorithm.round == 1
+        assert not algorithm.awaiting_to_respond_responders
+        assert algorithm.execute() == create_matching(PROPOSER_PREFERENCES, RESPONDER_PREFERENCES)
+
+    def test_expired_before_start(self) -> None:
+        clock = FakeClock()
+        token = CancellationToken(timeout=0, clock=clock)
+        with pytest.raises(SolveTimeoutError):
+            create_matching(PROPOSER_PREFERENCES, RESPONDER_PREFERENCES, cancel=token)
+        algorithm = _build_algorithm(PROPOSER_PREFERENCES, RESPONDER_PREFERENCES)
+        with pytest.raises(SolveTimeoutError):
+            algorithm.execute_array(cancel=token)
+        assert algorithm.round == 0
+
+    def test_unused_token_changes_nothing(self) -> None:
+        token = CancellationToken(timeout=60)
+        result = create_matching(PROPOSER_PREFERENCES, RESPONDER_PREFERENCES, cancel=token)
+        assert result == create_matching(PROPOSER_PREFERENCES, RESPONDER_PREFERENCES)
+
+    def test_threaded(self) -> None:
+        base = _build_algorithm(PROPOSER_PREFERENCES, RESPONDER_PREFERENCES)
+        algorithm = ThreadedAlgorithm(base.proposers, base.responders, max_workers=2)
+        token = CancellationToken()
+        token.cancel()
+        with pytest.raises(SolveCancelledError):
+            algorithm.execute(cancel=token)
@@ -0,0 +1,150 @@
+"""Tests for the checkpoint module."""
+
+from pathlib import Path
+
+import pytest
+
+from gale_shapley_algorithm import checkpoint
+from gale_shapley_algorithm.algorithm import Algorithm
+from gale_shapley_algorithm.checkpoint import (
+    dump_checkpoint,
+    execute_with_checkpoints,
+    load_checkpoint,
+    restore_checkpoint,
+    save_checkpoint,
+)
+from gale_shapley_algorithm.matching import _build_algorithm
+from tests.conftest import random_market
+
+Market = tuple[dict[str, list[str]], dict[str, list[str]]]
+
+
+class PreemptedError(Exception):
+    """Raised from a round callback to simulate an evicted worker."""
+
+
+def _run_rounds(algorithm: Algorithm, rounds: int) -> None:
+    for _ in range(rounds):
+        algorithm.proposers_propose()
+        algorithm.responders_respond()
+        algorithm.round += 1
+
+
+@pytest.fixture
+def market() -> Market:
+    return random_market(12, 3, min_length=1)
+
+
+class TestDumpRestore:
+    """Tests for dump_checkpoint and restore_checkpoint."""
+
+    def test_resumed_run_matches_uninterrupted(self, market: Market) -> None:
+        uninterrupted = _build_algorithm(*market)
+        expected = uninterrupted.execute()
+        assert expected.rounds > 3
+
+        algorithm = _build_algorithm(*market)
+        _run_rounds(algorithm, 3)
+        data = dump_checkpoint(algorithm)
+
+        resumed = _build_algorithm(*market)
+        restore_checkpoint(resumed, data)
+        assert resumed.round == 3
+        assert dump_checkpoint(resumed) == data
+        assert resumed.proposals == algorithm.proposals
+        assert resumed.execute() == expected
+        assert resumed.proposals == uninterrupted.proposals
+
+    def test_restore_overwrites_state(self, market: Market) -> None:
+        fresh = dump_checkpoint(_build_algorithm(*market))
+        algorithm = _build_algorithm(*market)
+        algorithm.execute()
+        restore_checkpoint(algorithm, fresh)
+        assert algorithm.round == 0
+        assert all(person.match is None for person in algorithm.persons)
+
+    def test_pending_proposals(self, market: Market) -> None:
+        algorithm = _build_algorithm(*market)
+        algorithm.proposers_propose()
+        with pytest.raises(ValueError, match="middle of a round"):
+            dump_checkpoint(algorithm)
+
+    def test_different_market(self, market: Market) -> None:
+        data = dump_checkpoint(_build_algorithm(*market))
+        other = random_market(12, 4, min_length=1)
+        with pytest.raises(ValueError, match="different market"):
+            restore_checkpoint(_build_algorithm(*other), data)
+
+    def test_different_size(self, market: Market) -> None:
+        data = dump_checkpoint(_build_algorithm(*market))
+        with pytest.raises(ValueError, match="different size"):
+            restore_checkpoint(_build_algorithm(*random_market(5, 3, min_length=1)), data)
+
+    @pytest.mark.parametrize("data", [b"", b"GSCK", b"XXXX" + bytes(28)])
+    def test_not_a_checkpoint(self, market: Market, data: bytes) -> None:
+        with pytest.raises(ValueError, match=r"truncated|Not a checkpoint"):
+            restore_checkpoint(_build_algorithm(*market), data)
+
+    def test_truncated_arrays(self, market: Market) -> None:
+        data = dump_checkpoint(_build_algorithm(*market))
+        with pytest.raises(ValueError, match="truncated"):
+            restore_checkpoint(_build_algorithm(*market), data[:-4])
+
+
+class TestCheckpointFiles:
+    """Tests for the file based checkpoint functions."""
+
+    def test_save_and_load(self, market: Market, tmp_path: Path) -> None:
+        algorithm = _build_algorithm(*market)
+        _run_rounds(algorithm, 2)
+        path = tmp_path / "state.ckpt"
+        save_checkpoint(algorithm, path)
+        assert list(tmp_path.iterdir()) == [path]
+
+        resumed = _build_algorithm(*market)
+        load_checkpoint(resumed, path)
+        assert dump_checkpoint(resumed) == dump_checkpoint(algorithm)
+
+    def test_resume_after_preemption(self, market: Market, tmp_path: Path) -> None:
+        expected = _build_algorithm(*market).execute()
+        path = tmp_path / "state.ckpt"
+
+        def evict(algorithm: Algorithm) -> None:
+            if algorithm.round == 4:
+                raise PreemptedError
+
+        interrupted = _build_algorithm(*market)
+        with pytest.raises(PreemptedError):
+            interrupted.execute(on_round=lambda a: (save_checkpoint(a, path), evict(a)))
+        assert path.exists()
+
+        assert execute_with_checkpoints(_build_algorithm(*market), path, every=2) == expected
+        assert not path.exists()
+
+    def test_saves_every_interval(self, market: Market, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        saved_rounds: list[int] = []
+        checksums: list[int] = []
+        write, market_checksum = checkpoint._write_atomically, checkpoint._market_checksum
+
+        def counted_write(path: Path, data: bytes) -> None:
+            saved_rounds.append(int.from_bytes(data[6:10], "little"))
+            write(path, data)
+
+        def counted_checksum(algorithm: Algorithm) -> int:
+            checksums.append(market_checksum(algorithm))
+            return checksums[-1]
+
+        monkeypatch.setattr(checkpoint, "_write_atomically", counted_write)
+        monkeypatch.setattr(checkpoint, "_market_checksum", counted_checksum)
+        result = execute_with_checkpoints(_build_algorithm(*market), tmp_path / "state.ckpt", every=2)
+        assert saved_rounds == list(range(2, result.rounds + 1, 2))
+        assert len(checksums) == 1
+
+        # By default only long runs are checkpointed
+        saved_rounds.clear()
+        assert execute_with_checkpoints(_build_algorithm(*market), tmp_path / "state.ckpt") == result
+        assert saved_rounds == []
+
+    def test_every_must_be_positive(self, market: Market, tmp_path: Path) -> None:
+        with pytest.raises(ValueError, match="positive"):
+            execute_with_checkpoints(_build_algorithm(*market), tmp_path / "state.ckpt", every=0)
@@ -24,15 +24,15 @@ def test_cli_interactive_mode() -> None:
     """Test CLI in interactive mode with monkeypatched prompts."""
     with (
         patch(
-            "gale_shapley_algorithm._cli.app.prompt_side_names",
+            "gale_shapley_algorithm._cli.prompts.prompt_side_names",
             return_value=("Men", "Women"),
         ),
         patch(
-            "gale_shapley_algorithm._cli.app.prompt_names",
+            "gale_shapley_algorithm._cli.prompts.prompt_names",
             side_effect=[["Will", "Hampton"], ["April", "Summer"]],
         ),
         patch(
-            "gale_shapley_algorithm._cli.app.prompt_preferences",
+            "gale_shapley_algorithm._cli.prompts.prompt_preferences",
             side_effect=[
                 {"Will": ["April", "Summer"], "Hampton": ["Summer", "April"]},
                 {"April": ["Will", "Hampton"], "Summer": ["Hampton", "Will"]},
@@ -48,7 +48,7 @@ def test_cli_interactive_mode() -> None:
 def test_cli_random_mode() -> None:
     """Test CLI in random mode."""
     with patch(
-        "gale_shapley_algorithm._cli.app.prompt_random_config",
+        "gale_shapley_algorithm._cli.prompts.prompt_random_config",
         return_value=("Men", "Women", 3, 3),
     ):
         result = runner.invoke(app, ["--random"])
@@ -57,19 +57,33 @@ def test_cli_random_mode() -> None:
     assert "Matching Result" in result.output
 
 
+def test_cli_memory_profile() -> None:
+    """Test CLI in random mode with the memory profile."""
+    with patch(
+        "gale_shapley_algorithm._cli.prompts.prompt_random_config",
+        return_value=("Men", "Women", 3, 3),
+    ):
+        result = runner.invoke(app, ["--random", "--memory-profile"])
+
+    assert result.exit_code == 0
+    assert "Memory Profile" in result.output
+    assert "stability" in result.output
+    assert "Matching Result" in result.output
+
+
 def test_cli_swap_sides() -> None:
     """Test CLI with --swap-sides runs algorithm twice and shows both results."""
     with (
         patch(
-            "gale_shapley_algorithm._cli.app.prompt_side_names",
+            "gale_shapley_algorithm._cli.prompts.prompt_side_names",
             return_value=("Men", "Women"),
         ),
         patch(
-            "gale_shapley_algorithm._cli.app.prompt_names",
+            "gale_shapley_algorithm._cli.prompts.prompt_names",
             side_effect=[["Will", "Hampton"], ["April", "Summer"]],
         ),
         patch(
-            "gale_shapley_algorithm._cli.app.prompt_preferences",
+            "gale_shapley_algorithm._cli.prompts.prompt_preferences",
             side_effect=[
                 {"Will": ["April", "Summer"], "Hampton": ["Summer", "April"]},
                 {"April": ["Will", "Hampton"], "Summer": ["Hampton", "Will"]},
@@ -87,7 +101,7 @@ def test_cli_swap_sides() -> None:
 def test_cli_random_mode_with_swap() -> None:
     """Test CLI in random mode with --swap-sides runs twice."""
     with patch(
-        "gale_shapley_algorithm._cli.app.prompt_random_config",
+        "gale_shapley_algorithm._cli.prompts.prompt_random_config",
         return_value=("Men", "Women", 2, 2),
     ):
         result = runner.invoke(app, ["--random", "--swap-sides"])
@@ -101,7 +115,7 @@ def test_cli_random_mode_with_swap() -> None:
 def test_cli_keyboard_interrupt() -> None:
     """Test CLI handles KeyboardInterrupt gracefully."""
     with patch(
-        "gale_shapley_algorithm._cli.app.prompt_random_config",
+        "gale_shapley_algorithm._cli.prompts.prompt_random_config",
         side_effect=KeyboardInterrupt,
     ):
         result = runner.invoke(app, ["--random"])
@@ -113,7 +127,7 @@ def test_cli_keyboard_interrupt() -> None:
 def test_cli_eof_error() -> None:
     """Test CLI handles EOFError gracefully."""
     with patch(
-        "gale_shapley_algorithm._cli.app.prompt_random_config",
+        "gale_shapley_algorithm._cli.prompts.prompt_random_config",
         side_effect=EOFError,
     ):
         result = runner.invoke(app, ["--random"])
@@ -125,7 +139,7 @@ def test_cli_eof_error() -> None:
 def test_cli_stability_reported() -> None:
     """Test that stability is reported in output."""
     with patch(
-        "gale_shapley_algorithm._cli.app.prompt_random_config",
+        "gale_shapley_algorithm._cli.prompts.prompt_random_config",
         return_value=("Men", "Women", 2, 2),
     ):
         result = runner.invoke(app, ["--random"])
@@ -393,3 +407,22 @@ class TestRunMatching:
         )
         total = len(result.matches) + len(result.self_matches) + len(result.unmatched)
         assert total >= 3
+
+
+def test_matching_progress_updates_bar() -> None:
+    from rich.progress import Progress
+
+    from gale_shapley_algorithm._cli.display import matching_progress
+    from gale_shapley_algorithm.progress import ProgressInfo
+
+    with patch.object(Progress, "update") as update, matching_progress(num_proposers=5) as on_progress:
+        on_progress(ProgressInfo(round=2, free_proposers=1, proposals=7, elapsed=0.5))
+    assert update.call_args.kwargs == {"completed": 4, "round": 2, "proposals": 7}
+
+
+def test_cli_console_is_lazy() -> None:
+    import gale_shapley_algorithm._cli as cli
+
+    assert cli.console is cli.console
+    with pytest.raises(AttributeError):
+        _ = cli.does_not_exist
@@ -1,5 +1,7 @@
 """Test fixtures for the Gale-Shapley algorithm."""
 
+import random
+
 import pytest
 
 from gale_shapley_algorithm.algorithm import Algorithm
@@ -71,3 +73,33 @@ def ran_algorithm_fix(
     algo = Algorithm(proposers, responders)
     algo.execute()
     return algo
+
+
+# --- Market helpers ---
+
+
+def random_market(
+    size: int, seed: int, *, num_responders: int | None = None, min_length: int = 0
+) -> tuple[dict[str, list[str]], dict[str, list[str]]]:
+    """Seeded random market of proposers p0, p1, ... and responders r0, r1, ...
+
+    Every preference list is a random sample of the other side, with a random
+    length of at least min_length, so min_length=size gives complete lists.
+
+    Args:
+        size: Number of proposers.
+        seed: Seed of the random generator.
+        num_responders: Number of responders. Defaults to size.
+        min_length: Least length of a preference list. Defaults to 0.
+
+    Returns:
+        The proposer and responder preferences by name.
+    """
+    rng = random.Random(seed)  # noqa: S311
+    p_names = [f"p{i}" for i in range(size)]
+    r_names = [f"r{i}" for i in range(size if num_responders is None else num_responders)]
+
+    def sample(names: list[str]) -> list[str]:
+        return rng.sample(names, rng.randint(min(min_length, len(names)), len(names)))
+
+    return {p: sample(r_names) for p in p_names}, {r: sample(p_names) for r in r_names}
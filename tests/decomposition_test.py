@@ -0,0 +1,98 @@
+"""Tests for the market decomposition module."""
+
+import random
+
+from gale_shapley_algorithm.decomposition import create_decomposed_matching, decompose_market
+from gale_shapley_algorithm.matching import create_matching
+
+
+def _regional_market(regions: int, size: int, seed: int) -> tuple[dict[str, list[str]], dict[str, list[str]]]:
+    """Random market made of regions whose members only list each other (plus a few one-sided entries)."""
+    rng = random.Random(seed)  # noqa: S311
+    proposer_prefs: dict[str, list[str]] = {}
+    responder_prefs: dict[str, list[str]] = {}
+    for region in range(regions):
+        p_names = [f"p{region}_{i}" for i in range(size)]
+        r_names = [f"r{region}_{i}" for i in range(size)]
+        for p in p_names:
+            proposer_prefs[p] = rng.sample(r_names, rng.randint(0, size))
+        for r in r_names:
+            responder_prefs[r] = rng.sample(p_names, rng.randint(0, size))
+    # One-sided entries across regions never form a match
+    proposer_prefs["p0_0"] = [f"r{regions - 1}_0", *proposer_prefs["p0_0"]]
+    return proposer_prefs, responder_prefs
+
+
+class TestDecomposeMarket:
+    """Tests for decompose_market."""
+
+    def test_disjoint_regions(self) -> None:
+        components = decompose_market(
+            proposer_preferences={"a": ["x"], "b": ["y"]},
+            responder_preferences={"x": ["a"], "y": ["b"]},
+        )
+        assert components == [({"a": ["x"]}, {"x": ["a"]}), ({"b": ["y"]}, {"y": ["b"]})]
+
+    def test_one_sided_entries_do_not_connect(self) -> None:
+        components = decompose_market(
+            proposer_preferences={"a": ["x", "y"], "b": ["y"]},
+            responder_preferences={"x": ["a"], "y": ["b"]},
+        )
+        assert components == [({"a": ["x"]}, {"x": ["a"]}), ({"b": ["y"]}, {"y": ["b"]})]
+
+    def test_unacceptable_persons_are_singletons(self) -> None:
+        components = decompose_market(
+            proposer_preferences={"a": ["x"], "b": []},
+            responder_preferences={"x": [], "y": ["unknown"]},
+        )
+        assert components == [({"a": []}, {}), ({"b": []}, {}), ({}, {"x": []}), ({}, {"y": []})]
+
+    def test_chain_forms_single_component(self) -> None:
+        components = decompose_market(
+            proposer_preferences={"a": ["x", "y"], "b": ["y"]},
+            responder_preferences={"x": ["a"], "y": ["b", "a"]},
+        )
+        assert len(components) == 1
+
+
+class TestCreateDecomposedMatching:
+    """Tests for create_decomposed_matching."""
+
+    def test_matches_create_matching(self) -> None:
+        proposer_prefs, responder_prefs = _regional_market(regions=5, size=6, seed=7)
+        expected = create_matching(proposer_prefs, responder_prefs)
+        result = create_decomposed_matching(proposer_prefs, responder_prefs)
+        assert result.matches == expected.matches
+        assert result.self_matches == expected.self_matches
+        assert result.unmatched == expected.unmatched
+        assert result.all_matched == expected.all_matched
+        assert result.rounds <= expected.rounds
+
+    def test_process_pool(self) -> None:
+        proposer_prefs, responder_prefs = _regional_market(regions=4, size=5, seed=3)
+        serial = create_decomposed_matching(proposer_prefs, responder_prefs)
+        parallel = create_decomposed_matching(proposer_prefs, responder_prefs, max_workers=2)
+        assert parallel == serial
+
+    def test_all_matched(self) -> None:
+        result = create_decomposed_matching(
+            proposer_preferences={"a": ["x"], "b": ["y"]},
+            responder_preferences={"x": ["a"], "y": ["b"]},
+        )
+        assert result.matches == {"a": "x", "b": "y"}
+        assert result.all_matched
+        assert result.rounds == 1
+
+    def test_lone_proposer_takes_one_round(self) -> None:
+        result = create_decomposed_matching(
+            proposer_preferences={"a": []},
+            responder_preferences={"x": []},
+        )
+        assert result.self_matches == ["a", "x"]
+        assert result.rounds == 1
+        assert not result.all_matched
+
+    def test_empty_market(self) -> None:
+        result = create_decomposed_matching(proposer_preferences={}, responder_preferences={})
+        assert result.rounds == 0
+        assert result.matches == {}
@@ -0,0 +1,150 @@
+"""Tests for the event log module."""
+
+import io
+from pathlib import Path
+
+import pytest
+
+from gale_shapley_algorithm.algorithm import Algorithm
+from gale_shapley_algorithm.event_log import EventLogReader, EventLogWriter, execute_with_event_log
+from gale_shapley_algorithm.matching import _build_algorithm
+from tests.conftest import random_market
+
+
+def _random_algorithm(size: int, seed: int) -> Algorithm:
+    return _build_algorithm(*random_market(size, seed, min_length=1))
+
+
+def _tentative_matches(algorithm: Algorithm) -> dict[str, str]:
+    return {r.match.name: r.name for r in algorithm.responders if r.match not in (None, r)}
+
+
+class TestEventLog:
+    """Tests for EventLogWriter and EventLogReader."""
+
+    def test_events_of_a_round(self, tmp_path: Path) -> None:
+        algorithm = _build_algorithm({"a": ["x"], "b": ["x"]}, {"x": ["b", "a"]})
+        path = tmp_path / "run.gsev"
+        execute_with_event_log(algorithm, path)
+        with EventLogReader(path) as log:
+            assert log.rounds == [1, 2]
+            assert log.events(1) == [
+                ("propose", "a", "x"),
+                ("propose", "b", "x"),
+                ("reject", "a", "x"),
+                ("accept", "b", "x"),
+            ]
+            assert log.events(2) == [("self", "a", None)]
+            assert log.matching_at(0) == {}
+            assert log.matching_at(2) == {"b": "x"}
+
+    def test_displaced_proposer_is_rejected(self, tmp_path: Path) -> None:
+        algorithm = _build_algorithm({"a": ["x"], "b": ["y", "x"]}, {"x": ["b", "a"], "y": ["a"]})
+        path = tmp_path / "run.gsev"
+        execute_with_event_log(algorithm, path)
+        with EventLogReader(path) as log:
+            assert log.events(2) == [("propose", "b", "x"), ("accept", "b", "x"), ("reject", "a", "x")]
+            assert log.matching_at(1) == {"a": "x"}
+            assert log.matching_at(2) == {"b": "x"}
+
+    @pytest.mark.parametrize("checkpoint_every", [1, 3, 100])
+    def test_replay_matches_every_round(self, tmp_path: Path, checkpoint_every: int) -> None:
+        algorithm = _random_algorithm(size=15, seed=5)
+        expected = _random_algorithm(size=15, seed=5)
+        snapshots = {0: {}}
+        expected.execute(on_round=lambda a: snapshots.__setitem__(a.round, _tentative_matches(a)))
+
+        path = tmp_path / "run.gsev"
+        with EventLogWriter(algorithm, path, checkpoint_every=checkpoint_every) as writer:
+            algorithm.execute(on_round=writer)
+        with EventLogReader(path) as log:
+            assert log.rounds == list(range(1, algorithm.round + 1))
+            for round_, matches in snapshots.items():
+                assert log.matching_at(round_) == matches
+            proposals = [event for r in log.rounds for event in log.events(r) if event[0] == "propose"]
+            assert len(proposals) == algorithm.proposals
+
+    @pytest.mark.parametrize("seed", range(3))
+    def test_proposals_match_full_scan(self, seed: int) -> None:
+        expected = _random_algorithm(size=15, seed=seed)
+        last: dict[object, object] = dict.fromkeys(expected.proposers)
+        proposals_by_round: dict[int, list[tuple[str, str, str | None]]] = {}
+
+        def scan(algorithm: Algorithm) -> None:
+            events = []
+            for proposer in algorithm.proposers:
+                if proposer.last_proposal is not last[proposer]:
+                    last[proposer] = target = proposer.last_proposal
+                    assert target is not None
+                    kind, name = ("self", None) if target is proposer else ("propose", target.name)
+                    events.append((kind, proposer.name, name))
+            proposals_by_round[algorithm.round] = events
+
+        expected.execute(on_round=scan)
+        buffer = io.BytesIO()
+        execute_with_event_log(_random_algorithm(size=15, seed=seed), buffer)
+        with EventLogReader(buffer) as log:
+            for round_, events in proposals_by_round.items():
+                assert [e for e in log.events(round_) if e[0] in ("propose", "self")] == events
+
+    def test_in_memory(self, tmp_path: Path) -> None:
+        buffer = io.BytesIO()
+        execute_with_event_log(_random_algorithm(size=8, seed=1), buffer, checkpoint_every=2)
+        path = tmp_path / "run.gsev"
+        execute_with_event_log(_random_algorithm(size=8, seed=1), path, checkpoint_every=2)
+        assert buffer.getvalue() == path.read_bytes()
+        with EventLogReader(buffer) as log:
+            assert log.matching_at(log.rounds[-1])
+        assert not buffer.closed
+
+    def test_resumed_algorithm(self, tmp_path: Path) -> None:
+        algorithm = _random_algorithm(size=10, seed=2)
+        algorithm.proposers_propose()
+        algorithm.responders_respond()
+        algorithm.round += 1
+        after_first = _tentative_matches(algorithm)
+        path = tmp_path / "run.gsev"
+        execute_with_event_log(algorithm, path, checkpoint_every=2)
+        with EventLogReader(path) as log:
+            assert log.rounds[0] == 2
+            assert log.matching_at(1) == after_first
+            with pytest.raises(ValueError, match="not in the event log"):
+                log.matching_at(0)
+
+    def test_unknown_round(self, tmp_path: Path, ran_algorithm_fix: Algorithm) -> None:
+        ran_algorithm_fix.reset()
+        path = tmp_path / "run.gsev"
+        execute_with_event_log(ran_algorithm_fix, path)
+        with EventLogReader(path) as log:
+            with pytest.raises(ValueError, match="not in the event log"):
+                log.events(99)
+            with pytest.raises(ValueError, match="not in the event log"):
+                log.matching_at(99)
+
+    def test_checkpoint_every_must_be_positive(self, tmp_path: Path, ran_algorithm_fix: Algorithm) -> None:
+        with pytest.raises(ValueError, match="positive"):
+            EventLogWriter(ran_algorithm_fix, tmp_path / "run.gsev", checkpoint_every=0)
+
+    def test_unclosed_writer_of_empty_market(self, tmp_path: Path) -> None:
+        path = tmp_path / "run.gsev"
+        EventLogWriter(Algorithm([], []), path).close()
+        path.write_bytes(path.read_bytes()[:18])  # header only
+        with pytest.raises(ValueError, match="incomplete"):
+            EventLogReader(path)
+
+    def test_unclosed_writer(self, tmp_path: Path, ran_algorithm_fix: Algorithm) -> None:
+        path = tmp_path / "run.gsev"
+        writer = EventLogWriter(ran_algorithm_fix, path)
+        writer._file.flush()
+        with pytest.raises(ValueError, match="incomplete"):
+            EventLogReader(path)
+        writer.close()
+        writer.close()
+        EventLogReader(path).close()
+
+    @pytest.mark.parametrize("data", [b"", b"GSEV", b"XXXX" + bytes(30)])
+    def test_not_an_event_log(self, tmp_path: Path, data: bytes) -> None:
+        path = tmp_path / "run.gsev"
+        path.write_bytes(data)
+        with pytest.raises(ValueError, match="Not an event log"):
+            EventLogReader(path)
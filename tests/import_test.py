@@ -1,7 +1,11 @@
 """Tests that verify the library can be imported cleanly."""
 
+import subprocess
+import sys
 from importlib.metadata import version
 
+import pytest
+
 
 def test_import_gale_shapley_algorithm() -> None:
     """Importing the package should work without config files or optional deps."""
@@ -15,24 +19,135 @@ def test_public_api_exports() -> None:
     """All documented public API names should be importable."""
     from gale_shapley_algorithm import (
         Algorithm,
+        ArrayMatchingResult,
+        CancellationToken,
+        EventLogReader,
+        EventLogWriter,
+        MarketValidationError,
+        MatchingEngine,
         MatchingResult,
+        MatchingStatistics,
+        MemoryProfile,
         Person,
+        ProgressInfo,
+        ProgressReporter,
         Proposer,
+        PruningResult,
         Responder,
+        SolveCancelledError,
+        SolveTimeoutError,
         StabilityResult,
+        ThreadedAlgorithm,
+        TruncationOutcome,
+        ValidationIssue,
+        ValidationResult,
+        analyze_truncations,
         check_stability,
+        check_stability_parallel,
+        create_decomposed_matching,
         create_matching,
+        create_ttc_matching,
+        decompose_market,
+        execute_with_checkpoints,
+        execute_with_event_log,
         find_blocking_pairs,
         is_individually_rational,
+        load_checkpoint,
+        memory_profile,
+        profile_matching,
+        prune_preferences,
+        save_checkpoint,
+        top_trading_cycles,
+        validate_market,
     )
 
     assert Algorithm is not None
+    assert ArrayMatchingResult is not None
+    assert CancellationToken is not None
+    assert EventLogReader is not None
+    assert EventLogWriter is not None
+    assert MarketValidationError is not None
+    assert MatchingEngine is not None
     assert MatchingResult is not None
+    assert MatchingStatistics is not None
+    assert MemoryProfile is not None
     assert Person is not None
+    assert ProgressInfo is not None
+    assert ProgressReporter is not None
     assert Proposer is not None
+    assert PruningResult is not None
     assert Responder is not None
+    assert SolveCancelledError is not None
+    assert SolveTimeoutError is not None
     assert StabilityResult is not None
+    assert ThreadedAlgorithm is not None
+    assert TruncationOutcome is not None
+    assert ValidationIssue is not None
+    assert ValidationResult is not None
+    assert analyze_truncations is not None
     assert check_stability is not None
+    assert check_stability_parallel is not None
+    assert create_decomposed_matching is not None
     assert create_matching is not None
+    assert create_ttc_matching is not None
+    assert decompose_market is not None
+    assert execute_with_checkpoints is not None
+    assert execute_with_event_log is not None
     assert find_blocking_pairs is not None
     assert is_individually_rational is not None
+    assert load_checkpoint is not None
+    assert memory_profile is not None
+    assert profile_matching is not None
+    assert prune_preferences is not None
+    assert save_checkpoint is not None
+    assert top_trading_cycles is not None
+    assert validate_market is not None
+
+
+# Budgets for `python -X importtime`, in microseconds. Eager imports of the
+# algorithm modules, Rich or concurrent.futures push these well past the limit.
+PACKAGE_IMPORT_BUDGET_US = 10_000
+CLI_IMPORT_BUDGET_US = 60_000
+
+
+def _import_in_subprocess(module: str) -> tuple[set[str], int]:
+    """Import module in a fresh interpreter, returns loaded modules and cumulative import time."""
+    code = f"import sys, {module}; print(','.join(sys.modules))"
+    completed = subprocess.run(  # noqa: S603
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    cumulative_us = min(
+        int(line.split("|")[1])
+        for line in completed.stderr.splitlines()
+        if line.startswith("import time:") and line.split("|")[2].strip() == module
+    )
+    return set(completed.stdout.strip().split(",")), cumulative_us
+
+
+def test_import_is_lazy() -> None:
+    """Importing the package should not import any submodule until a public name is used."""
+    modules, cumulative_us = _import_in_subprocess("gale_shapley_algorithm")
+    assert {m for m in modules if m.startswith("gale_shapley_algorithm.")} == set()
+    assert "dataclasses" not in modules
+    assert cumulative_us < PACKAGE_IMPORT_BUDGET_US
+
+
+def test_lazy_attribute_access() -> None:
+    import gale_shapley_algorithm
+    from gale_shapley_algorithm.matching import create_matching
+
+    assert gale_shapley_algorithm.create_matching is create_matching
+    assert "create_matching" in dir(gale_shapley_algorithm)
+    with pytest.raises(AttributeError):
+        _ = gale_shapley_algorithm.does_not_exist
+
+
+def test_cli_import_defers_rich() -> None:
+    """Loading the CLI app (enough for --help) should not import Rich or the algorithm."""
+    modules, cumulative_us = _import_in_subprocess("gale_shapley_algorithm._cli.app")
+    assert not any(m == "rich" or m.startswith("rich.") for m in modules)
+    assert "gale_shapley_algorithm.algorithm" not in modules
+    assert cumulative_us < CLI_IMPORT_BUDGET_US
@@ -1,7 +1,10 @@
 """Tests for the create_matching convenience function."""
 
-from gale_shapley_algorithm.matching import create_matching
+import pytest
+
+from gale_shapley_algorithm.matching import MatchingEngine, create_matching
 from gale_shapley_algorithm.result import MatchingResult
+from tests.conftest import random_market
 
 
 class TestCreateMatching:
@@ -46,3 +49,67 @@ class TestCreateMatching:
         assert "m1" in result.self_matches
         assert "w1" in result.self_matches
         assert not result.all_matched
+
+
+class TestMatchingEngine:
+    """Tests for MatchingEngine."""
+
+    def test_same_result_as_create_matching(self) -> None:
+        engine = MatchingEngine([f"p{i}" for i in range(10)], [f"r{i}" for i in range(8)])
+        for seed in range(5):
+            proposer_prefs, responder_prefs = random_market(10, seed, num_responders=8)
+            assert engine.solve(proposer_prefs, responder_prefs) == create_matching(proposer_prefs, responder_prefs)
+            assert engine.solve(proposer_prefs, responder_prefs, prune=True) == create_matching(
+                proposer_prefs, responder_prefs, prune=True
+            )
+
+    def test_reuses_persons(self) -> None:
+        engine = MatchingEngine(["a", "b"], ["x", "y"])
+        persons = engine.algorithm.persons
+        first = engine.solve({"a": ["x"], "b": ["x"]}, {"x": ["b", "a"]})
+        second = engine.solve({"a": ["y"], "b": ["x"]}, {"x": ["b"], "y": ["a"]})
+        assert engine.algorithm.persons == persons
+        assert first.matches == {"b": "x"}
+        assert second.matches == {"a": "y", "b": "x"}
+        assert second.all_matched
+
+    def test_rewires_only_changed_lists(self) -> None:
+        engine = MatchingEngine(["a", "b"], ["x", "y"])
+        engine.solve({"a": ["x"], "b": ["x"]}, {"x": ["b", "a"]})
+        a, b = engine.algorithm.proposers
+        kept, rewired = a.preferences, b.preferences
+        a.rank_of(a)
+        result = engine.solve({"a": ["x"], "b": ["y"]}, {"x": ["b", "a"], "y": ["b"]})
+        assert a.preferences is kept
+        assert a._ranks is not None
+        assert b.preferences is not rewired
+        assert result.matches == {"a": "x", "b": "y"}
+
+        engine.solve({"a": ["x"], "b": ["y"]}, {"x": ["b", "a"], "y": ["b"]}, prune=True)
+        pruned = a.preferences
+        engine.solve({"a": ["x"], "b": ["y"]}, {"x": ["b", "a"], "y": ["b"]})
+        assert a.preferences is not pruned
+
+    def test_solve_indices(self) -> None:
+        engine = MatchingEngine(["a", "b"], ["x", "y"])
+        result = engine.solve_indices([[0, 1], [0]], [[1, 0], [0]])
+        assert result == engine.solve({"a": ["x", "y"], "b": ["x"]}, {"x": ["b", "a"], "y": ["a"]})
+        assert result.matches == {"a": "y", "b": "x"}
+
+    def test_solve_indices_wrong_shape(self) -> None:
+        engine = MatchingEngine(["a"], ["x"])
+        with pytest.raises(ValueError, match="one preference list"):
+            engine.solve_indices([[0], [0]], [[0]])
+        with pytest.raises(ValueError, match="out of range"):
+            engine.solve_indices([[1]], [[0]])
+        with pytest.raises(ValueError, match="out of range"):
+            engine.solve_indices([[0]], [[-1]])
+
+    def test_unknown_participant(self) -> None:
+        engine = MatchingEngine(["a"], ["x"])
+        with pytest.raises(ValueError, match="Unknown participants"):
+            engine.solve({"a": ["x"], "z": ["x"]}, {"x": ["a"]})
+
+    def test_duplicate_names(self) -> None:
+        with pytest.raises(ValueError, match="unique"):
+            MatchingEngine(["a", "a"], ["x"])
@@ -0,0 +1,87 @@
+"""Tests for the parallel stability module."""
+
+import random
+from multiprocessing.shared_memory import SharedMemory
+
+import pytest
+
+from gale_shapley_algorithm import parallel_stability
+from gale_shapley_algorithm.algorithm import Algorithm
+from gale_shapley_algorithm.matching import _build_algorithm
+from gale_shapley_algorithm.parallel_stability import (
+    _attach,
+    _blocking_pairs_in_chunk,
+    _pack,
+    _worker_chunk,
+    check_stability_parallel,
+)
+from gale_shapley_algorithm.person import Proposer, Responder
+from gale_shapley_algorithm.stability import check_stability
+from tests.conftest import random_market
+
+
+def _shuffled_algorithm(size: int, seed: int) -> Algorithm:
+    """Executed algorithm whose matching is then scrambled, so it has blocking pairs."""
+    algorithm = _build_algorithm(*random_market(size, seed))
+    algorithm.execute()
+    responders = list(algorithm.responders)
+    random.Random(seed).shuffle(responders)  # noqa: S311
+    for proposer, responder in zip(algorithm.proposers, responders, strict=True):
+        proposer.match, responder.match = responder, proposer
+    return algorithm
+
+
+class TestCheckStabilityParallel:
+    """Tests for check_stability_parallel."""
+
+    def test_stable_after_gs(self, ran_algorithm_fix: Algorithm) -> None:
+        assert check_stability_parallel(ran_algorithm_fix, max_workers=1) == check_stability(ran_algorithm_fix)
+
+    @pytest.mark.parametrize("seed", range(10))
+    def test_same_as_serial(self, seed: int) -> None:
+        algorithm = _shuffled_algorithm(size=12, seed=seed)
+        expected = check_stability(algorithm)
+        assert check_stability_parallel(algorithm, max_workers=1, chunk_size=5) == expected
+
+    def test_worker_processes(self) -> None:
+        algorithm = _shuffled_algorithm(size=20, seed=42)
+        expected = check_stability(algorithm)
+        assert expected.blocking_pairs
+        assert check_stability_parallel(algorithm, max_workers=2, chunk_size=3) == expected
+
+    def test_unmatched_responder(self) -> None:
+        m1 = Proposer("m1", "man")
+        m2 = Proposer("m2", "man")
+        w1 = Responder("w1", "woman")
+        w2 = Responder("w2", "woman")
+        m1.preferences = (w1, w2, m1)
+        m2.preferences = (w2, m2, w1)
+        w1.preferences = (m1, m2, w1)
+        w2.preferences = (m2, m1, w2)
+        m1.match, w2.match = w2, m1
+        m2.match = m2
+        algorithm = Algorithm([m1, m2], [w1, w2])
+
+        result = check_stability_parallel(algorithm, max_workers=1)
+        assert result == check_stability(algorithm)
+        assert ("m1", "w1") in result.blocking_pairs
+
+    def test_empty_market(self) -> None:
+        result = check_stability_parallel(Algorithm([], []), max_workers=2)
+        assert result.is_stable
+        assert result.blocking_pairs == []
+
+    def test_worker_reads_shared_buffer(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        algorithm = _shuffled_algorithm(size=8, seed=7)
+        data, layout = _pack(algorithm)
+        shm = SharedMemory(create=True, size=data.itemsize * len(data))
+        try:
+            shm.buf[: data.itemsize * len(data)] = memoryview(data).cast("B")
+            monkeypatch.setattr(parallel_stability, "_shared", None)
+            _attach(shm.name, layout)
+            pairs = _worker_chunk((0, layout.num_proposers))
+            parallel_stability._shared[0].close()
+        finally:
+            shm.close()
+            shm.unlink()
+        assert pairs == _blocking_pairs_in_chunk(memoryview(data), layout, 0, layout.num_proposers)
@@ -71,6 +71,17 @@ class TestPerson:
         with pytest.raises(ValueError, match="can only be set to False"):
             p.is_matched = True
 
+    def test_rank_of(self) -> None:
+        p = Person("p", "side")
+        a = Person("a", "other")
+        b = Person("b", "other")
+        p.preferences = (a, p, b, a)
+        assert [p.rank_of(x) for x in (a, p, b)] == [0, 1, 2]
+        p.preferences = (b, a)
+        assert p.rank_of(a) == 1
+        with pytest.raises(ValueError, match="not in preferences"):
+            p.rank_of(p)
+
 
 class TestProposer:
     """Tests for Proposer class."""
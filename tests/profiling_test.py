@@ -0,0 +1,70 @@
+"""Tests for the profiling module."""
+
+import sys
+import tracemalloc
+
+import pytest
+
+from gale_shapley_algorithm.matching import create_matching
+from gale_shapley_algorithm.profiling import MemoryProfile, memory_profile, profile_matching
+
+
+class TestMemoryProfile:
+    """Tests for memory_profile and MemoryProfile."""
+
+    def test_stage_measures_allocations(self) -> None:
+        with memory_profile() as profile:
+            with profile.stage("allocate"):
+                kept = [[0] * 1_000 for _ in range(100)]
+            with profile.stage("nothing"):
+                pass
+        assert not tracemalloc.is_tracing()
+        allocate, nothing = profile.stages
+        assert allocate.name == "allocate"
+        assert allocate.peak_bytes >= allocate.retained_bytes > 100 * 8_000
+        assert allocate.by_type["list"] > 100 * 8_000
+        assert nothing.by_type == {}
+        assert profile.peak_bytes == allocate.peak_bytes
+        assert len(kept) == 100
+
+    def test_counts_objects_reusing_freed_ids(self) -> None:
+        doomed = [[0] for _ in range(100)]
+        with memory_profile() as profile, profile.stage("replace"):
+            doomed.clear()
+            kept = [[1] for _ in range(100)]
+        assert profile.stages[0].by_type["list"] >= 100 * sys.getsizeof([1])
+        assert len(kept) == 100
+
+    def test_keeps_outer_tracing(self) -> None:
+        tracemalloc.start()
+        try:
+            with memory_profile() as profile, profile.stage("noop"):
+                pass
+            assert tracemalloc.is_tracing()
+        finally:
+            tracemalloc.stop()
+
+    def test_stage_requires_tracing(self) -> None:
+        with pytest.raises(RuntimeError, match="not tracing"), MemoryProfile().stage("x"):
+            pass
+
+    def test_stage_recorded_when_block_raises(self) -> None:
+        with memory_profile() as profile:
+            with pytest.raises(KeyError), profile.stage("failing"):
+                raise KeyError("x")
+            with profile.stage("after"):
+                pass
+        assert [stage.name for stage in profile.stages] == ["failing", "after"]
+
+    def test_empty_profile(self) -> None:
+        assert MemoryProfile().peak_bytes == 0
+
+
+def test_profile_matching() -> None:
+    proposer_prefs = {f"p{i}": [f"r{j}" for j in range(20)] for i in range(20)}
+    responder_prefs = {f"r{i}": [f"p{j}" for j in range(20)] for i in range(20)}
+    result, stability, profile = profile_matching(proposer_prefs, responder_prefs)
+    assert result == create_matching(proposer_prefs, responder_prefs)
+    assert stability.is_stable
+    assert [stage.name for stage in profile.stages] == ["build", "execute", "result", "stability"]
+    assert profile.stages[0].by_type["Proposer"] > 0
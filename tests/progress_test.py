@@ -0,0 +1,60 @@
+"""Tests for the progress module."""
+
+from gale_shapley_algorithm.algorithm import Algorithm
+from gale_shapley_algorithm.matching import _build_algorithm, create_matching
+from gale_shapley_algorithm.progress import ProgressInfo, ProgressReporter
+
+PROPOSER_PREFERENCES = {"a": ["x", "y"], "b": ["x", "y"], "c": ["x", "y"]}
+RESPONDER_PREFERENCES = {"x": ["c", "b", "a"], "y": ["b", "a", "c"]}
+
+
+class FakeClock:
+    """Clock advancing by one second on every read."""
+
+    def __init__(self) -> None:
+        self.now = -1.0
+
+    def __call__(self) -> float:
+        self.now += 1
+        return self.now
+
+
+class TestProgressReporter:
+    """Tests for ProgressReporter."""
+
+    def test_reports_every_round_within_interval(self) -> None:
+        reports: list[ProgressInfo] = []
+        algorithm = _build_algorithm(PROPOSER_PREFERENCES, RESPONDER_PREFERENCES)
+        algorithm.execute(on_round=ProgressReporter(reports.append, interval=1, clock=FakeClock()))
+        assert reports == [
+            ProgressInfo(round=1, free_proposers=2, proposals=3, elapsed=1),
+            ProgressInfo(round=2, free_proposers=1, proposals=5, elapsed=2),
+            ProgressInfo(round=3, free_proposers=0, proposals=5, elapsed=3),
+        ]
+
+    def test_throttled(self) -> None:
+        reports: list[ProgressInfo] = []
+        reporter = ProgressReporter(reports.append, interval=2, clock=FakeClock())
+        algorithm = _build_algorithm(PROPOSER_PREFERENCES, RESPONDER_PREFERENCES)
+        algorithm.execute(on_round=reporter)
+        assert [info.round for info in reports] == [1, 3]
+        reporter.report(algorithm)
+        assert reports[-1] == ProgressInfo(round=3, free_proposers=0, proposals=5, elapsed=4)
+
+    def test_empty_market_reports_nothing(self) -> None:
+        reports: list[ProgressInfo] = []
+        Algorithm([], []).execute(on_round=ProgressReporter(reports.append))
+        assert reports == []
+
+
+class TestCreateMatchingProgress:
+    """Tests for create_matching with on_progress."""
+
+    def test_final_report(self) -> None:
+        reports: list[ProgressInfo] = []
+        result = create_matching(PROPOSER_PREFERENCES, RESPONDER_PREFERENCES, on_progress=reports.append)
+        assert result == create_matching(PROPOSER_PREFERENCES, RESPONDER_PREFERENCES)
+        assert reports[0].round == 1
+        assert reports[-1].round == result.rounds
+        assert reports[-1].free_proposers == 0
+        assert reports[-1].proposals == 5
@@ -0,0 +1,86 @@
+"""Tests for the pruning module."""
+
+import pytest
+
+from gale_shapley_algorithm.algorithm import Algorithm
+from gale_shapley_algorithm.matching import _build_algorithm, create_matching
+from gale_shapley_algorithm.person import Proposer, Responder
+from gale_shapley_algorithm.pruning import prune_preferences
+from gale_shapley_algorithm.result import PruningResult
+from gale_shapley_algorithm.stability import check_stability
+from tests.conftest import random_market
+
+
+class TestPrunePreferences:
+    """Tests for prune_preferences."""
+
+    def test_counts_removed_pairs(self) -> None:
+        algorithm = _build_algorithm(
+            proposer_preferences={"a": ["x", "y"], "b": ["x"]},
+            responder_preferences={"x": ["b", "a"], "y": []},
+        )
+        assert prune_preferences(algorithm) == PruningResult(
+            unacceptable_pairs_removed=1,
+            dominated_pairs_removed=1,
+            remaining_pairs=1,
+        )
+
+    def test_removed_persons_moved_behind_self(self) -> None:
+        algorithm = _build_algorithm(
+            proposer_preferences={"a": ["x", "y"], "b": ["x"]},
+            responder_preferences={"x": ["b", "a"], "y": []},
+        )
+        prune_preferences(algorithm)
+        a, b = algorithm.proposers
+        x, y = algorithm.responders
+        assert a.preferences == (a, x, y)
+        assert b.preferences == (x, b, y)
+        assert x.preferences == (b, x, a)
+        assert y.preferences == (y, a, b)
+
+    def test_nothing_to_prune(self) -> None:
+        algorithm = _build_algorithm(
+            proposer_preferences={"a": ["x"], "b": ["y"]},
+            responder_preferences={"x": ["a"], "y": ["b"]},
+        )
+        result = prune_preferences(algorithm)
+        assert result.unacceptable_pairs_removed == 0
+        assert result.dominated_pairs_removed == 0
+        assert result.remaining_pairs == 2
+
+    @pytest.mark.parametrize("seed", range(20))
+    def test_matching_unchanged(self, seed: int) -> None:
+        proposer_prefs, responder_prefs = random_market(8, seed)
+        expected = create_matching(proposer_prefs, responder_prefs)
+        result = create_matching(proposer_prefs, responder_prefs, prune=True)
+        assert result.matches == expected.matches
+        assert result.self_matches == expected.self_matches
+        assert result.rounds <= expected.rounds
+        assert expected.pruning is None
+        assert result.pruning is not None
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_pruned_matching_is_stable(self, seed: int) -> None:
+        algorithm = _build_algorithm(*random_market(10, seed))
+        prune_preferences(algorithm)
+        algorithm.execute()
+        assert check_stability(algorithm).is_stable
+
+    def test_fewer_rounds(self) -> None:
+        """All proposers share a first choice, only the best one is kept there."""
+        proposer_prefs = {p: ["x", "y", "z"] for p in ("a", "b", "c")}
+        responder_prefs = {"x": ["a", "b", "c"], "y": ["b", "c", "a"], "z": ["c", "a", "b"]}
+        assert create_matching(proposer_prefs, responder_prefs).rounds == 3
+        result = create_matching(proposer_prefs, responder_prefs, prune=True)
+        assert result.rounds == 1
+        assert result.pruning == PruningResult(
+            unacceptable_pairs_removed=0, dominated_pairs_removed=6, remaining_pairs=3
+        )
+
+    def test_self_not_in_preferences(self) -> None:
+        proposer = Proposer("a", "proposer")
+        responder = Responder("x", "responder")
+        proposer.preferences = (responder,)
+        responder.preferences = (proposer, responder)
+        with pytest.raises(ValueError):
+            prune_preferences(Algorithm([proposer], [responder]))
@@ -0,0 +1,75 @@
+"""Tests for the threaded round engine."""
+
+import sys
+
+import pytest
+
+from gale_shapley_algorithm import threaded
+from gale_shapley_algorithm.matching import _build_algorithm
+from gale_shapley_algorithm.person import Proposer, Responder
+from gale_shapley_algorithm.threaded import ThreadedAlgorithm
+from tests.conftest import random_market
+
+
+def _threaded(
+    proposer_prefs: dict[str, list[str]], responder_prefs: dict[str, list[str]], max_workers: int
+) -> ThreadedAlgorithm:
+    algorithm = _build_algorithm(proposer_prefs, responder_prefs)
+    return ThreadedAlgorithm(algorithm.proposers, algorithm.responders, max_workers=max_workers)
+
+
+@pytest.fixture
+def free_threaded(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Pretend the GIL is disabled so the thread pool is used on any build."""
+    monkeypatch.setattr(threaded, "_gil_enabled", lambda: False)
+
+
+class TestThreadedAlgorithm:
+    """Tests for ThreadedAlgorithm."""
+
+    @pytest.mark.usefixtures("free_threaded")
+    @pytest.mark.parametrize("max_workers", [2, 3, 8])
+    @pytest.mark.parametrize("seed", range(5))
+    def test_same_result_as_serial(self, seed: int, max_workers: int) -> None:
+        proposer_prefs, responder_prefs = random_market(15, seed, num_responders=15 + 2)
+        serial = _build_algorithm(proposer_prefs, responder_prefs)
+        expected = serial.execute()
+        algorithm = _threaded(proposer_prefs, responder_prefs, max_workers)
+        assert algorithm.execute() == expected
+        assert algorithm.proposals == serial.proposals
+
+    @pytest.mark.usefixtures("free_threaded")
+    def test_deterministic_fixture(
+        self, deterministic_proposers_and_responders: tuple[list[Proposer], list[Responder]]
+    ) -> None:
+        proposers, responders = deterministic_proposers_and_responders
+        result = ThreadedAlgorithm(proposers, responders, max_workers=2).execute()
+        assert result.matches == {"m_1": "w_1"}
+        assert result.self_matches == ["m_2", "w_2"]
+
+    def test_falls_back_with_gil(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        def no_pool(*args: object, **kwargs: object) -> None:
+            raise AssertionError("thread pool used while the GIL is enabled")
+
+        monkeypatch.setattr(threaded, "_gil_enabled", lambda: True)
+        monkeypatch.setattr(threaded, "ThreadPoolExecutor", no_pool)
+        proposer_prefs, responder_prefs = random_market(10, 1, num_responders=10 + 2)
+        expected = _build_algorithm(proposer_prefs, responder_prefs).execute()
+        assert _threaded(proposer_prefs, responder_prefs, max_workers=4).execute() == expected
+
+    def test_rounds_run_serially_outside_execute(self) -> None:
+        proposer_prefs, responder_prefs = random_market(6, 2, num_responders=6 + 2)
+        algorithm = _threaded(proposer_prefs, responder_prefs, max_workers=4)
+        algorithm.proposers_propose()
+        algorithm.responders_respond()
+        assert not algorithm.awaiting_to_respond_responders
+
+    def test_workers_default(self) -> None:
+        assert ThreadedAlgorithm([], []).workers >= 1
+        assert ThreadedAlgorithm([], [], max_workers=3).workers == 3
+
+    def test_gil_enabled_without_free_threading(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.delattr(sys, "_is_gil_enabled", raising=False)
+        assert threaded._gil_enabled()
+        monkeypatch.setattr(sys, "_is_gil_enabled", lambda: False, raising=False)
+        assert not threaded._gil_enabled()
@@ -0,0 +1,82 @@
+"""Tests for the top trading cycles module."""
+
+import pytest
+
+from gale_shapley_algorithm.matching import MatchingEngine, _build_algorithm, create_matching
+from gale_shapley_algorithm.result import MatchingResult
+from gale_shapley_algorithm.top_trading_cycles import create_ttc_matching, top_trading_cycles
+from tests.conftest import random_market
+
+
+def _naive_ttc(proposer_preferences: dict[str, list[str]], responder_preferences: dict[str, list[str]]) -> dict:
+    """Round by round TTC, clearing every cycle of the pointer graph each round."""
+    choices = {p: [r for r in prefs if p in responder_preferences[r]] for p, prefs in proposer_preferences.items()}
+    priorities = {r: [p for p in prefs if r in choices[p]] for r, prefs in responder_preferences.items()}
+    matches: dict[str, str] = {}
+    while True:
+        points = {p: next((r for r in choices[p] if r not in matches.values()), None) for p in choices}
+        points = {p: r for p, r in points.items() if p not in matches and r is not None}
+        if not points:
+            return matches
+        nxt = {p: next(q for q in priorities[r] if q not in matches) for p, r in points.items()}
+        for p in points:
+            seen = [p]
+            while nxt[seen[-1]] in points and nxt[seen[-1]] not in seen:
+                seen.append(nxt[seen[-1]])
+            if nxt[seen[-1]] == p:
+                matches.update({q: points[q] for q in seen})
+
+
+class TestTopTradingCycles:
+    """Tests for top_trading_cycles and create_ttc_matching."""
+
+    def test_differs_from_deferred_acceptance(self) -> None:
+        """i1 and i2 each have top priority at the school the other prefers, so they trade."""
+        proposer_preferences = {"i1": ["s2", "s1", "s3"], "i2": ["s1", "s2", "s3"], "i3": ["s1", "s2", "s3"]}
+        responder_preferences = {"s1": ["i1", "i3", "i2"], "s2": ["i2", "i1", "i3"], "s3": ["i1", "i2", "i3"]}
+        result = create_ttc_matching(proposer_preferences, responder_preferences)
+        assert result == MatchingResult(
+            rounds=2,
+            matches={"i1": "s2", "i2": "s1", "i3": "s3"},
+            unmatched=[],
+            self_matches=[],
+            all_matched=True,
+        )
+        assert create_matching(proposer_preferences, responder_preferences).matches == {
+            "i1": "s1",
+            "i2": "s2",
+            "i3": "s3",
+        }
+
+    def test_only_mutually_acceptable_pairs(self) -> None:
+        result = create_ttc_matching({"a": ["x"], "b": ["x", "y"]}, {"x": ["b"], "y": ["a"]})
+        assert result.matches == {"b": "x"}
+        assert result.self_matches == ["a", "y"]
+        assert not result.all_matched
+
+    @pytest.mark.parametrize("seed", range(10))
+    def test_same_as_round_by_round(self, seed: int) -> None:
+        proposer_preferences, responder_preferences = random_market(10, seed, num_responders=10 + 2)
+        result = create_ttc_matching(proposer_preferences, responder_preferences)
+        assert result.matches == _naive_ttc(proposer_preferences, responder_preferences)
+        assert sorted(result.self_matches) == sorted(
+            {*proposer_preferences, *responder_preferences} - {*result.matches, *result.matches.values()}
+        )
+
+    def test_leaves_algorithm_untouched(self) -> None:
+        proposer_preferences, responder_preferences = random_market(8, 4, num_responders=8 + 2)
+        algorithm = _build_algorithm(proposer_preferences, responder_preferences)
+        ttc = top_trading_cycles(algorithm)
+        assert all(person.match is None for person in algorithm.persons)
+        assert algorithm.execute() == create_matching(proposer_preferences, responder_preferences)
+        assert top_trading_cycles(algorithm) == ttc
+
+    def test_engine_rank_arrays(self) -> None:
+        engine = MatchingEngine(["a", "b"], ["x", "y"])
+        engine.solve_indices([[0, 1], [0, 1]], [[1, 0], [0, 1]])  # b has top priority at x
+        assert top_trading_cycles(engine.algorithm).matches == {"a": "y", "b": "x"}
+
+    def test_empty_market(self) -> None:
+        assert create_ttc_matching({}, {}) == MatchingResult(
+            rounds=0, matches={}, unmatched=[], self_matches=[], all_matched=True
+        )
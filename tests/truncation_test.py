@@ -0,0 +1,78 @@
+"""Tests for the truncation module."""
+
+import pytest
+
+from gale_shapley_algorithm import truncation
+from gale_shapley_algorithm.algorithm import Algorithm
+from gale_shapley_algorithm.matching import _build_algorithm, create_matching
+from gale_shapley_algorithm.result import TruncationOutcome
+from gale_shapley_algorithm.truncation import _share, _snapshot, _truncations, _worker_chunk, analyze_truncations
+from tests.conftest import random_market
+
+
+class TestAnalyzeTruncations:
+    """Tests for analyze_truncations."""
+
+    def test_truncating_gets_preferred_partner(self) -> None:
+        algorithm = _build_algorithm({"a": ["x", "y"], "b": ["y", "x"]}, {"x": ["b", "a"], "y": ["a", "b"]})
+        algorithm.execute()
+        analysis = analyze_truncations(algorithm, max_workers=1)
+        assert analysis["x"] == [
+            TruncationOutcome(length=1, partner="b", partner_rank=1, improved=True),
+            TruncationOutcome(length=0, partner=None, partner_rank=None, improved=False),
+        ]
+        assert analysis["y"] == [
+            TruncationOutcome(length=1, partner="a", partner_rank=1, improved=True),
+            TruncationOutcome(length=0, partner=None, partner_rank=None, improved=False),
+        ]
+
+    @pytest.mark.parametrize("seed", range(8))
+    def test_same_as_solving_truncated_markets(self, seed: int) -> None:
+        proposer_preferences, responder_preferences = random_market(9, seed, min_length=1)
+        algorithm = _build_algorithm(proposer_preferences, responder_preferences)
+        partners = {r: p for p, r in algorithm.execute().matches.items()}
+
+        for name, outcomes in analyze_truncations(algorithm, max_workers=1).items():
+            true_list = responder_preferences[name]
+            if name not in partners:
+                assert outcomes == []
+                continue
+            kept = true_list.index(partners[name])
+            assert [outcome.length for outcome in outcomes] == list(range(kept, -1, -1))
+            for outcome in outcomes:
+                truncated = {**responder_preferences, name: true_list[: outcome.length]}
+                matches = create_matching(proposer_preferences, truncated).matches
+                expected = next((p for p, r in matches.items() if r == name), None)
+                assert outcome.partner == expected
+                if expected is not None:
+                    assert outcome.partner_rank == true_list.index(expected) + 1
+                    assert outcome.improved == (outcome.partner_rank <= kept)
+
+    def test_selected_responders(self) -> None:
+        algorithm = _build_algorithm(*random_market(6, 3, min_length=1))
+        algorithm.execute()
+        analysis = analyze_truncations(algorithm, responders=["r4", "r1"], max_workers=1)
+        assert list(analysis) == ["r4", "r1"]
+        assert analysis == {name: analyze_truncations(algorithm, max_workers=1)[name] for name in ("r4", "r1")}
+
+    def test_worker_processes(self) -> None:
+        algorithm = _build_algorithm(*random_market(12, 11, min_length=1))
+        algorithm.execute()
+        assert analyze_truncations(algorithm, max_workers=2) == analyze_truncations(algorithm, max_workers=1)
+
+    def test_worker_reads_shared_snapshot(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        algorithm = _build_algorithm(*random_market(5, 2, min_length=1))
+        algorithm.execute()
+        market = _snapshot(algorithm)
+        monkeypatch.setattr(truncation, "_market", None)
+        _share(market)
+        assert _worker_chunk([0, 3]) == [_truncations(market, 0), _truncations(market, 3)]
+
+    def test_not_executed(self) -> None:
+        algorithm = _build_algorithm({"a": ["x"]}, {"x": ["a"]})
+        with pytest.raises(ValueError, match="must be executed"):
+            analyze_truncations(algorithm)
+
+    def test_unknown_responder(self, ran_algorithm_fix: Algorithm) -> None:
+        with pytest.raises(ValueError, match="Unknown responders"):
+            analyze_truncations(ran_algorithm_fix, responders=["nobody"])
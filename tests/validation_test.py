@@ -0,0 +1,69 @@
+"""Tests for the validation module."""
+
+import pytest
+
+from gale_shapley_algorithm.matching import create_matching
+from gale_shapley_algorithm.result import ValidationIssue
+from gale_shapley_algorithm.validation import MarketValidationError, validate_market
+
+
+class TestValidateMarket:
+    """Tests for validate_market."""
+
+    def test_valid_market(self) -> None:
+        proposer_preferences = {"alice": ["bob", "charlie"], "dave": ["charlie"]}
+        responder_preferences = {"bob": ["alice"], "charlie": ["dave", "alice"]}
+        result = validate_market(proposer_preferences, responder_preferences)
+        assert result.issues == []
+        assert result.is_valid
+        assert result.proposer_preferences == proposer_preferences
+        assert result.responder_preferences == responder_preferences
+
+    def test_issues_and_locations(self) -> None:
+        result = validate_market(
+            {"alice": ["bob", "eve", "bob"], "bob": []},
+            {"bob": ["alice", "alice"], "charlie": ["carol"]},
+        )
+        assert [(issue.code, issue.severity, issue.location) for issue in result.issues] == [
+            ("name_collision", "error", ("responder_preferences", "bob")),
+            ("unknown_name", "error", ("proposer_preferences", "alice", 1)),
+            ("duplicate", "error", ("proposer_preferences", "alice", 2)),
+            ("empty_list", "warning", ("proposer_preferences", "bob")),
+            ("duplicate", "error", ("responder_preferences", "bob", 1)),
+            ("unknown_name", "error", ("responder_preferences", "charlie", 0)),
+        ]
+        assert not result.is_valid
+        assert len(result.errors) == 5
+
+    def test_cleaned_market_keeps_first_occurrences(self) -> None:
+        result = validate_market({"a": ["y", "z", "x", "y"]}, {"x": ["a", "b", "a"], "y": []})
+        assert result.proposer_preferences == {"a": ["y", "x"]}
+        assert result.responder_preferences == {"x": ["a"], "y": []}
+        cleaned = create_matching(result.proposer_preferences, result.responder_preferences)
+        assert cleaned == create_matching({"a": ["y", "x"]}, {"x": ["a"], "y": []})
+
+    def test_warnings_only_is_valid(self) -> None:
+        result = validate_market({"a": []}, {"x": []})
+        assert [issue.code for issue in result.issues] == ["empty_list", "empty_list"]
+        assert result.errors == []
+        assert result.is_valid
+
+
+class TestCreateMatchingValidation:
+    """Tests for create_matching with validate=True."""
+
+    def test_raises_with_issues(self) -> None:
+        with pytest.raises(MarketValidationError) as excinfo:
+            create_matching({"a": ["x", "x"]}, {"x": ["a"]}, validate=True)
+        assert excinfo.value.issues == [
+            ValidationIssue("duplicate", "error", ("proposer_preferences", "a", 1), "'x' is listed more than once.")
+        ]
+        assert "proposer_preferences['a'][1]: 'x' is listed more than once." in str(excinfo.value)
+        assert isinstance(excinfo.value, ValueError)
+
+    def test_warnings_do_not_raise(self) -> None:
+        result = create_matching({"a": []}, {"x": ["a"]}, validate=True)
+        assert result.self_matches == ["a", "x"]
+
+    def test_off_by_default(self) -> None:
+        assert create_matching({"a": ["x", "x", "y"]}, {"x": ["a"]}).matches == {"a": "x"}